@@ -9,24 +9,76 @@ d = { 'settings': { 'branch': 'main',
                                                                                   'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser.__init__': ( 'API/browser.html#genomebrowser.__init__',
                                                                                            'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._filter': ( 'API/browser.html#genomebrowser._filter',
+                                                                                          'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser._get_genbank_features': ( 'API/browser.html#genomebrowser._get_genbank_features',
                                                                                                         'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser._get_gff_features': ( 'API/browser.html#genomebrowser._get_gff_features',
                                                                                                     'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._get_glyph_data': ( 'API/browser.html#genomebrowser._get_glyph_data',
+                                                                                                  'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._get_kmer_index': ( 'API/browser.html#genomebrowser._get_kmer_index',
+                                                                                                  'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._get_patch_index': ( 'API/browser.html#genomebrowser._get_patch_index',
+                                                                                                   'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._get_patches': ( 'API/browser.html#genomebrowser._get_patches',
+                                                                                               'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._get_plot': ( 'API/browser.html#genomebrowser._get_plot',
+                                                                                            'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._get_search_index': ( 'API/browser.html#genomebrowser._get_search_index',
+                                                                                                    'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._get_seq': ( 'API/browser.html#genomebrowser._get_seq',
+                                                                                           'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._get_seq_codes': ( 'API/browser.html#genomebrowser._get_seq_codes',
+                                                                                                 'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser._get_sequence_from_fasta': ( 'API/browser.html#genomebrowser._get_sequence_from_fasta',
                                                                                                            'genomenotebook/browser.py'),
-                                        'genomenotebook.browser.GenomeBrowser._prepare_data': ( 'API/browser.html#genomebrowser._prepare_data',
-                                                                                                'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._load': ( 'API/browser.html#genomebrowser._load',
+                                                                                        'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._patches_in': ( 'API/browser.html#genomebrowser._patches_in',
+                                                                                              'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._plot_key': ( 'API/browser.html#genomebrowser._plot_key',
+                                                                                            'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._stack': ( 'API/browser.html#genomebrowser._stack',
+                                                                                         'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser._stage': ( 'API/browser.html#genomebrowser._stage',
+                                                                                         'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.add_sequence_track': ( 'API/browser.html#genomebrowser.add_sequence_track',
+                                                                                                     'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser.add_tooltip_data': ( 'API/browser.html#genomebrowser.add_tooltip_data',
                                                                                                    'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser.add_track': ( 'API/browser.html#genomebrowser.add_track',
                                                                                             'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.bounds': ( 'API/browser.html#genomebrowser.bounds',
+                                                                                         'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.extract_sequences': ( 'API/browser.html#genomebrowser.extract_sequences',
+                                                                                                    'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.feature_types': ( 'API/browser.html#genomebrowser.feature_types',
+                                                                                                'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.features': ( 'API/browser.html#genomebrowser.features',
+                                                                                           'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.find_sequence': ( 'API/browser.html#genomebrowser.find_sequence',
+                                                                                                'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser.highlight': ( 'API/browser.html#genomebrowser.highlight',
                                                                                             'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.patches': ( 'API/browser.html#genomebrowser.patches',
+                                                                                          'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.render_regions': ( 'API/browser.html#genomebrowser.render_regions',
+                                                                                                 'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser.save': ( 'API/browser.html#genomebrowser.save',
                                                                                        'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser.save_html': ( 'API/browser.html#genomebrowser.save_html',
                                                                                             'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.scan_motifs': ( 'API/browser.html#genomebrowser.scan_motifs',
+                                                                                              'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.search_index': ( 'API/browser.html#genomebrowser.search_index',
+                                                                                               'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.seq': ( 'API/browser.html#genomebrowser.seq',
+                                                                                      'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.seq_id': ( 'API/browser.html#genomebrowser.seq_id',
+                                                                                         'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeBrowser.seq_len': ( 'API/browser.html#genomebrowser.seq_len',
+                                                                                          'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowser.show': ( 'API/browser.html#genomebrowser.show',
                                                                                        'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeBrowserModifier': ( 'API/browser.html#genomebrowsermodifier',
@@ -38,6 +90,8 @@ d = { 'settings': { 'branch': 'main',
                                         'genomenotebook.browser.GenomeStack': ('API/browser.html#genomestack', 'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeStack.__init__': ( 'API/browser.html#genomestack.__init__',
                                                                                          'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeStack.from_files': ( 'API/browser.html#genomestack.from_files',
+                                                                                           'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeStack.from_genbank': ( 'API/browser.html#genomestack.from_genbank',
                                                                                              'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeStack.get_elements': ( 'API/browser.html#genomestack.get_elements',
@@ -52,12 +106,35 @@ d = { 'settings': { 'branch': 'main',
                                                                                           'genomenotebook/browser.py'),
                                         'genomenotebook.browser.GenomeStack.show': ( 'API/browser.html#genomestack.show',
                                                                                      'genomenotebook/browser.py'),
+                                        'genomenotebook.browser.GenomeStack.visible_browsers': ( 'API/browser.html#genomestack.visible_browsers',
+                                                                                                 'genomenotebook/browser.py'),
                                         'genomenotebook.browser.HighlightModifier': ( 'API/browser.html#highlightmodifier',
                                                                                       'genomenotebook/browser.py'),
                                         'genomenotebook.browser.HighlightModifier.__init__': ( 'API/browser.html#highlightmodifier.__init__',
                                                                                                'genomenotebook/browser.py'),
                                         'genomenotebook.browser.HighlightModifier.render': ( 'API/browser.html#highlightmodifier.render',
-                                                                                             'genomenotebook/browser.py')},
+                                                                                             'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._add_tooltip': ( 'API/browser.html#_add_tooltip',
+                                                                                 'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._first_seq_id': ( 'API/browser.html#_first_seq_id',
+                                                                                  'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._glyphs_key': ('API/browser.html#_glyphs_key', 'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._prepare_browsers': ( 'API/browser.html#_prepare_browsers',
+                                                                                      'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._prepare_stack_browser': ( 'API/browser.html#_prepare_stack_browser',
+                                                                                           'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._region_view': ( 'API/browser.html#_region_view',
+                                                                                 'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._render_batch_region': ( 'API/browser.html#_render_batch_region',
+                                                                                         'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._render_region': ( 'API/browser.html#_render_region',
+                                                                                   'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._same_key': ('API/browser.html#_same_key', 'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._snapshot': ('API/browser.html#_snapshot', 'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._twobit_path': ( 'API/browser.html#_twobit_path',
+                                                                                 'genomenotebook/browser.py'),
+                                        'genomenotebook.browser._write_fasta_twobit': ( 'API/browser.html#_write_fasta_twobit',
+                                                                                        'genomenotebook/browser.py')},
             'genomenotebook.glyphs': { 'genomenotebook.glyphs.Glyph': ('API/glyphs.html#glyph', 'genomenotebook/glyphs.py'),
                                        'genomenotebook.glyphs.Glyph.__init__': ( 'API/glyphs.html#glyph.__init__',
                                                                                  'genomenotebook/glyphs.py'),
@@ -80,6 +157,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                       'genomenotebook/glyphs.py'),
                                        'genomenotebook.glyphs.get_patch_coordinates': ( 'API/glyphs.html#get_patch_coordinates',
                                                                                         'genomenotebook/glyphs.py'),
+                                       'genomenotebook.glyphs.get_search_index': ( 'API/glyphs.html#get_search_index',
+                                                                                   'genomenotebook/glyphs.py'),
                                        'genomenotebook.glyphs.get_tooltip': ('API/glyphs.html#get_tooltip', 'genomenotebook/glyphs.py'),
                                        'genomenotebook.glyphs.get_y_range': ('API/glyphs.html#get_y_range', 'genomenotebook/glyphs.py'),
                                        'genomenotebook.glyphs.html_wordwrap': ( 'API/glyphs.html#html_wordwrap',
@@ -92,6 +171,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                           'genomenotebook/plot.py'),
                                      'genomenotebook.plot.GenomePlot._add_track': ( 'API/plot.html#genomeplot._add_track',
                                                                                     'genomenotebook/plot.py'),
+                                     'genomenotebook.plot.GenomePlot._add_translation': ( 'API/plot.html#genomeplot._add_translation',
+                                                                                          'genomenotebook/plot.py'),
                                      'genomenotebook.plot.GenomePlot._collect_elements': ( 'API/plot.html#genomeplot._collect_elements',
                                                                                            'genomenotebook/plot.py'),
                                      'genomenotebook.plot.GenomePlot._get_browser_elements': ( 'API/plot.html#genomeplot._get_browser_elements',
@@ -107,23 +188,170 @@ d = { 'settings': { 'branch': 'main',
                                      'genomenotebook.plot.GenomePlot._set_init_pos': ( 'API/plot.html#genomeplot._set_init_pos',
                                                                                        'genomenotebook/plot.py'),
                                      'genomenotebook.plot.GenomePlot._set_js_callbacks': ( 'API/plot.html#genomeplot._set_js_callbacks',
-                                                                                           'genomenotebook/plot.py')},
+                                                                                           'genomenotebook/plot.py'),
+                                     'genomenotebook.plot._cds_residues': ('API/plot.html#_cds_residues', 'genomenotebook/plot.py'),
+                                     'genomenotebook.plot._get_cds': ('API/plot.html#_get_cds', 'genomenotebook/plot.py')},
+            'genomenotebook.sequence': { 'genomenotebook.sequence.KmerIndex': ('API/sequence.html#kmerindex', 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.KmerIndex.__init__': ( 'API/sequence.html#kmerindex.__init__',
+                                                                                         'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.KmerIndex.__len__': ( 'API/sequence.html#kmerindex.__len__',
+                                                                                        'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.KmerIndex._count_mismatches': ( 'API/sequence.html#kmerindex._count_mismatches',
+                                                                                                  'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.KmerIndex._kmers': ( 'API/sequence.html#kmerindex._kmers',
+                                                                                       'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.KmerIndex._seed_candidates': ( 'API/sequence.html#kmerindex._seed_candidates',
+                                                                                                 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.KmerIndex.find': ( 'API/sequence.html#kmerindex.find',
+                                                                                     'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.TwoBitSeq': ('API/sequence.html#twobitseq', 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.TwoBitSeq.__bytes__': ( 'API/sequence.html#twobitseq.__bytes__',
+                                                                                          'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.TwoBitSeq.__getitem__': ( 'API/sequence.html#twobitseq.__getitem__',
+                                                                                            'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.TwoBitSeq.__init__': ( 'API/sequence.html#twobitseq.__init__',
+                                                                                         'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.TwoBitSeq.__len__': ( 'API/sequence.html#twobitseq.__len__',
+                                                                                        'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.TwoBitSeq.codes': ( 'API/sequence.html#twobitseq.codes',
+                                                                                      'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence._concat_hits': ( 'API/sequence.html#_concat_hits',
+                                                                                   'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence._gather_regions': ( 'API/sequence.html#_gather_regions',
+                                                                                      'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence._motif_name': ( 'API/sequence.html#_motif_name',
+                                                                                  'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence._pwm_scores': ( 'API/sequence.html#_pwm_scores',
+                                                                                  'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence._scan_pwm': ('API/sequence.html#_scan_pwm', 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence._scan_regex': ( 'API/sequence.html#_scan_regex',
+                                                                                  'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence._translate_codes': ( 'API/sequence.html#_translate_codes',
+                                                                                       'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence._window_counts': ( 'API/sequence.html#_window_counts',
+                                                                                     'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.decode_seq': ( 'API/sequence.html#decode_seq',
+                                                                                 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.encode_seq': ( 'API/sequence.html#encode_seq',
+                                                                                 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.extract_sequences': ( 'API/sequence.html#extract_sequences',
+                                                                                        'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.iupac_masks': ( 'API/sequence.html#iupac_masks',
+                                                                                  'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.kmer_codes': ( 'API/sequence.html#kmer_codes',
+                                                                                 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.pack_seq': ('API/sequence.html#pack_seq', 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.read_twobit': ( 'API/sequence.html#read_twobit',
+                                                                                  'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.reverse_complement': ( 'API/sequence.html#reverse_complement',
+                                                                                         'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.scan_motifs': ( 'API/sequence.html#scan_motifs',
+                                                                                  'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.translate': ('API/sequence.html#translate', 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.unpack_seq': ( 'API/sequence.html#unpack_seq',
+                                                                                 'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.window_stats': ( 'API/sequence.html#window_stats',
+                                                                                   'genomenotebook/sequence.py'),
+                                         'genomenotebook.sequence.write_twobit': ( 'API/sequence.html#write_twobit',
+                                                                                   'genomenotebook/sequence.py')},
+            'genomenotebook.svg': { 'genomenotebook.svg._Frame': ('API/svg.html#_frame', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._Frame.__init__': ('API/svg.html#_frame.__init__', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._Frame.x': ('API/svg.html#_frame.x', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._Frame.y': ('API/svg.html#_frame.y', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._color': ('API/svg.html#_color', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._factor_colors': ('API/svg.html#_factor_colors', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._initial_range': ('API/svg.html#_initial_range', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._num': ('API/svg.html#_num', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._style': ('API/svg.html#_style', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._svg_glyph': ('API/svg.html#_svg_glyph', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._svg_highlights': ('API/svg.html#_svg_highlights', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._svg_legend': ('API/svg.html#_svg_legend', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._svg_modifier': ('API/svg.html#_svg_modifier', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._svg_panel': ('API/svg.html#_svg_panel', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._svg_patches': ('API/svg.html#_svg_patches', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._svg_x_axis': ('API/svg.html#_svg_x_axis', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._svg_y_axis': ('API/svg.html#_svg_y_axis', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._table_window': ('API/svg.html#_table_window', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._tick_label': ('API/svg.html#_tick_label', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._ticks': ('API/svg.html#_ticks', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg._unsupported': ('API/svg.html#_unsupported', 'genomenotebook/svg.py'),
+                                    'genomenotebook.svg.render_svg': ('API/svg.html#render_svg', 'genomenotebook/svg.py')},
             'genomenotebook.track': { 'genomenotebook.track.Track': ('API/track.html#track', 'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.__init__': ('API/track.html#track.__init__', 'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.bar': ('API/track.html#track.bar', 'genomenotebook/track.py'),
+                                      'genomenotebook.track.Track.bed': ('API/track.html#track.bed', 'genomenotebook/track.py'),
+                                      'genomenotebook.track.Track.bedgraph': ('API/track.html#track.bedgraph', 'genomenotebook/track.py'),
+                                      'genomenotebook.track.Track.bigwig': ('API/track.html#track.bigwig', 'genomenotebook/track.py'),
+                                      'genomenotebook.track.Track.coverage': ('API/track.html#track.coverage', 'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.custom': ('API/track.html#track.custom', 'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.get_fig': ('API/track.html#track.get_fig', 'genomenotebook/track.py'),
+                                      'genomenotebook.track.Track.heatmap': ('API/track.html#track.heatmap', 'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.highlight': ('API/track.html#track.highlight', 'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.line': ('API/track.html#track.line', 'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.scatter': ('API/track.html#track.scatter', 'genomenotebook/track.py'),
+                                      'genomenotebook.track.Track.sequence_stats': ( 'API/track.html#track.sequence_stats',
+                                                                                     'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.set_figure_data_source': ( 'API/track.html#track.set_figure_data_source',
                                                                                              'genomenotebook/track.py'),
                                       'genomenotebook.track.Track.set_track_data_source': ( 'API/track.html#track.set_track_data_source',
-                                                                                            'genomenotebook/track.py')},
+                                                                                            'genomenotebook/track.py'),
+                                      'genomenotebook.track.Track.variants': ('API/track.html#track.variants', 'genomenotebook/track.py'),
+                                      'genomenotebook.track.Track.wig': ('API/track.html#track.wig', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._add_highlights': ('API/track.html#_add_highlights', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._add_interval_levels': ( 'API/track.html#_add_interval_levels',
+                                                                                     'genomenotebook/track.py'),
+                                      'genomenotebook.track._add_levels': ('API/track.html#_add_levels', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._bin_intervals': ('API/track.html#_bin_intervals', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._bin_matrix': ('API/track.html#_bin_matrix', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._coverage_steps': ('API/track.html#_coverage_steps', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._density_levels': ('API/track.html#_density_levels', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._envelope_levels': ( 'API/track.html#_envelope_levels',
+                                                                                 'genomenotebook/track.py'),
+                                      'genomenotebook.track._find_chrom': ('API/track.html#_find_chrom', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._find_table': ('API/track.html#_find_table', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._get_interval_levels': ( 'API/track.html#_get_interval_levels',
+                                                                                     'genomenotebook/track.py'),
+                                      'genomenotebook.track._heatmap_window': ('API/track.html#_heatmap_window', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._highlight_window': ( 'API/track.html#_highlight_window',
+                                                                                  'genomenotebook/track.py'),
+                                      'genomenotebook.track._interval_window': ( 'API/track.html#_interval_window',
+                                                                                 'genomenotebook/track.py'),
+                                      'genomenotebook.track._level_window': ('API/track.html#_level_window', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._merge_highlights': ( 'API/track.html#_merge_highlights',
+                                                                                  'genomenotebook/track.py'),
+                                      'genomenotebook.track._plot_value_intervals': ( 'API/track.html#_plot_value_intervals',
+                                                                                      'genomenotebook/track.py'),
+                                      'genomenotebook.track._read_bigwig': ('API/track.html#_read_bigwig', 'genomenotebook/track.py'),
+                                      'genomenotebook.track._variants_window': ( 'API/track.html#_variants_window',
+                                                                                 'genomenotebook/track.py')},
             'genomenotebook.utils': { 'genomenotebook.utils.EmptyDataFrame': ('API/utils.html#emptydataframe', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.ExportSession': ('API/utils.html#exportsession', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.ExportSession.__enter__': ( 'API/utils.html#exportsession.__enter__',
+                                                                                        'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.ExportSession.__exit__': ( 'API/utils.html#exportsession.__exit__',
+                                                                                       'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.ExportSession.__init__': ( 'API/utils.html#exportsession.__init__',
+                                                                                       'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.ExportSession.current': ( 'API/utils.html#exportsession.current',
+                                                                                      'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.ExportSession.figures_per_second': ( 'API/utils.html#exportsession.figures_per_second',
+                                                                                                 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._create_webdriver': ( 'API/utils.html#_create_webdriver',
+                                                                                  'genomenotebook/utils.py'),
                                       'genomenotebook.utils._gb_show': ('API/utils.html#_gb_show', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._genotype_codes': ('API/utils.html#_genotype_codes', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._is_header': ('API/utils.html#_is_header', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._layout': ('API/utils.html#_layout', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._read_bed_like': ('API/utils.html#_read_bed_like', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils._save': ('API/utils.html#_save', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils._save_html': ('API/utils.html#_save_html', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._share_strings': ('API/utils.html#_share_strings', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._shared_bokehjs': ('API/utils.html#_shared_bokehjs', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._tabix_index': ('API/utils.html#_tabix_index', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._vcf_header': ('API/utils.html#_vcf_header', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._wig_declaration': ( 'API/utils.html#_wig_declaration',
+                                                                                 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils._wig_section': ('API/utils.html#_wig_section', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils.add_extension': ('API/utils.html#add_extension', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils.add_z_order': ('API/utils.html#add_z_order', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils.attributes_to_columns': ( 'API/utils.html#attributes_to_columns',
@@ -152,6 +380,10 @@ d = { 'settings': { 'branch': 'main',
                                       'genomenotebook.utils.parse_genbank': ('API/utils.html#parse_genbank', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils.parse_gff': ('API/utils.html#parse_gff', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils.parse_recs': ('API/utils.html#parse_recs', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.read_bed': ('API/utils.html#read_bed', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.read_bedgraph': ('API/utils.html#read_bedgraph', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.read_vcf': ('API/utils.html#read_vcf', 'genomenotebook/utils.py'),
+                                      'genomenotebook.utils.read_wig': ('API/utils.html#read_wig', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils.regions_overlap': ('API/utils.html#regions_overlap', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils.seqRecord_to_df': ('API/utils.html#seqrecord_to_df', 'genomenotebook/utils.py'),
                                       'genomenotebook.utils.set_positions': ('API/utils.html#set_positions', 'genomenotebook/utils.py')}}}
@@ -8,25 +8,41 @@ __all__ = ['GenomeBrowser', 'GenomeBrowserModifier', 'HighlightModifier', 'Genom
 # %% ../nbs/API/00_browser.ipynb 4
 from fastcore.basics import *
 
-from .track import Track
+from .track import Track, _add_highlights
 
 from genomenotebook.utils import (
     parse_gff,
     parse_fasta,
     parse_genbank,
     add_z_order,
+    default_open_gz,
+    EmptyDataFrame,
     _save_html,
     _gb_show,
-    _save
+    _save,
+    ExportSession,
 )
 
 from genomenotebook.plot import (
     GenomePlot,
 )
 
+from genomenotebook.sequence import (
+    KmerIndex,
+    encode_seq,
+    write_twobit,
+    read_twobit,
+    extract_sequences as seq_extract_sequences, #renamed so that there is no confusion with GenomeBrowser.extract_sequences
+    scan_motifs as seq_scan_motifs, #renamed so that there is no confusion with GenomeBrowser.scan_motifs
+)
+
+from genomenotebook.svg import render_svg
+
 from genomenotebook.glyphs import (
     get_feature_patches, 
+    get_search_index,
     get_default_glyphs,
+    get_feature_name,
     _format_attribute
 )
 
@@ -36,9 +52,7 @@ from bokeh.models import (
     Quad
 )
 
-from bokeh.io import output_notebook
-
-output_notebook(hide_banner=True) #|hide_line
+from bokeh.palettes import Category10_10
 
 import Bio
 
@@ -46,16 +60,53 @@ import numpy as np
 import pandas as pd
 import warnings
 import os
+import copy
+import numbers
+import re
+import time
+import contextlib
+import threading
+import multiprocessing
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Union, List, Dict, Optional
 from collections.abc import Mapping
 from collections import defaultdict
-
-try: #for wsl and/or conda
-    import chromedriver_binary
-except:
-    pass
+from itertools import cycle
 
 # %% ../nbs/API/00_browser.ipynb 5
+def _same_key(a, b) -> bool:
+    """Compares the keys of pipeline stages: data (DataFrames, arrays, sequences, stage outputs) is compared by identity and settings by value"""
+    if a is b:
+        return True
+    if type(a) != type(b):
+        return False
+    if isinstance(a, (tuple, list)):
+        return len(a) == len(b) and all(_same_key(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same_key(a[k], b[k]) for k in a)
+    if isinstance(a, (str, bytes, numbers.Number, np.generic, type(None))):
+        return bool(a == b)
+    return False
+
+def _snapshot(x):
+    """Copies the containers of a stage key, so that appending to a list or setting a dict item in place is detected, while the objects they contain are kept as is"""
+    if isinstance(x, (tuple, list)):
+        return type(x)(_snapshot(y) for y in x)
+    if isinstance(x, dict):
+        return {k: _snapshot(v) for k, v in x.items()}
+    return x
+
+def _glyphs_key(glyphs: dict) -> dict:
+    """Copy of the attributes of the glyphs, so that changing a glyph in place is detected"""
+    return {feature_type: copy.deepcopy(vars(glyph)) for feature_type, glyph in glyphs.items()}
+
+def _add_tooltip(patches: pd.DataFrame, name: str, values, feature_type: str = None):
+    flt=(patches.type == feature_type) | (feature_type is None)
+    for i,p in patches.loc[flt].iterrows():
+        patches.loc[i,"attributes"] += "<br>"+_format_attribute(name,values[i])
+
 class GenomeBrowser:
     """Initialize a GenomeBrowser object.
     """
@@ -72,7 +123,11 @@ class GenomeBrowser:
                  bounds: tuple = None, #bounds can be specified. This helps preserve memory by not loading the whole genome if not needed.
                  max_interval: int = 100000, #maximum size of the field of view in bp
                  show_seq: bool = True, #creates a html div that shows the sequence when zooming in
+                 show_translation: bool = True, #shows the amino acids of the CDS when zooming in, requires show_seq
                  search: bool = True, #enables a search bar
+                 search_attributes: list = None, #list of attribute names (e.g. locus_tag, product) that can be searched in addition to the feature names
+                 max_completions: int = 10, #maximum number of suggestions shown by the search bar
+                 max_sequence_hits: int = 1000, #maximum number of sequence search hits highlighted at once
                  attributes: Union[list,Dict[str,Optional[list]]] = None , #list of attribute names from the GFF attributes column to be extracted. If dict then keys are feature types and values are lists of attributes. If None, then all attributes will be used.
                  feature_name: Optional[Union[str, Dict[str,str]]] = None, #attribute to be displayed as the feature name. If str then use the same field for every feature type. If dict then keys are feature types and values are feature name attribute.
                  feature_types: list = None, # list of feature types to display
@@ -87,7 +142,7 @@ class GenomeBrowser:
                  show_labels: bool = True, # if False, then don't show feature labels
                  feature_height: float = 0.15, #fraction of the annotation track height occupied by the features
                  features:pd.DataFrame = None, # DataFrame with columns: ["seq_id", "source", "type", "start", "end", "score", "strand", "phase", "attributes"], where "attributes" is a dict of attributes.
-                 seq:Bio.Seq.Seq = None, # keeps the Biopython sequence object
+                 seq:Bio.Seq.Seq = None, # keeps the Biopython sequence object. With gff_path, it is used instead of parsing fasta_path
                  color_attribute: str = None, # feature attribute to be used as patch color
                  z_stack: bool = False, #if true features that overlap will be stacked on top of each other
                  **kwargs, #additional keyword arguments are passed as is to bokeh.plotting.figure
@@ -104,7 +159,11 @@ class GenomeBrowser:
         self.bounds = bounds
         self.max_interval = max_interval
         self.show_seq = show_seq
+        self.show_translation = show_translation
         self.search = search
+        self.search_attributes = search_attributes
+        self.max_completions = max_completions
+        self.max_sequence_hits = max_sequence_hits
         self.attributes = attributes
         self.feature_name = feature_name
         if self.feature_name is None:
@@ -128,9 +187,6 @@ class GenomeBrowser:
         
         
         ### assign defaults ###
-        if feature_types is None:
-            self.feature_types = self._default_feature_types.copy()
-
         self.attributes = attributes
         # if attributes is None:
         #     self.attributes =  self._default_attributes.copy()
@@ -154,94 +210,233 @@ class GenomeBrowser:
                 self.glyphs[feature_type].name_attr = feature_name_dic[feature_type]
     
 
-        ### Load sequence and sequence annotations ###
-
-        # TODO: it would be nice to make sequence loading even more lazy, so that bounds and feature selection are not applied until render time,
-        # which would allow users to swap out different features and change settings without creating a new GenomeBrowser object.
-        # right now it's kind of confusing which properties are mutable and which are not.
-        
+        ### Lazy pipeline ###
+        # the features are loaded, filtered, stacked and turned into patches when they are first needed (see _stage),
+        # each stage is computed again only when one of its settings changes, so that settings can be changed after the browser is created
         if sum(1 for x in [gff_path, gb_path, features] if x is not None) != 1:
             raise ValueError("Exactly one of gff_path, gb_path, or features must be provided")
-        elif gff_path:
-            self._get_gff_features()
-        elif gb_path:
-            self._get_genbank_features()
-        else: # features supplied as a pandas dataframe
-            if not self.seq_id:
-                self.seq_id = self.features.loc[0,"seq_id"]
-            
-
-        if self.seq is None:
-            self.seq_len = self.features.right.max()
-        else:
-            self.seq_len = len(self.seq)
         
-        self.bounds = self.bounds if self.bounds != None else (0, self.seq_len)
-        if self.seq is not None:
-            self.seq=self.seq[self.bounds[0]:self.bounds[1]]
-
-        if self.init_pos:
-            if self.init_pos<self.bounds[0] or self.init_pos>self.bounds[1]:
-                warnings.warn("You requested an initial position out of bounds")
-
-        ### initialize visualization ###
-        if len(self.features)>0:
-            if z_stack:
-                add_z_order(self.features)
-            self._prepare_data()
         self.tracks = [] # non-gene tracks, such as scatter plots, bar plots, etc.
         self.modifiers = [] # modifiers
-    
+        self._tooltip_data = [] # data added with add_tooltip_data, applied to the patches
+        self._lock = threading.RLock() # the plot of a browser is built and exported by one thread at a time
+
+    # settings that need to load the data to be resolved
+    @property
+    def seq_id(self):
+        if self._seq_id is None:
+            self._load()
+        return self._seq_id
+
+    @seq_id.setter
+    def seq_id(self, seq_id):
+        self._seq_id = seq_id
+
+    @property
+    def feature_types(self):
+        return self._feature_types
+
+    @feature_types.setter
+    def feature_types(self, feature_types):
+        # features supplied as a DataFrame are only filtered by feature types that were set explicitly
+        self._feature_types_set = feature_types is not None
+        self._feature_types = list(feature_types) if feature_types is not None else self._default_feature_types.copy()
+
+    @property
+    def bounds(self):
+        return self._bounds if self._bounds is not None else (0, self.seq_len)
+
+    @bounds.setter
+    def bounds(self, bounds):
+        self._bounds = tuple(bounds) if bounds is not None else None
+
+    @property
+    def seq_len(self):
+        """length of the reference sequence before bounds are applied if the sequence is provided, else the right of the last feature"""
+        loaded = self._load()
+        return len(loaded["seq"]) if loaded["seq"] is not None else loaded["features"].right.max()
+
+    # outputs of the pipeline stages
+    @property
+    def features(self):
+        return self._stack()
+
+    @features.setter
+    def features(self, features):
+        self._source_features = features
+
+    @property
+    def seq(self):
+        return self._get_seq()
+
+    @seq.setter
+    def seq(self, seq):
+        self._source_seq = seq
+
+    @property
+    def patches(self):
+        return self._get_patches()
+
+    @property
+    def search_index(self):
+        return self._get_search_index()
+
+    def _stage(self, name, key, compute):
+        """Returns the output of the stage `name`, computed again only if the value returned by `key` changed since it was last computed.
+        The key is evaluated after computing the stage, as stages can resolve settings (e.g. the seq_id)."""
+        if not hasattr(self, "_stages"):
+            self._stages = {}
+        cached = self._stages.get(name)
+        if cached is None or not _same_key(cached[0], key()):
+            # outputs computed by the worker processes of a GenomeStack are used instead of computing the stage again, see _prepare_browsers
+            output = self._prepared.pop(name) if name in getattr(self, "_prepared", {}) else compute()
+            cached = self._stages[name] = (key(), output)
+        return cached[1]
+
+    def _load(self):
+        """Parses the annotation and sequence files. Features of all types are loaded, and kept in memory, so that changing feature_types does not parse the files again.
+        Files are only parsed again if the new bounds are not within the loaded region."""
+        loaded = getattr(self, "_stages", {}).get("load")
+        if loaded is not None and loaded[1]["bounds"] is not None and (self._bounds is None or 
+                self._bounds[0] < loaded[1]["bounds"][0] or self._bounds[1] > loaded[1]["bounds"][1]):
+            del self._stages["load"]
+        def compute():
+            if self.gff_path:
+                return self._get_gff_features()
+            elif self.gb_path:
+                return self._get_genbank_features()
+            # features supplied as a pandas dataframe
+            if not self._seq_id:
+                self._seq_id = self._source_features.loc[0,"seq_id"]
+            return {"features": self._source_features, "seq": self._source_seq, "bounds": None}
+        return self._stage("load", lambda: (self.gff_path, self.gb_path, self.fasta_path, self._seq_id, copy.deepcopy(self.attributes), 
+                                            self._source_features, self._source_seq), compute)
+
     def _get_gff_features(self):
         #if seq_id is not provided parse_gff will take the first contig in the file
-        self.features = parse_gff(self.gff_path,
-                        seq_id=self.seq_id,
-                        bounds=self.bounds,
-                        feature_types=self.feature_types,
+        features = parse_gff(self.gff_path,
+                        seq_id=self._seq_id,
+                        bounds=self._bounds,
                         attributes=self.attributes
                         )[0]
-        self.seq_id = self.seq_id if self.seq_id else self.features.loc[0,"seq_id"]
-        self._get_sequence_from_fasta()
+        self._seq_id = self._seq_id if self._seq_id else features.loc[0,"seq_id"]
+        seq = self._source_seq if self._source_seq is not None else self._get_sequence_from_fasta()
+        return {"features": features, "seq": seq, "bounds": self._bounds}
 
     def _get_genbank_features(self):
-        self.seq, self.features = parse_genbank(self.gb_path,
-                        seq_id=self.seq_id,
-                        bounds=self.bounds,
-                        feature_types=self.feature_types,
+        seqs, features = parse_genbank(self.gb_path,
+                        seq_id=self._seq_id,
+                        bounds=self._bounds,
                         attributes=self.attributes
                         )
-        self.seq = self.seq[0]
-        self.features = self.features[0]
-        self.seq_id = self.seq_id if self.seq_id else self.features.loc[0,"seq_id"]
-        
-        
+        self._seq_id = self._seq_id if self._seq_id else features[0].loc[0,"seq_id"]
+        return {"features": features[0], "seq": seqs[0], "bounds": self._bounds}
 
     def _get_sequence_from_fasta(self):
-        """Looks for the sequence matching the seq_id and set bounds.
-        """
-        #if the sequence is provided then seq_len is the length of the reference sequence before bounds are applied
-        #else seq_len is the right of the last feature
+        """Returns the sequence matching the seq_id."""
         if self.fasta_path != None:
             try:
-                self.seq = parse_fasta(self.fasta_path, self.seq_id)
+                return parse_fasta(self.fasta_path, self._seq_id)
             except:
                 warnings.warn(f"genome file {self.fasta_path} cannot be parsed as a fasta file")
                 self.show_seq = False #if a sequence is not provided or cannot be parsed then show_seq set to False
         else:
             self.show_seq = False #if a sequence is not provided or cannot be parsed then show_seq set to False
 
+    def _filter(self):
+        """Selects the features of feature_types within the bounds. Features supplied as a DataFrame are used as they are, 
+        unless feature_types was set explicitly, in which case they are filtered by type."""
+        def compute():
+            features = self._load()["features"]
+            if not (self.gff_path or self.gb_path):
+                if not self._feature_types_set:
+                    return features
+                return features.loc[features.type.isin(self.feature_types)].reset_index(drop=True)
+            bounds = self.bounds
+            return features.loc[features.type.isin(self.feature_types) & 
+                                (features["right"] > bounds[0]) & (features["left"] < bounds[1])].reset_index(drop=True)
+        return self._stage("filter", lambda: (self._load(), self.bounds, list(self.feature_types), self._feature_types_set), compute)
+
+    def _stack(self):
+        """Adds the z order of the features when z_stack is True"""
+        def compute():
+            features = self._filter()
+            if self.z_stack and len(features) > 0:
+                features = features.copy()
+                add_z_order(features)
+            return features
+        return self._stage("stack", lambda: (self._filter(), self.z_stack), compute)
+
+    def _get_seq(self):
+        def compute():
+            seq = self._load()["seq"]
+            return seq[self.bounds[0]:self.bounds[1]] if seq is not None else None
+        return self._stage("seq", lambda: (self._load(), self.bounds), compute)
+
+    def _get_patches(self):
+        def compute():
+            features = self.features
+            if len(features) == 0:
+                return pd.DataFrame(columns=["names", "xs", "ys", "xbox_min", "color", "alpha", "pos", "attributes", "type", "label_y", "label_x"])
+            patches = get_feature_patches(features, 
+                                          self.bounds[0], 
+                                          self.bounds[1],
+                                          glyphs_dict=self.glyphs,
+                                          attributes=self.attributes,
+                                          feature_height = self.feature_height,
+                                          label_vertical_offset =self.label_vertical_offset,
+                                          label_justify=self.label_justify,
+                                          color_attribute = self.color_attribute
+                                          )
+            for name, values, feature_type in self._tooltip_data:
+                _add_tooltip(patches, name, values, feature_type)
+            return patches
+        return self._stage("patches", lambda: (self.features, self.bounds, _glyphs_key(self.glyphs), copy.deepcopy(self.attributes), 
+                                               self.feature_height, self.label_vertical_offset, self.label_justify, self.color_attribute, 
+                                               list(self._tooltip_data)), compute)
 
-    def _prepare_data(self):
-        self.patches = get_feature_patches(self.features, 
-                                            self.bounds[0], 
-                                            self.bounds[1],
-                                            glyphs_dict=self.glyphs,
-                                            attributes=self.attributes,
-                                            feature_height = self.feature_height,
-                                            label_vertical_offset =self.label_vertical_offset,
-                                            label_justify=self.label_justify,
-                                            color_attribute = self.color_attribute
-                                            )
+    def _get_search_index(self):
+        return self._stage("search_index", lambda: (self.patches, self.features, copy.deepcopy(self.search_attributes)),
+                           lambda: get_search_index(self.patches, self.features, self.search_attributes))
+
+    def _get_patch_index(self) -> dict:
+        """Interval index of the patches: the patches sorted by their leftmost x, with the running maximum of their rightmost x,
+        so that the patches overlapping a window are found with binary searches"""
+        def compute():
+            xs = self.patches["xs"]
+            x_min = np.array([min(x) for x in xs], dtype=float)
+            x_max = np.array([max(x) for x in xs], dtype=float)
+            order = np.argsort(x_min, kind="stable")
+            return {"order": order, "x_min": x_min[order], "max_x_max": np.maximum.accumulate(x_max[order]), "x_max": x_max[order]}
+        return self._stage("patch_index", lambda: (self.patches,), compute)
+
+    def _patches_in(self, start: float, end: float) -> pd.DataFrame:
+        """Patches overlapping the window ]start, end[, in their original order"""
+        index = self._get_patch_index()
+        first = np.searchsorted(index["max_x_max"], start, side="right")
+        last = np.searchsorted(index["x_min"], end, side="left")
+        rows = np.sort(index["order"][first:last][index["x_max"][first:last] > start])
+        return self.patches.iloc[rows]
+
+    def _get_glyph_data(self) -> dict:
+        """Patches serialized as lists, as they are sent to the browser callbacks"""
+        return self._stage("glyph_data", lambda: (self.patches,), lambda: self.patches.to_dict(orient="list"))
+
+    def _plot_key(self):
+        """Everything the rendered figures depend on: the outputs of the pipeline, the settings of the browser and the settings of its tracks and modifiers"""
+        settings = {k: v for k, v in vars(self).items() if k != "_stages"}
+        tracks = [{k: v for k, v in vars(track).items() if not k.startswith("_")} for track in self.tracks]
+        modifiers = [vars(modifier).copy() for modifier in self.modifiers]
+        return _snapshot((self.patches, self.seq, settings, tracks, modifiers))
+
+    def _get_plot(self, output_backend:str="webgl") -> GenomePlot:
+        """GenomePlot with all its elements collected. The Bokeh models are reused by show, save_html and save
+        until the browser, one of its tracks or one of its modifiers is changed."""
+        def compute():
+            plot = GenomePlot(self, output_backend)
+            plot._collect_elements()
+            return plot
+        return self._stage(f"plot_{output_backend}", self._plot_key, compute)
 
 # %% ../nbs/API/00_browser.ipynb 16
 @patch
@@ -249,9 +444,8 @@ def show(self:GenomeBrowser):
     """
         Shows the plot in an interactive Jupyter notebook
     """
-    plot = GenomePlot(self)
-    plot._collect_elements()
-    _gb_show(plot.elements)
+    with self._lock:
+        _gb_show(self._get_plot().layout)
 
 # %% ../nbs/API/00_browser.ipynb 26
 @patch
@@ -332,8 +526,6 @@ class HighlightModifier(GenomeBrowserModifier):
         super().__init__(gene_track=True, data_tracks=highlight_tracks)
         
     def render(self, fig, track_mode=False, track_properties=None):
-        highlight_source = ColumnDataSource(self.data[[self.left_col,self.right_col,self.color_col,self.alpha_col]+self.hover_data])
-
         bottom = 0
         top = 1
         if track_mode:
@@ -343,18 +535,10 @@ class HighlightModifier(GenomeBrowserModifier):
             bottom = ylim[0]
             top = ylim[1]
         
-        r = Quad(left=self.left_col, right=self.right_col,
-                bottom=bottom,
-                top=top,
-                fill_color=self.color_col,
-                fill_alpha=self.alpha_col,
-                line_alpha=0,
-                **self.bokeh_args)
-        
-        renderer = fig.add_glyph(highlight_source, r)
-        tooltips=[(f"{self.left_col} - {self.right_col}",f"@{self.left_col} - @{self.right_col}")]+[(f"{attr}",f"@{attr}") for attr in self.hover_data]
-        fig.add_tools(HoverTool(renderers=[renderer],
-                                        tooltips=tooltips))
+        _add_highlights(fig, self.data, self.left_col, self.right_col, self.color_col, self.alpha_col, self.hover_data,
+                        bottom=bottom,
+                        top=top,
+                        **self.bokeh_args)
     # if highlight_tracks:
     #     for t in self.tracks:
     #         t.highlight(data=data,left=left,right=right,color=color,alpha=alpha,hover_data=hover_data,**kwargs)
@@ -390,22 +574,139 @@ def add_tooltip_data(self:GenomeBrowser,
 
     flt=(self.patches.type == feature_type) | (feature_type is None)
     assert(len(self.patches.loc[flt])==len(values))
-    for i,p in self.patches.loc[flt].iterrows():
-        self.patches.loc[i,"attributes"] += "<br>"+_format_attribute(name,values[i])
+    # the data is kept with the settings of the patches, so that it is added again when the patches are recomputed
+    self._tooltip_data.append((name, values, feature_type))
 
 
+# %% ../nbs/API/00_browser.ipynb 37
+@patch
+def _get_seq_codes(self:GenomeBrowser) -> np.ndarray:
+    if self.seq is None:
+        raise ValueError("This requires the genome sequence, provide a fasta_path or a genbank file")
+    return self._stage("seq_codes", lambda: (self.seq,), lambda: encode_seq(self.seq))
+
+@patch
+def _get_kmer_index(self:GenomeBrowser) -> KmerIndex:
+    if self.seq is None:
+        raise ValueError("Searching the sequence requires the genome sequence, provide a fasta_path or a genbank file")
+    return self._stage("kmer_index", lambda: (self._get_seq_codes(),), lambda: KmerIndex(self._get_seq_codes()))
+
+# %% ../nbs/API/00_browser.ipynb 38
+@patch
+def find_sequence(self:GenomeBrowser,
+                  query: str, #sequence to search for, IUPAC codes are accepted
+                  mismatches: int = 0, #maximum number of mismatches
+                  strand: str = "both", #"+", "-" or "both"
+                  start: int = None, #only hits with left >= start are returned
+                  max_hits: int = None, #maximum number of hits returned
+                 ) -> pd.DataFrame:
+    """Searches the genome sequence for query and returns a DataFrame with the seq_id, left, right, strand, mismatches and sequence of each hit.
+    A k-mer index of the sequence is built on the first call and reused by later searches."""
+    start = 0 if start is None else start - self.bounds[0]
+    hits = self._get_kmer_index().find(query, mismatches=mismatches, strand=strand, start=start, max_hits=max_hits)
+    hits["left"] += self.bounds[0]
+    hits["right"] += self.bounds[0]
+    hits.insert(0, "seq_id", self.seq_id)
+    return hits
+
 # %% ../nbs/API/00_browser.ipynb 39
 @patch
-def save_html(self:GenomeBrowser, fname:str, title:str="Genome Plot"):
-    plot = GenomePlot(self)
-    plot._collect_elements()
-    _save_html(plot.elements, fname, title)
+def scan_motifs(self:GenomeBrowser,
+                motifs: Union[list, dict], #list of motifs or dictionary of motifs with names as keys. Motifs can be IUPAC strings, compiled regular expressions or position weight matrices (DataFrame with A, C, G, T columns)
+                mismatches: int = 0, #maximum number of mismatches for IUPAC motifs
+                strand: str = "both", #"+", "-" or "both"
+                pwm_threshold: float = 0.8, #minimum relative score (between 0 and 1) of position weight matrix hits
+                highlight: bool = True, #if True the hits are highlighted on the annotation track with one color per motif
+                palette: tuple = Category10_10, #colors used for the motifs
+                alpha: float = 0.2, #transparency of the highlights
+               ) -> pd.DataFrame:
+    """Scans the genome sequence for a list of motifs on both strands and returns a DataFrame of the hits.
+    The hits are added as a single highlight layer rather than one highlight per site."""
+    hits = seq_scan_motifs(self._get_kmer_index(), motifs, mismatches=mismatches, strand=strand, pwm_threshold=pwm_threshold)
+    hits["left"] += self.bounds[0]
+    hits["right"] += self.bounds[0]
+    hits.insert(0, "seq_id", self.seq_id)
+    
+    if highlight and len(hits) > 0:
+        colors = dict(zip(hits.motif.unique(), cycle(palette)))
+        self.highlight(data=hits.assign(color=hits.motif.map(colors)),
+                       alpha=alpha,
+                       hover_data=["motif", "strand", "sequence"])
+    return hits
+
+@patch
+def add_sequence_track(self:GenomeBrowser,
+                       stat: str = "gc", #"gc", "gc_skew", "cumulative_gc_skew" or "complexity"
+                       window: int = 100, #size of the windows at the highest zoom level, the windows are 4 times larger at each lower zoom level
+                       k: int = 2, #length of the k-mers used to compute the complexity
+                       height: int = 100, #size of the track
+                       **kwargs, #enables to pass keyword arguments used by the Bokeh function
+                      ) -> Track:
+    """Adds a track showing a statistic of the genome sequence computed in sliding windows. The size of the windows follows the zoom level."""
+    track = self.add_track(height=height)
+    track.sequence_stats(self._get_seq_codes(), stat=stat, offset=self.bounds[0], window=window, k=k, **kwargs)
+    return track
+
+@patch
+def extract_sequences(self:GenomeBrowser,
+                      features_or_mask: Union[pd.DataFrame, pd.Series, np.ndarray] = None, #features with left, right and strand columns, or boolean mask of the browser features. Defaults to all the features
+                      translate: bool = False, #if True the protein sequences are returned, translated from the phase of each feature
+                      flank: int = 0, #number of bases added on each side of the features, cannot be used when translating
+                      fasta = None, #path or text file object, if provided the sequences are written in FASTA format instead of being returned
+                      chunksize: int = 10000, #number of features extracted at once when writing a FASTA file
+                     ) -> Optional[pd.Series]:
+    """Extracts the nucleotide or protein sequences of many features at once, features on the "-" strand are reverse complemented.
+    Returns a Series of sequences with the same index as the features, or writes them in a FASTA file with the feature names and positions as headers."""
+    if translate and flank:
+        raise ValueError("flank can only be used when translate is False")
+    if features_or_mask is None:
+        features = self.features
+    elif isinstance(features_or_mask, pd.DataFrame):
+        features = features_or_mask
+    else:
+        features = self.features.loc[np.asarray(features_or_mask, dtype=bool)]
+    
+    codes = self._get_seq_codes()
+    def extract(features):
+        #feature coordinates are 1-based
+        phase = pd.to_numeric(features.phase, errors="coerce").fillna(0).values if "phase" in features.columns else None
+        return seq_extract_sequences(codes, 
+                                     features.left.values - 1 - flank - self.bounds[0], 
+                                     features.right.values + flank - self.bounds[0],
+                                     features.strand.values, phase, translate=translate)
+
+    if fasta is None:
+        return pd.Series(extract(features), index=features.index, dtype=object)
+
+    f = open(fasta, "w") if isinstance(fasta, (str, os.PathLike)) else fasta
+    try:
+        for i in range(0, len(features), chunksize):
+            chunk = features.iloc[i:i+chunksize]
+            names = chunk.apply(get_feature_name, glyphs_dict=self.glyphs, axis=1) if len(chunk) else []
+            f.write("".join(f">{name} {self.seq_id}:{left}-{right}({strand})\n{seq}\n" if name else f">{self.seq_id}:{left}-{right}({strand})\n{seq}\n"
+                            for name, left, right, strand, seq in zip(names, chunk.left - flank, chunk.right + flank, chunk.strand, extract(chunk))))
+    finally:
+        if f is not fasta:
+            f.close()
 
 # %% ../nbs/API/00_browser.ipynb 40
 @patch
+def save_html(self:GenomeBrowser, 
+              fname:str, # file name
+              title:str="Genome Plot", #page title
+              compress:bool=False, #writes long strings such as the sequence once and gzips the plot data, which is inflated by the web browser
+              shared_js:str=None, #directory where BokehJS is written once and linked by the page instead of being embedded in it
+             ):
+    """Saves the plot in a standalone html file"""
+    with self._lock:
+        _save_html(self._get_plot().layout, fname, title, compress, shared_js)
+
+# %% ../nbs/API/00_browser.ipynb 41
+@patch
 def save(self:GenomeBrowser, 
          fname:str, # file name (must end in .svg or . png).\n If using svg, GenomeBrowser needs to be initialized with `output_backend="svg"`
-         title:str="Genome Plot" #plot title
+         title:str="Genome Plot", #plot title
+         native:bool=False, #svg only: renders a single svg file with genomenotebook.svg.render_svg instead of Bokeh, without a headless browser
         ):
     """Saves the plot in svg or png. This function saves the initial plot that is generated and not the current view of the browser.
     To save in svg format you must initialise your GenomeBrowser using `output_backend="svg"` """
@@ -414,36 +715,234 @@ def save(self:GenomeBrowser,
     ext = ext.lower()
     if ext not in {".svg", ".png"}:
         raise ValueError(f"filename must end in svg or png, not {ext}")
+    if native:
+        if ext != ".svg":
+            raise ValueError("native rendering only saves svg files")
+        with self._lock:
+            render_svg(self, fname, title)
+        return
 
     output_backend = "webgl"
     if ext == ".svg":
         output_backend = "svg"
     
-    plot = GenomePlot(self, output_backend)
     heights = [self.height]
     for track in self.tracks:
         heights.append(track.height)
     
-    plot._collect_elements()
-    _save(plot.elements, heights, self.width, fname, title)
+    with self._lock:
+        _save(self._get_plot(output_backend).layout, heights, self.width, fname, title)
+
+
 
+# %% ../nbs/API/00_browser.ipynb 43
+def _region_view(browser:GenomeBrowser, left:float, right:float) -> GenomeBrowser:
+    """Copy of the browser limited to the region [left, right]. Its features, patches and sequence are the slices of the ones of the browser,
+    so that the files are not parsed and the patches are not computed again, and a figure of the region only contains the data of the region."""
+    with browser._lock:
+        features, patches, seq, bounds = browser.features, browser.patches, browser.seq, browser.bounds
+        view = copy.copy(browser)
+        view._lock = threading.RLock()
+        view._stages = {"load": browser._stages["load"]}
+    # the filtered features and the stacked features have the same rows
+    in_region = ((features["right"] > left) & (features["left"] < right)).to_numpy()
+    view._prepared = {"filter": browser._filter().loc[in_region].reset_index(drop=True),
+                      "stack": features.loc[in_region].reset_index(drop=True)}
+    if len(patches) == len(features): #one patch per feature, otherwise the patches of the region are computed from its features
+        view._prepared["patches"] = patches.loc[in_region].reset_index(drop=True)
+    if seq is not None:
+        view._prepared["seq"] = seq[int(left) - bounds[0]:int(right) - bounds[0]]
+    view.bounds = (int(left), int(right))
+    view.init_pos = (left + right) / 2
+    view.init_win = right - left
+    view.max_interval = max(browser.max_interval, right - left)
+    return view
 
+def _render_region(browser:GenomeBrowser, left:float, right:float, fname:str, fmt:str):
+    """Saves a figure of the region [left, right] of a browser, which only contains the data of the region"""
+    if left >= right or left < browser.bounds[0] or right > browser.bounds[1]:
+        raise ValueError(f"region {left}-{right} is not within the browser bounds {browser.bounds}")
+    view = _region_view(browser, left, right)
+    if fmt == "svg":
+        render_svg(view, fname)
+    elif fmt == "html":
+        view.save_html(fname, compress=True, shared_js=os.path.dirname(fname) or ".")
+    else:
+        view.save(fname)
+
+_batch_browser = None # browser rendered by the worker processes of render_regions, which inherit it when they are forked
+
+def _render_batch_region(left, right, fname, fmt):
+    _render_region(_batch_browser, left, right, fname, fmt)
+
+@patch
+def render_regions(self:GenomeBrowser,
+                   regions:pd.DataFrame, # regions to render, one figure is saved per row
+                   out_dir:str, # directory where the figures are saved, created if needed
+                   fmt:str = "svg", # "svg" (written without a web browser, see `genomenotebook.svg`), "png" or "html" (compressed, all the pages share one BokehJS file written in out_dir)
+                   left_col:str = "left", # name of the column containing the start positions of the regions
+                   right_col:str = "right", # name of the column containing the end positions of the regions
+                   name_col:str = None, # name of a column used to name the files, by default files are named after the coordinates of the regions
+                   flank:int = 0, # number of bp shown on each side of the regions
+                   n_jobs:int = 1, # number of processes rendering the regions. png files are always rendered by the current process, with a single headless browser
+                   progress:bool = True, # prints the number of regions rendered and of regions that failed
+                  ) -> pd.DataFrame:
+    """Saves a figure of each region. The annotations are parsed and turned into patches once, and each figure only contains the patches and the sequence of its region.
+    A region that cannot be rendered does not stop the batch: returns `regions` with the `file` of each figure and the `error` raised, if any."""
+    if fmt not in ("svg", "png", "html"):
+        raise ValueError("fmt must be 'svg', 'png' or 'html'")
+    for col in (left_col, right_col, name_col):
+        if col is not None and col not in regions.columns:
+            raise ValueError(f"{col} is not a column of regions")
+    os.makedirs(out_dir, exist_ok=True)
+
+    lefts = regions[left_col].values - flank
+    rights = regions[right_col].values + flank
+    if name_col is None:
+        names = [f"{self.seq_id}_{left}-{right}" for left, right in zip(regions[left_col], regions[right_col])]
+    else:
+        names = regions[name_col].astype(str)
+    fnames = [os.path.join(out_dir, re.sub(r"[^\w.-]", "_", name) + "." + fmt) for name in names]
+    errors = [None] * len(regions)
+
+    #the features, patches and sequence sliced for each figure are computed before the worker processes are forked
+    self.patches
+    self.seq
+
+    start_time = last_report = time.perf_counter()
+    def report(done):
+        nonlocal last_report
+        #the progress is printed at most every second
+        if progress and (done == len(regions) or time.perf_counter() - last_report > 1):
+            last_report = time.perf_counter()
+            failed = sum(e is not None for e in errors)
+            print(f"\r{done - failed}/{len(regions)} regions rendered, {failed} failed, in {last_report - start_time:.1f}s", 
+                  end="\n" if done == len(regions) else "")
+
+    if n_jobs > 1 and fmt != "png" and "fork" in multiprocessing.get_all_start_methods():
+        global _batch_browser
+        _batch_browser = self
+        try:
+            with ProcessPoolExecutor(n_jobs, mp_context=multiprocessing.get_context("fork")) as executor:
+                futures = {executor.submit(_render_batch_region, left, right, fname, fmt): i 
+                           for i, (left, right, fname) in enumerate(zip(lefts, rights, fnames))}
+                for done, future in enumerate(as_completed(futures), 1):
+                    if future.exception() is not None:
+                        errors[futures[future]] = repr(future.exception())
+                    report(done)
+        finally:
+            _batch_browser = None
+    else:
+        if n_jobs > 1 and fmt != "png":
+            warnings.warn("worker processes cannot be forked on this platform, the regions are rendered by the current process")
+        with ExportSession() if fmt == "png" else contextlib.nullcontext():
+            for i, (left, right, fname) in enumerate(zip(lefts, rights, fnames)):
+                try:
+                    _render_region(self, left, right, fname, fmt)
+                except Exception as e:
+                    errors[i] = repr(e)
+                report(i + 1)
+
+    out = regions.copy()
+    out["file"] = [fname if error is None else None for fname, error in zip(fnames, errors)]
+    out["error"] = errors
+    return out
+
+# %% ../nbs/API/00_browser.ipynb 47
+_stack_browsers = None # browsers prepared by the worker processes of a GenomeStack, which inherit them when they are forked
+
+def _prepare_stack_browser(i:int) -> dict:
+    """Computes the stages of a browser that do not need Bokeh: only these tables are sent back to the parent process"""
+    browser = _stack_browsers[i]
+    stages = {"stack": browser.features, "patches": browser.patches}
+    if browser.gff_path or browser.gb_path:
+        loaded = browser._load()
+        # a sequence given to the browser is not sent back, the parent process already has it
+        stages["load"] = dict(loaded, seq=None) if loaded["seq"] is browser._source_seq else loaded
+    if browser.search:
+        stages["search_index"] = browser.search_index
+    # settings resolved while loading the files
+    return {"stages": stages, "_seq_id": browser._seq_id, "show_seq": browser.show_seq}
+
+def _prepare_browsers(browsers:list, n_jobs:int):
+    """Loads the features of the browsers and computes their patches in n_jobs processes. 
+    The results are picked up by the pipeline of each browser, the Bokeh models are then built by the current process."""
+    todo = [i for i, browser in enumerate(browsers) if "patches" not in getattr(browser, "_stages", {})]
+    if n_jobs <= 1 or len(todo) < 2:
+        return
+    if "fork" not in multiprocessing.get_all_start_methods():
+        warnings.warn("worker processes cannot be forked on this platform, the browsers are prepared by the current process")
+        return
+    global _stack_browsers
+    _stack_browsers = browsers
+    try:
+        with ProcessPoolExecutor(min(n_jobs, len(todo)), mp_context=multiprocessing.get_context("fork")) as executor:
+            for i, prepared in zip(todo, executor.map(_prepare_stack_browser, todo)):
+                browser = browsers[i]
+                browser._seq_id, browser.show_seq = prepared["_seq_id"], prepared["show_seq"]
+                if "load" in prepared["stages"] and prepared["stages"]["load"]["seq"] is None:
+                    prepared["stages"]["load"]["seq"] = browser._source_seq
+                browser._prepared = prepared["stages"]
+                browser.patches
+                if browser.search:
+                    browser.search_index
+                browser._prepared = {}
+    finally:
+        _stack_browsers = None
+
+def _first_seq_id(gff_path:str) -> str:
+    """seq_id of the first annotation of a gff file, read without parsing the file"""
+    with default_open_gz(gff_path) as f:
+        for line in f:
+            if line[0] != "#" and line.strip():
+                return line.split("\t")[0]
+    raise EmptyDataFrame(f"{gff_path} does not contain any annotation")
+
+def _twobit_path(fasta_path:str, seq_id:str, seq_dir:str) -> str:
+    """File of seq_dir where the sequence seq_id of a fasta file is written by write_twobit"""
+    key = hashlib.md5(f"{os.path.abspath(fasta_path)}:{seq_id}".encode()).hexdigest()[:12]
+    name = re.sub(r"[^\w.-]", "_", seq_id)
+    return os.path.join(seq_dir, f"{name}_{key}.npy")
+
+def _write_fasta_twobit(fasta_path:str, seq_id:str, path:str) -> bool:
+    """Packs the sequence seq_id of a fasta file in path, returns False if it cannot be parsed. Errors writing path are raised"""
+    try:
+        seq = parse_fasta(fasta_path, seq_id)
+    except (ValueError, KeyError, AttributeError): #the file cannot be parsed or does not contain seq_id
+        return False
+    write_twobit(seq, path)
+    return True
 
 # %% ../nbs/API/00_browser.ipynb 48
 class GenomeStack():
-    def __init__(self, browsers = None):
+    def __init__(self, 
+                 browsers = None, # list of GenomeBrowser objects
+                 n_jobs:int = 1, # number of processes loading the features and computing the patches of the browsers before they are plotted
+                 visible:Union[list, slice] = None, # indices of the browsers shown and saved, all of them if None. The annotations of the other browsers are not loaded
+                ):
         self.browsers = browsers
         if browsers is None:
             self.browsers = list()
+        self.n_jobs = n_jobs
+        self.visible = visible
+
+    @property
+    def visible_browsers(self) -> list:
+        """Browsers shown and saved by the stack"""
+        if self.visible is None:
+            return self.browsers
+        if isinstance(self.visible, slice):
+            return self.browsers[self.visible]
+        return [self.browsers[i] for i in self.visible]
 
 
     def get_widest(self):
         """
-        returns the index of the widest Browser
+        returns the index of the widest Browser among the visible browsers
         """
         widest = 0
         width = float("-inf")
-        for i, browser in enumerate(self.browsers):
+        for i, browser in enumerate(self.visible_browsers):
             if browser.bounds[1] > width:
                 width = browser.bounds[1]
                 widest = i
@@ -451,7 +950,9 @@ class GenomeStack():
     
     def get_elements(self, output_backend:str="webgl"):
         
-        plots = [GenomePlot(browser, output_backend=output_backend) for browser in self.browsers]
+        browsers = self.visible_browsers
+        _prepare_browsers(browsers, self.n_jobs)
+        plots = [GenomePlot(browser, output_backend=output_backend) for browser in browsers]
         widest_i = self.get_widest()
         # print(widest_i)
         # print(self.browsers[widest_i].bounds[1])
@@ -484,7 +985,7 @@ class GenomeStack():
 
     def get_heights(self):
         heights = []
-        for browser in self.browsers:
+        for browser in self.visible_browsers:
             heights.append(browser.height)
             for track in browser.tracks:
                 heights.append(track.height)
@@ -494,13 +995,15 @@ class GenomeStack():
         elements = self.get_elements()
         _gb_show(elements)
         
-    def save_html(self, fname:str, title:str="Genome Plot"):
+    def save_html(self, fname:str, title:str="Genome Plot", compress:bool=False, shared_js:str=None):
+        """Saves the stacked plots in a standalone html file. With compress, data shared by several browsers, such as the sequence, is written once"""
         elements = self.get_elements()
-        save_html(elements, fname, title)
+        _save_html(elements, fname, title, compress, shared_js)
    
     def save(self, 
              fname:str,
-             title:str="Genome Plot"
+             title:str="Genome Plot",
+             native:bool=False, #svg only: renders a single svg file with genomenotebook.svg.render_svg instead of Bokeh, without a headless browser
             ):
         """This function saves the initial plot that is generated and not the current view of the browser.
         To save in svg format you must initialise your GenomeBrowser using `output_backend="svg"` """
@@ -509,6 +1012,11 @@ class GenomeStack():
         ext = ext.lower()
         if ext not in {".svg", ".png"}:
             raise ValueError(f"filename must end in svg or png, not {ext}")
+        if native:
+            if ext != ".svg":
+                raise ValueError("native rendering only saves svg files")
+            render_svg(self.visible_browsers, fname, title)
+            return
     
         output_backend = "webgl"
         if ext == ".svg":
@@ -516,11 +1024,12 @@ class GenomeStack():
         
         elements = self.get_elements(output_backend=output_backend)
         heights = self.get_heights()
-        save(elements, heights, self.browsers[0].width, fname, title)
+        _save(elements, heights, self.visible_browsers[0].width, fname, title)
         
     @classmethod
     def from_genbank(cls, 
                      genbank_path:str = None, # path to a genbank file
+                     n_jobs:int = 1, # number of processes preparing the browsers, see GenomeStack
                      **kwargs # arguments to be passed to GenomeBrowser.__init__ for each browser being made
                     ):
 
@@ -547,6 +1056,41 @@ class GenomeStack():
             out.append(GenomeBrowser(features=feature, seq=seq, **kwargs))
             
         
-        return cls(out)
+        return cls(out, n_jobs=n_jobs)
+
+    @classmethod
+    def from_files(cls,
+                   pairs:list, # (gff_path, fasta_path) of each genome, fasta_path can be None
+                   seq_dir:str = None, # directory where the sequences are written in 2 bits per base, a temporary directory if None. Sequences already written in seq_dir are reused
+                   visible:Union[list, slice] = slice(0, 10), # indices of the genomes shown, see GenomeStack
+                   n_jobs:int = 1, # number of processes writing the sequences and preparing the browsers, see GenomeStack
+                   **kwargs # arguments passed to GenomeBrowser.__init__ for each browser. By default the first contig of each gff file is shown
+                  ):
+        """Stack of the genomes of many pairs of gff and fasta files. The sequences are memory mapped (see `genomenotebook.sequence.read_twobit`) 
+        and the annotations are only parsed for the visible genomes, so that stacks of hundreds of genomes fit in memory."""
+        seq_dir = tempfile.mkdtemp(prefix="genomenotebook_") if seq_dir is None else seq_dir
+        os.makedirs(seq_dir, exist_ok=True)
+        seq_id = kwargs.pop("seq_id", None)
+        seq_ids = [seq_id if seq_id is not None else _first_seq_id(gff_path) for gff_path, _ in pairs]
+        paths = [_twobit_path(fasta_path, sid, seq_dir) if fasta_path is not None else None for (_, fasta_path), sid in zip(pairs, seq_ids)]
+
+        #sequences are written once, and again only if their fasta file changed
+        todo = list({path: (fasta_path, sid, path) for (_, fasta_path), sid, path in zip(pairs, seq_ids, paths) 
+                     if path is not None and (not os.path.exists(path + ".other.npy") or os.path.getmtime(path + ".other.npy") < os.path.getmtime(fasta_path))}.values())
+        if n_jobs > 1 and len(todo) > 1 and "fork" in multiprocessing.get_all_start_methods():
+            with ProcessPoolExecutor(min(n_jobs, len(todo)), mp_context=multiprocessing.get_context("fork")) as executor:
+                written = list(executor.map(_write_fasta_twobit, *zip(*todo)))
+        else:
+            written = [_write_fasta_twobit(*args) for args in todo]
+        failed = {path for (fasta_path, _, path), ok in zip(todo, written) if not ok}
+        for fasta_path, _, path in todo:
+            if path in failed:
+                warnings.warn(f"genome file {fasta_path} cannot be parsed as a fasta file")
+
+        browsers = []
+        for (gff_path, fasta_path), sid, path in zip(pairs, seq_ids, paths):
+            seq = read_twobit(path) if path is not None and path not in failed else None
+            browsers.append(GenomeBrowser(gff_path=gff_path, fasta_path=fasta_path if seq is not None else None, seq_id=sid, seq=seq, **kwargs))
+        return cls(browsers, n_jobs=n_jobs, visible=visible)
             
     
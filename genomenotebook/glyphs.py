@@ -5,7 +5,7 @@
 # %% auto 0
 __all__ = ['default_types', 'default_attributes', 'Y_RANGE', 'default_glyphs', 'get_y_range', 'arrow_coordinates',
            'box_coordinates', 'Glyph', 'get_default_glyphs', 'get_patch_coordinates', 'html_wordwrap', 'get_tooltip',
-           'get_feature_name', 'get_feature_patches']
+           'get_feature_name', 'get_feature_patches', 'get_search_index']
 
 # %% ../nbs/API/02_glyphs.ipynb 5
 import numpy as np
@@ -270,3 +270,33 @@ def get_feature_patches(features: pd.DataFrame, #DataFrame of the features
         feature_patches["label_x"] = feature_patches["xbox_min"]
     
     return feature_patches
+
+# %% ../nbs/API/02_glyphs.ipynb 29
+def get_search_index(patches: pd.DataFrame, #feature patches as returned by get_feature_patches
+                     features: pd.DataFrame = None, #DataFrame of the features, only required if search_attributes is provided
+                     search_attributes: Optional[List[str]] = None, #list of attributes (e.g. locus_tag, product) to index in addition to the feature names
+                    ) -> dict:
+    """Builds the index used by the search box. Returns a dictionary with:
+
+            * index: upper-cased names (and attribute values) as keys and the left position of the feature as values
+            * keys: the sorted list of keys, used for prefix matching
+            * labels: the names as they appear in the annotation, in the same order as keys, used as completions
+    """
+    positions = patches["xs"].map(min).values
+    labels = [patches["names"]]
+    if search_attributes:
+        attrs = features.loc[patches.index, "attributes"]
+        labels += [attrs.map(lambda d, attr=attr: d.get(attr)) for attr in search_attributes]
+    
+    index = pd.DataFrame({"label": pd.concat(labels, ignore_index=True),
+                          "pos": np.tile(positions, len(labels))})
+    index = index.loc[index.label.notna()]
+    index["label"] = index.label.astype(str)
+    index["key"] = index.label.str.upper()
+    # when several features share a name, the search goes to the left-most one
+    index = index.loc[index.key != ""].sort_values("pos", kind="stable").drop_duplicates("key")
+    index = index.sort_values("key")
+
+    return {"index": dict(zip(index.key.tolist(), index.pos.tolist())),
+            "keys": index.key.tolist(),
+            "labels": index.label.tolist()}
@@ -5,8 +5,14 @@ from .js_callback_code import (
 
 x_range_change_callback_code=_get_js_code("x_range_change_callback_code.js")
 search_callback_code=_get_js_code("search_callback_code.js")
-sequence_search_code=_get_js_code("sequence_search_code.js")
+autocomplete_callback_code=_get_js_code("autocomplete_callback_code.js")
+sequence_search_code=_get_js_code("sequence_search_functions.js")+_get_js_code("sequence_search_code.js")
 track_callback_code=_get_js_code("track_callback_code.js")
 next_button_code=_get_js_code("next_button_code.js")
 previous_button_code=_get_js_code("previous_button_code.js")
-glyph_update_callback_code=_get_js_code("glyph_update_callback_code.js")
\ No newline at end of file
+glyph_update_callback_code=_get_js_code("glyph_update_callback_code.js")
+highlight_update_callback_code=_get_js_code("highlight_update_callback_code.js")
+interval_track_callback_code=_get_js_code("interval_track_callback_code.js")
+heatmap_callback_code=_get_js_code("heatmap_callback_code.js")
+variant_callback_code=_get_js_code("variant_callback_code.js")
+translation_callback_code=_get_js_code("translation_callback_code.js")
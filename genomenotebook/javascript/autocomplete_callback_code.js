@@ -0,0 +1,23 @@
+//Suggests at most max_completions names starting with the text being typed
+const searchString = cb_obj.value_input.toUpperCase();
+const keys = search_index.keys;
+const completions = [];
+
+if (searchString.length >= cb_obj.min_characters) {
+  //binary search of the first key that is not smaller than the search string
+  let lo = 0;
+  let hi = keys.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (keys[mid] < searchString) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  for (let i = lo; i < keys.length && completions.length < max_completions && keys[i].startsWith(searchString); i++) {
+    completions.push(search_index.labels[i]);
+  }
+}
+
+cb_obj.completions = completions;
@@ -0,0 +1,32 @@
+//Selects the finest level that shows less than max_bins bins in the field of view
+const width = x_range.end - x_range.start;
+let level = levels.length - 1;
+while (level > 0 && width / levels[level - 1].bin_size <= max_bins) {
+    level--;
+}
+
+//Rebuilds the image with the bins of this level within a field of view on each side
+//when the resolution changes or when getting close to the edge of the image
+if (level !== loaded_range.data['level'][0] ||
+    x_range.start - loaded_range.data['start'][0] < width / 2 ||
+    loaded_range.data['end'][0] - x_range.end < width / 2) {
+    const lvl = levels[level];
+    const i0 = Math.min(Math.max(Math.floor((x_range.start - width - lvl.origin) / lvl.bin_size), 0), lvl.n_bins);
+    const i1 = Math.min(Math.max(Math.ceil((x_range.end + width - lvl.origin) / lvl.bin_size), i0), lvl.n_bins);
+
+    //values are stored sample by sample. The image is built with the constructor of the (Bokeh NDArray) values so that it has a shape
+    const n_cols = i1 - i0;
+    const values = new Float32Array(n_samples * n_cols);
+    for (let s = 0; s < n_samples; s++) {
+        for (let i = 0; i < n_cols; i++) {
+            values[s * n_cols + i] = lvl.values[s * lvl.n_bins + i0 + i];
+        }
+    }
+    const image = new lvl.values.constructor(values, [n_samples, n_cols]);
+    image_source.data = {'image': [image], 
+                         'x': [lvl.origin + i0 * lvl.bin_size], 
+                         'y': [0], 
+                         'dw': [n_cols * lvl.bin_size], 
+                         'dh': [n_samples]};
+    loaded_range.data = {'start': [x_range.start - width], 'end': [x_range.end + width], 'level': [level]};
+}
@@ -0,0 +1,57 @@
+//Index of the first element of a sorted array that is greater than value
+function firstIndexAbove(array, value) {
+    let lo = 0;
+    let hi = array.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (array[mid] > value) {
+            hi = mid;
+        } else {
+            lo = mid + 1;
+        }
+    }
+    return lo;
+}
+
+//Slice of the regions (sorted by left) overlapping [start, end]
+function getWindow(source, start, end) {
+    const ix_start = firstIndexAbove(source.data['max_right'], start);
+    const ix_stop = firstIndexAbove(source.data[left], end);
+    return [ix_start, Math.max(ix_start, ix_stop)];
+}
+
+function sliceData(source, ix_start, ix_stop) {
+    const data = {};
+    for (let attr in source.data) {
+        data[attr] = source.data[attr].slice(ix_start, ix_stop);
+    }
+    return data;
+}
+
+function updateHighlights(start, end) {
+    let [ix_start, ix_stop] = getWindow(all_highlights, start, end);
+    //When too many regions are close to the view, the merged regions are shown instead
+    const merged = ix_stop - ix_start > max_loaded;
+    if (merged) {
+        [ix_start, ix_stop] = getWindow(merged_highlights, start, end);
+        loaded_merged.data = sliceData(merged_highlights, ix_start, ix_stop);
+        loaded_highlights.data = sliceData(all_highlights, 0, 0);
+    } else {
+        loaded_highlights.data = sliceData(all_highlights, ix_start, ix_stop);
+        loaded_merged.data = sliceData(merged_highlights, 0, 0);
+    }
+
+    loaded_range.data = {'start': [start], 'end': [end], 'range': [range], 'merged': [merged]};
+}
+
+const range = loaded_range.data['range'][0];
+const start = x_range.start - range;
+const end = x_range.end + range;
+
+//If getting close to the edge of loaded regions, or if the zoom level changes the number of regions to show, then reload them on current position
+const near_edge = x_range.start < loaded_range.data['start'][0] + 2000 || x_range.end > loaded_range.data['end'][0] - 2000;
+const [ix_start, ix_stop] = getWindow(all_highlights, start, end);
+const merged = ix_stop - ix_start > max_loaded;
+if (near_edge || merged !== loaded_range.data['merged'][0]) {
+    updateHighlights(start, end);
+}
@@ -0,0 +1,40 @@
+//Index of the first element of a sorted array that is greater than value
+function firstIndexAbove(array, value) {
+    let lo = 0;
+    let hi = array.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (array[mid] > value) {
+            hi = mid;
+        } else {
+            lo = mid + 1;
+        }
+    }
+    return lo;
+}
+
+//Selects the finest level that shows less than max_bins bins in the field of view
+const width = x_range.end - x_range.start;
+let level = bin_sizes.length - 1;
+while (level > 0 && width / bin_sizes[level - 1] <= max_bins) {
+    level--;
+}
+
+//Loads the intervals of this level within a field of view on each side
+//when the resolution changes or when getting close to the edge of the loaded intervals
+if (level !== loaded_range.data['level'][0] ||
+    x_range.start - loaded_range.data['start'][0] < width / 2 ||
+    loaded_range.data['end'][0] - x_range.end < width / 2) {
+    const start = x_range.start - width;
+    const end = x_range.end + width;
+    const source = levels[level];
+    const ix_start = firstIndexAbove(source.data['right'], start);
+    const ix_stop = Math.max(ix_start, firstIndexAbove(source.data['left'], end));
+
+    const data = {};
+    for (let attr in source.data) {
+        data[attr] = source.data[attr].slice(ix_start, ix_stop);
+    }
+    loaded_data.data = data;
+    loaded_range.data = {'start': [start], 'end': [end], 'level': [level]};
+}
@@ -0,0 +1,90 @@
+const IUPAC_MASKS = {A: 1, C: 2, G: 4, T: 8, U: 8, R: 5, Y: 10, S: 6, W: 9, K: 12, M: 3, B: 14, D: 13, H: 11, V: 7, N: 15};
+const IUPAC_COMPLEMENT = {A: "T", C: "G", G: "C", T: "A", U: "A", R: "Y", Y: "R", S: "S", W: "W", K: "M", M: "K", B: "V", D: "H", H: "D", V: "B", N: "N"};
+
+function getReverseComplement(seq) {
+    let reverseComplement = "";
+    for (let i = seq.length - 1; i >= 0; i--) {
+      reverseComplement += IUPAC_COMPLEMENT[seq[i]];
+    }
+    return reverseComplement;
+}
+
+function getQueryMasks(query) {
+    //bit mask of the bases matched by each letter of the query (A=1, C=2, G=4, T=8)
+    return Uint8Array.from(query, (letter) => IUPAC_MASKS[letter]);
+}
+
+function getSequenceBits(sequence) {
+    //bit mask encoding of the genome sequence, computed once and cached on the sequence object
+    //non ACGT bases are encoded as 0 so that they never match
+    if (sequence.bits === undefined) {
+        const baseBits = {A: 1, C: 2, G: 4, T: 8};
+        const bits = new Uint8Array(sequence.seq.length);
+        for (let i = 0; i < sequence.seq.length; i++) {
+            bits[i] = baseBits[sequence.seq[i]] || 0;
+        }
+        sequence.bits = bits;
+    }
+    return sequence.bits;
+}
+
+function countMismatches(bits, masks, i, maxMismatches) {
+    //returns the number of mismatches of the query at position i, or -1 if there are more than maxMismatches
+    let mismatches = 0;
+    for (let j = 0; j < masks.length; j++) {
+        if ((bits[i + j] & masks[j]) === 0 && ++mismatches > maxMismatches) {
+            return -1;
+        }
+    }
+    return mismatches;
+}
+
+function searchSequence(sequence, query, maxMismatches, from, direction, maxHits) {
+    //scans the sequence from the genome position `from` in the given direction (1 or -1) on both strands
+    //and returns at most maxHits hits sorted by position
+    const bits = getSequenceBits(sequence);
+    const forward = getQueryMasks(query);
+    const revQuery = getReverseComplement(query);
+    const reverse = revQuery === query ? null : getQueryMasks(revQuery); //palindromes are reported once
+    const last = bits.length - forward.length;
+
+    const hits = {left: [], orientation: [], mismatches: []};
+    let i = Math.floor(from) - sequence.bounds[0];
+    i = direction > 0 ? Math.max(i, 0) : Math.min(i, last);
+    for (; i >= 0 && i <= last && hits.left.length < maxHits; i += direction) {
+        for (const [masks, orientation] of [[forward, "+"], [reverse, "-"]]) {
+            if (masks === null) {
+                continue;
+            }
+            const mismatches = countMismatches(bits, masks, i, maxMismatches);
+            if (mismatches !== -1) {
+                hits.left.push(i + sequence.bounds[0]);
+                hits.orientation.push(orientation);
+                hits.mismatches.push(mismatches);
+            }
+        }
+    }
+    if (direction < 0) {
+        for (let attr in hits) {
+            hits[attr].reverse();
+        }
+    }
+    return hits;
+}
+
+function setSearchHits(search_span_source, hits, width) {
+    search_span_source.data = {
+        x: hits.left.map(v => v + width/2 + 0.5),
+        width: hits.left.map(() => width),
+        fill_color: hits.orientation.map(item => item === "+" ? "green" : "red"),
+        mismatches: hits.mismatches,
+    };
+}
+
+function centerOn(x_range, bounds, x) {
+    var w = (x_range.end - x_range.start)/2;
+    //Define new field of view
+    x_range.start = (x - w < bounds[0]) ? bounds[0] : x - w;
+    x_range.end = (x + w > bounds[1]) ? bounds[1] : x + w;
+}
+
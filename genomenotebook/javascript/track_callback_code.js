@@ -1,26 +1,57 @@
-
-function updateData() {
-    const max_glyph_loading_range=track_loaded_range.data['range'][0];
-    //console.log(pos);
-    const ix_start_find = all_data.data[pos].findIndex((element) => element > x_range.start - max_glyph_loading_range);
-    const ix_stop_find = all_data.data[pos].findIndex((element) => element > x_range.end + max_glyph_loading_range);
-
-    const last_ix = all_data.data[pos].length - 1;
-    const ix_start = ix_start_find === -1 ? 0 : ix_start_find; // takes the first element if element not found
-    const ix_stop = ix_stop_find === -1 ? last_ix : ix_stop_find; // takes the last element if element not found
-
-    //Select the glyph elements in the 20kb range of the searched gene
-    for (let attr in all_data.data) {
-        loaded_data.data[attr] = all_data.data[attr].slice(ix_start, ix_stop + 1);
-    }
-    
-    track_loaded_range.data['start'][0] = all_data.data[pos][ix_start];
-    track_loaded_range.data['end'][0] = all_data.data[pos][ix_stop];
-    loaded_data.change.emit();
-    track_loaded_range.change.emit();
-}
-
-//If getting close to the edge of loaded glyphs, then reload them on current position
-if (x_range.start<track_loaded_range.data.start[0]+2000 || x_range.end>track_loaded_range.data.end[0]-2000){
-    updateData()
-}
\ No newline at end of file
+const positions = all_data.data[pos];
+//level 0 contains all the data points, the next levels contain the indices of the points kept at lower resolutions
+const level_indices = [null].concat(levels);
+
+//Index of the first point of a level located after value
+function firstIndexAbove(indices, value) {
+    let lo = 0;
+    let hi = indices === null ? positions.length : indices.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (positions[indices === null ? mid : indices[mid]] > value) {
+            hi = mid;
+        } else {
+            lo = mid + 1;
+        }
+    }
+    return lo;
+}
+
+function updateData(level) {
+    const max_glyph_loading_range=track_loaded_range.data['range'][0];
+    const start = x_range.start - max_glyph_loading_range;
+    const end = x_range.end + max_glyph_loading_range;
+    const indices = level_indices[level];
+
+    //the points just outside of the window are also loaded so that lines reach the edges
+    const ix_start = Math.max(firstIndexAbove(indices, start) - 1, 0);
+    const ix_stop = firstIndexAbove(indices, end) + 1;
+
+    const data = {};
+    for (let attr in all_data.data) {
+        const column = all_data.data[attr];
+        if (indices === null) {
+            data[attr] = column.slice(ix_start, ix_stop);
+        } else {
+            //indices are decoded as Bokeh NDArrays, whose subarray() does not return a view of the selected range
+            const stop = Math.min(ix_stop, indices.length);
+            data[attr] = [];
+            for (let i = ix_start; i < stop; i++) {
+                data[attr].push(column[indices[i]]);
+            }
+        }
+    }
+    loaded_data.data = data;
+    track_loaded_range.data = {'start': [start], 'end': [end], 'range': [max_glyph_loading_range], 'level': [level]};
+}
+
+//Selects the finest resolution with less than max_view_points in the field of view
+let level = 0;
+while (level < levels.length && firstIndexAbove(level_indices[level], x_range.end) - firstIndexAbove(level_indices[level], x_range.start) > max_view_points) {
+    level++;
+}
+
+//If getting close to the edge of loaded glyphs or if the resolution changes, then reload them on current position
+if (level !== track_loaded_range.data.level[0] || x_range.start<track_loaded_range.data.start[0]+2000 || x_range.end>track_loaded_range.data.end[0]-2000){
+    updateData(level)
+}
@@ -0,0 +1,92 @@
+//Standard genetic code, indexed by the codon code 16*first + 4*second + third base (A=0, C=1, G=2, T=3)
+const CODON_TABLE = "KNKNTTTTRSRSIIMIQHQHPPPPRRRRLLLLEDEDAAAAGGGGVVVV*Y*YSSSS*CWCLFLF";
+const BASE_CODES = {"A": 0, "C": 1, "G": 2, "T": 3};
+
+//Index of the first element of a sorted array that is greater than value
+function firstIndexAbove(array, value) {
+    let lo = 0;
+    let hi = array.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (array[mid] > value) {
+            hi = mid;
+        } else {
+            lo = mid + 1;
+        }
+    }
+    return lo;
+}
+
+//Code of the base at a genome position, the complement is returned for the reverse strand
+function baseCode(pos, reverse) {
+    const code = BASE_CODES[sequence.seq[pos - sequence.bounds[0]]];
+    if (code === undefined) {
+        return undefined;
+    }
+    return reverse ? 3 - code : code;
+}
+
+//Translation of the ith CDS, from its first complete codon
+function translate(i) {
+    const reverse = cds.strand[i] < 0;
+    const n_codons = Math.floor((cds.right[i] - cds.left[i] - cds.phase[i]) / 3);
+    let residues = "";
+    for (let k = 0; k < n_codons; k++) {
+        let index = 0;
+        for (let j = 0; j < 3; j++) {
+            const pos = reverse ? cds.right[i] - cds.phase[i] - 3*k - j - 1 : cds.left[i] + cds.phase[i] + 3*k + j;
+            const code = baseCode(pos, reverse);
+            index = (code === undefined || index < 0) ? -1 : 4*index + code;
+        }
+        residues += index < 0 ? "X" : CODON_TABLE[index];
+    }
+    return residues;
+}
+
+//Translations are cached in a Map used as a LRU cache: keys are kept in the order they were last used
+let cache = residue_source._translations;
+if (cache === undefined) {
+    cache = residue_source._translations = new Map();
+}
+function cachedTranslation(i) {
+    let residues = cache.get(i);
+    if (residues === undefined) {
+        residues = translate(i);
+        if (cache.size >= max_cached_translations) {
+            cache.delete(cache.keys().next().value);
+        }
+    } else {
+        cache.delete(i);
+    }
+    cache.set(i, residues);
+    return residues;
+}
+
+//Only the CDS overlapping the field of view are translated, when zoomed in enough to read the residues
+const data = {"x": [], "y": [], "residue": []};
+if (x_range.end - x_range.start <= max_width) {
+    const n_cds = cds.left.length;
+    for (let i = firstIndexAbove(cds.max_right, x_range.start); i < n_cds && cds.left[i] < x_range.end; i++) {
+        if (cds.right[i] <= x_range.start) {
+            continue;
+        }
+        const residues = cachedTranslation(i);
+        const reverse = cds.strand[i] < 0;
+        //codon k is centered on origin + direction*(3k + 1.5)
+        const origin = reverse ? cds.right[i] - cds.phase[i] : cds.left[i] + cds.phase[i];
+        const direction = reverse ? -1 : 1;
+        const k0 = Math.max(0, Math.floor(direction * ((reverse ? x_range.end : x_range.start) - origin) / 3) - 1);
+        const k1 = Math.min(residues.length, Math.ceil(direction * ((reverse ? x_range.start : x_range.end) - origin) / 3) + 1);
+        for (let k = k0; k < k1; k++) {
+            const x = origin + direction * (3*k + 1.5);
+            if (x >= x_range.start - 1.5 && x <= x_range.end + 1.5) {
+                data["x"].push(x);
+                data["y"].push(cds.y[i]);
+                data["residue"].push(residues[k]);
+            }
+        }
+    }
+}
+if (data["x"].length > 0 || residue_source.data["x"].length > 0) {
+    residue_source.data = data;
+}
@@ -0,0 +1,56 @@
+//Index of the first element of a sorted array that is greater than value
+function firstIndexAbove(array, value) {
+    let lo = 0;
+    let hi = array.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (array[mid] > value) {
+            hi = mid;
+        } else {
+            lo = mid + 1;
+        }
+    }
+    return lo;
+}
+
+function sliceData(source, ix_start, ix_stop) {
+    const data = {};
+    for (let attr in source.data) {
+        data[attr] = source.data[attr].slice(ix_start, ix_stop);
+    }
+    return data;
+}
+
+//Calls are shown when there are less than max_calls in the field of view, otherwise the density of variants is shown
+const width = x_range.end - x_range.start;
+const x = all_calls.data['x'];
+const detailed = firstIndexAbove(x, x_range.end) - firstIndexAbove(x, x_range.start) <= max_calls;
+
+//Selects the finest density level that shows less than max_bins bins in the field of view
+let level = -1;
+if (!detailed) {
+    level = bin_sizes.length - 1;
+    while (level > 0 && width / bin_sizes[level - 1] <= max_bins) {
+        level--;
+    }
+}
+
+//Loads the calls or the density within a field of view on each side
+//when switching between them, when the resolution changes or when getting close to the edge of the loaded data
+if (level !== loaded_range.data['level'][0] ||
+    x_range.start - loaded_range.data['start'][0] < width / 2 ||
+    loaded_range.data['end'][0] - x_range.end < width / 2) {
+    const start = x_range.start - width;
+    const end = x_range.end + width;
+    if (detailed) {
+        loaded_calls.data = sliceData(all_calls, firstIndexAbove(x, start), firstIndexAbove(x, end));
+        loaded_density.data = sliceData(levels[0], 0, 0);
+    } else {
+        const source = levels[level];
+        const ix_start = firstIndexAbove(source.data['right'], start);
+        const ix_stop = Math.max(ix_start, firstIndexAbove(source.data['left'], end));
+        loaded_density.data = sliceData(source, ix_start, ix_stop);
+        loaded_calls.data = sliceData(all_calls, 0, 0);
+    }
+    loaded_range.data = {'start': [start], 'end': [end], 'level': [level]};
+}
@@ -18,11 +18,15 @@ from genomenotebook.javascript import (
     x_range_change_callback_code,
     glyph_update_callback_code,
     search_callback_code,
+    autocomplete_callback_code,
     sequence_search_code,
     next_button_code,
-    previous_button_code
+    previous_button_code,
+    translation_callback_code,
 )
 
+from genomenotebook.sequence import translate
+
 from bokeh.plotting import figure
 from bokeh.models.tools import BoxZoomTool
 from bokeh.models.glyphs import Patches
@@ -32,6 +36,7 @@ from bokeh.models import (
     ColumnDataSource,
     AutocompleteInput,
     TextInput,
+    Spinner,
     Button,
     Rect,
     Div,
@@ -49,9 +54,13 @@ from bokeh.plotting import save as bk_save #Need to rename the bokeh show functi
 
 import os
 import warnings
+import numpy as np
+import pandas as pd
 
 # %% ../nbs/API/03_plot.ipynb 7
 class GenomePlot():
+    _max_cached_translations = 1000 # maximum number of CDS translations kept by the translation callback
+    
     def __init__(self, browsers:Union["GenomeBrowser",List["GenomeBrowser"]], #a GenomeBrowser object or list of GenomeBrowser objects when a GenomeStack is rendered
                  output_backend:str="webgl" # can be "webgl" or "svg". webgl is more efficient but svg is a vectorial format that can be conveniently modified using other software
                 ):
@@ -85,7 +94,8 @@ class GenomePlot():
                 width=self.browser.width, 
                 bounds=self.browser.bounds,
                 max_glyph_loading_range=self.browser.max_glyph_loading_range,
-                output_backend=self.output_backend
+                output_backend=self.output_backend,
+                seq_id=self.browser.seq_id,
             )
         self.elements.append(fig)
         self.track_figs.append(fig)
@@ -146,12 +156,8 @@ def _add_annotations(self:GenomePlot):
     """
     
     #Filter initial glyphs by position
-    feature_patches = self.browser.patches.loc[(
-        self.browser.patches['xs'].apply(
-            lambda x: max(x)>self.x_range.start-self.browser.max_glyph_loading_range)) & (
-        self.browser.patches['xs'].apply(
-            lambda x: min(x)<self.x_range.end+self.browser.max_glyph_loading_range)
-        )].copy()
+    feature_patches = self.browser._patches_in(self.x_range.start-self.browser.max_glyph_loading_range,
+                                               self.x_range.end+self.browser.max_glyph_loading_range).copy()
     
     self._glyph_source = ColumnDataSource(feature_patches.to_dict(orient="list"))
     
@@ -225,7 +231,7 @@ def _set_js_callbacks(self:GenomePlot):
             args={
                 "x_range": self.main_fig.x_range,
                 "sequence": self.sequence_dic,
-                "all_glyphs":self.browser.patches.to_dict(orient="list"),
+                "all_glyphs":self.browser._get_glyph_data(),
                 "glyph_source": self._glyph_source,
                 "div": self._div,
                 "loaded_range":self._loaded_range,
@@ -236,7 +242,7 @@ def _set_js_callbacks(self:GenomePlot):
         self._glyph_update_callback = CustomJS(
             args={
                 "x_range": self.main_fig.x_range,
-                "all_glyphs":self.browser.patches.to_dict(orient="list"),
+                "all_glyphs":self.browser._get_glyph_data(),
                 "glyph_source": self._glyph_source,
                 "loaded_range":self._loaded_range,
             },
@@ -245,12 +251,88 @@ def _set_js_callbacks(self:GenomePlot):
 
         self.main_fig.x_range.js_on_change('start', self._xcb, self._glyph_update_callback)
 
+# %% ../nbs/API/03_plot.ipynb 13
+def _get_cds(features:pd.DataFrame, #features of the browser
+             patches:pd.DataFrame, #feature patches, in the same order as the features within the bounds
+             bounds:tuple,
+            ) -> pd.DataFrame:
+    """Returns the 0-based left, right, strand (1 or -1), phase and vertical position of the CDS within the bounds, sorted by left.
+    max_right is the largest right of the CDS up to each row, used to find the CDS overlapping a window with a binary search."""
+    features = features.loc[(features["right"] > bounds[0]) & (features["left"] < bounds[1])]
+    is_cds = (features.type == "CDS").values
+    features, patches = features.loc[is_cds], patches.loc[is_cds]
+    cds = pd.DataFrame({"left": features.left.values - 1, #feature coordinates are 1-based
+                        "right": features.right.values,
+                        "strand": np.where(features.strand.values == "-", -1, 1),
+                        "phase": pd.to_numeric(features.phase, errors="coerce").fillna(0).astype(int).values,
+                        "y": patches.ys.map(lambda ys: (min(ys) + max(ys)) / 2).values})
+    cds = cds.sort_values("left").reset_index(drop=True)
+    cds["max_right"] = cds.right.cummax()
+    return cds
+
+def _cds_residues(codes:np.ndarray, #encoded sequence of the browser
+                  offset:int, #position of the first base of codes
+                  cds:pd.DataFrame, #CDS as returned by _get_cds
+                  start:float, end:float,
+                 ) -> dict:
+    """Translates the CDS overlapping [start, end] and returns the position of the residues in this window, 
+    as the translation callback does when the view changes"""
+    data = {"x": [], "y": [], "residue": []}
+    first = np.searchsorted(cds.max_right.values, start, side="right")
+    for row in cds.iloc[first:].itertuples():
+        if row.left >= end:
+            break
+        if row.right <= start:
+            continue
+        reverse = row.strand < 0
+        if reverse:
+            region = codes[row.left - offset:row.right - row.phase - offset][::-1]
+            region = np.where(region == 4, 4, 3 - region)
+        else:
+            region = codes[row.left + row.phase - offset:row.right - offset]
+        residues = translate(region)
+        origin = row.right - row.phase if reverse else row.left + row.phase
+        direction = -1 if reverse else 1
+        centers = origin + direction * (3 * np.arange(len(residues)) + 1.5)
+        visible = np.flatnonzero((centers >= start - 1.5) & (centers <= end + 1.5))
+        data["x"] += centers[visible].tolist()
+        data["y"] += [row.y] * len(visible)
+        data["residue"] += [residues[k] for k in visible]
+    return data
+
+@patch
+def _add_translation(self:GenomePlot):
+    """Shows the amino acids under the CDS when zoomed in. 
+    CDS are only translated when they overlap the field of view, and the translations are kept in a LRU cache of the browser page."""
+    cds = _get_cds(self.browser.features, self.browser.patches, self.browser.bounds)
+    max_width = 3 * self.browser.width / 8 #a residue needs at least 8 pixels
+    residue_source = ColumnDataSource({"x": [], "y": [], "residue": []})
+    if self.x_range.end - self.x_range.start <= max_width:
+        residue_source.data = _cds_residues(self.browser._get_seq_codes(), self.browser.bounds[0], cds, self.x_range.start, self.x_range.end)
+
+    self._translation_callback = CustomJS(
+        args={
+            "x_range": self.main_fig.x_range,
+            "sequence": self.sequence_dic,
+            "cds": {col: cds[col].values for col in cds.columns},
+            "residue_source": residue_source,
+            "max_width": max_width,
+            "max_cached_translations": self._max_cached_translations,
+        },
+        code=translation_callback_code
+    )
+    self.main_fig.x_range.js_on_change('start', self._translation_callback)
+    self.main_fig.text(x="x", y="y", text="residue", source=residue_source,
+                       text_align="center", text_baseline="middle", text_font_size="8pt", text_color="black")
+
 # %% ../nbs/API/03_plot.ipynb 14
 @patch
 def _get_browser_elements(self:GenomePlot):
         self._add_annotations() 
         self._get_sequence_div()
         self._set_js_callbacks()
+        if self.browser.show_seq and self.browser.show_translation and len(self.browser.features) > 0:
+            self._add_translation()
 
         if self.browser.show_seq:
             self.elements = [self.main_fig,self._div]
@@ -261,21 +343,29 @@ def _get_browser_elements(self:GenomePlot):
 @patch
 def _get_search_box(self:GenomePlot):
         ## Create a text input widget for search
-        completions=set()
-        #for attr in self.patches.columns:
-        #    if not attr in ["xs","ys","color","pos"]:
-        #        completions.update(map(str,set(self.patches[attr])))
-        completions.update(map(str,set(self.browser.patches["names"])))
-        
-        search_input = AutocompleteInput(completions=list(completions), placeholder="search by name")
-        #search_input = TextInput()
+        # completions are filled while typing from the sorted keys of the search index
+        # so that the widget never holds more than max_completions names
+        search_input = AutocompleteInput(completions=[], 
+                                         max_completions=self.browser.max_completions,
+                                         case_sensitive=False,
+                                         restrict=False,
+                                         placeholder="search by name")
         
+        call_back_autocomplete = CustomJS(
+            args={
+                "search_index": self.browser.search_index,
+                "max_completions": self.browser.max_completions,
+            },
+            code=autocomplete_callback_code
+        )
+        search_input.js_on_change('value_input', call_back_autocomplete)
+
         call_back_search = CustomJS(
             args={
                 "x_range": self.x_range,
                 "glyph_source": self._glyph_source,
                 "bounds": self.browser.bounds,
-                "all_glyphs": self.browser.patches.to_dict(orient="list"),
+                "search_index": self.browser.search_index,
                 "loaded_range": self._loaded_range,
                 "div": self._div,
             },
@@ -289,12 +379,13 @@ def _get_search_box(self:GenomePlot):
 # %% ../nbs/API/03_plot.ipynb 18
 @patch
 def _get_sequence_search(self:GenomePlot):
-        """Returns a row of Bokeh elements containing the sequence search box a previous button and a next button"""
+        """Returns a row of Bokeh elements containing the sequence search box, the number of mismatches allowed, a previous button and a next button"""
 
         seq_input = TextInput(placeholder="search by sequence")
+        mismatch_input = Spinner(low=0, high=5, step=1, value=0, width=55)
 
         ## Adding BoxAnnotation to highlight search results
-        search_span_source = ColumnDataSource({"x":[],"width":[],"fill_color":[]})#"y":[]
+        search_span_source = ColumnDataSource({"x":[],"width":[],"fill_color":[],"mismatches":[]})#"y":[]
         h=Rect(x='x',y=0,
                width='width',
                height=self.main_fig.height,
@@ -305,17 +396,23 @@ def _get_sequence_search(self:GenomePlot):
         
         self.main_fig.add_glyph(search_span_source, h)
 
+        # only max_sequence_hits hits around the current view are loaded at once, 
+        # the next and previous buttons load the following pages of hits
         call_back_sequence_search = CustomJS(
             args={
                 "x_range": self.x_range,
                 "sequence": self.sequence_dic,
                 "bounds": self.browser.bounds,
                 "search_span_source": search_span_source,
+                "seq_input": seq_input,
+                "mismatch_input": mismatch_input,
+                "max_hits": self.browser.max_sequence_hits,
             },
             code=sequence_search_code
         )
 
         seq_input.js_on_change('value',call_back_sequence_search, self._xcb, self._glyph_update_callback)
+        mismatch_input.js_on_change('value',call_back_sequence_search, self._xcb, self._glyph_update_callback)
         
         sty=Styles(
                    margin_left="1px",
@@ -331,9 +428,7 @@ def _get_sequence_search(self:GenomePlot):
         
         nextButton_callback = CustomJS(
             args={
-                "x_range": self.x_range,
-                "bounds": self.browser.bounds,
-                "search_span_source": search_span_source,
+                "search_callback": call_back_sequence_search,
             },
             code=next_button_code)
         
@@ -347,15 +442,13 @@ def _get_sequence_search(self:GenomePlot):
         
         previousButton_callback = CustomJS(
             args={
-                "x_range": self.x_range,
-                "bounds": self.browser.bounds,
-                "search_span_source": search_span_source,
+                "search_callback": call_back_sequence_search,
             },
             code=previous_button_code)
         
         previousButton.js_on_event("button_click", previousButton_callback, self._xcb, self._glyph_update_callback)
 
-        return row(seq_input, previousButton, nextButton)
+        return row(seq_input, mismatch_input, previousButton, nextButton)
 
 # %% ../nbs/API/03_plot.ipynb 20
 @patch
@@ -379,3 +472,5 @@ def _collect_elements(self:GenomePlot):
         if modifier.data_tracks:
             for i, track in enumerate(self.tracks):
                 modifier.render(self.track_figs[i], True, track.__dict__)
+
+    self.layout = column(self.elements) #the same layout is shown and saved each time, as Bokeh models can only belong to one document
@@ -0,0 +1,555 @@
+"""Encoding, indexing and search of genome sequences"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/API/05_sequence.ipynb.
+
+# %% auto 0
+__all__ = ['BASES', 'IUPAC_CODES', 'CODON_TABLE', 'SEQUENCE_STATS', 'encode_seq', 'decode_seq', 'reverse_complement',
+           'iupac_masks', 'translate', 'kmer_codes', 'KmerIndex', 'scan_motifs', 'window_stats', 'extract_sequences',
+           'pack_seq', 'unpack_seq', 'TwoBitSeq', 'write_twobit', 'read_twobit']
+
+# %% ../nbs/API/05_sequence.ipynb 4
+from fastcore.basics import *
+
+import numpy as np
+import pandas as pd
+import re
+
+from Bio.Seq import Seq, SequenceDataAbstractBaseClass
+
+from typing import Union, Optional, List, Tuple
+
+# %% ../nbs/API/05_sequence.ipynb 6
+BASES = "ACGT"
+IUPAC_CODES = {"A":"A", "C":"C", "G":"G", "T":"T", "U":"T",
+               "R":"AG", "Y":"CT", "S":"CG", "W":"AT", "K":"GT", "M":"AC",
+               "B":"CGT", "D":"AGT", "H":"ACT", "V":"ACG", "N":"ACGT"}
+
+_COMPLEMENT = str.maketrans("ACGTURYSWKMBDHVN", "TGCAAYRSWMKVHDBN")
+
+# lookup table from ASCII codes to base codes (A=0, C=1, G=2, T=3), any other character is encoded as 4
+_ENCODING = np.full(256, 4, dtype=np.uint8)
+_ENCODING[np.frombuffer(b"ACGTacgt", dtype=np.uint8)] = [0, 1, 2, 3, 0, 1, 2, 3]
+
+_DECODING = np.frombuffer(b"ACGTN", dtype=np.uint8)
+
+# bit masks of the bases (A=1, C=2, G=4, T=8), the mask of non ACGT bases is 0 so that they never match
+_BITS = np.array([1, 2, 4, 8, 0], dtype=np.uint8)
+
+# %% ../nbs/API/05_sequence.ipynb 7
+def encode_seq(seq: Union[str, Seq], #DNA sequence
+              ) -> np.ndarray:
+    """Encodes a DNA sequence as a numpy array of uint8 with A=0, C=1, G=2, T=3 and 4 for any other character"""
+    if isinstance(seq, str):
+        seq = seq.encode("ascii")
+    return _ENCODING[np.frombuffer(bytes(seq), dtype=np.uint8)]
+
+# %% ../nbs/API/05_sequence.ipynb 8
+def decode_seq(codes: np.ndarray, #encoded sequence as returned by encode_seq
+              ) -> str:
+    """Decodes a sequence encoded with encode_seq, non ACGT bases are decoded as N"""
+    return _DECODING[codes].tobytes().decode("ascii")
+
+# %% ../nbs/API/05_sequence.ipynb 11
+def reverse_complement(seq: str, #DNA sequence, IUPAC codes are accepted
+                      ) -> str:
+    """Returns the reverse complement of a DNA sequence"""
+    return seq.upper().translate(_COMPLEMENT)[::-1]
+
+# %% ../nbs/API/05_sequence.ipynb 12
+def iupac_masks(query: str, #DNA sequence, IUPAC codes are accepted
+               ) -> np.ndarray:
+    """Encodes each letter of a query as a bit mask of the bases it matches (A=1, C=2, G=4, T=8)"""
+    query = query.upper()
+    unknown = set(query) - set(IUPAC_CODES)
+    if unknown:
+        raise ValueError(f"Invalid characters in query: {''.join(sorted(unknown))}")
+    return np.array([sum(1 << BASES.index(b) for b in IUPAC_CODES[c]) for c in query], dtype=np.uint8)
+
+# %% ../nbs/API/05_sequence.ipynb 16
+# standard genetic code, indexed by the codon code 16*first + 4*second + third base
+CODON_TABLE = "KNKNTTTTRSRSIIMIQHQHPPPPRRRRLLLLEDEDAAAAGGGGVVVV*Y*YSSSS*CWCLFLF"
+
+_AMINO_ACIDS = np.frombuffer((CODON_TABLE + "X").encode("ascii"), dtype=np.uint8)
+
+# %% ../nbs/API/05_sequence.ipynb 17
+def _translate_codes(codes: np.ndarray) -> np.ndarray:
+    """Translates an encoded sequence into the ASCII codes of the amino acids"""
+    n = len(codes) // 3 * 3
+    codons = codes[:n].reshape(-1, 3).astype(np.int64)
+    index = codons @ [16, 4, 1]
+    index[(codons == 4).any(axis=1)] = 64
+    return _AMINO_ACIDS[index]
+
+def translate(codes: np.ndarray, #sequence encoded with encode_seq, an incomplete last codon is ignored
+             ) -> str:
+    """Translates an encoded sequence with the standard genetic code. Codons containing a non ACGT base are translated as X."""
+    return _translate_codes(codes).tobytes().decode("ascii")
+
+# %% ../nbs/API/05_sequence.ipynb 21
+def kmer_codes(codes: np.ndarray, #sequence encoded with encode_seq
+               k: int, #length of the k-mers
+              ) -> np.ndarray:
+    """Returns the integer code of the k-mer starting at each position of an encoded sequence. 
+    K-mers containing a non ACGT base are encoded as -1."""
+    n = len(codes) - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    kmers = np.zeros(n, dtype=np.int64)
+    for j in range(k):
+        kmers = kmers*4 + (codes[j:j+n] & 3)
+
+    n_count = np.concatenate([[0], np.cumsum(codes == 4)])
+    kmers[n_count[k:k+n] - n_count[:n] > 0] = -1
+    return kmers
+
+# %% ../nbs/API/05_sequence.ipynb 23
+class KmerIndex:
+    _max_seed_expansion = 256 # maximum number of k-mers a degenerate seed can be expanded to before falling back to a full scan
+    _min_seed_length = 4 # shorter seeds are not selective enough and a full scan is faster
+
+    def __init__(self,
+                 seq: Union[str, Seq, np.ndarray], #sequence to index or sequence already encoded with encode_seq
+                 k: int = 8, #length of the k-mers used as seeds
+                ):
+        """Index of the positions of all the k-mers of a sequence. 
+        It is used to find short sequences with IUPAC codes and mismatches without scanning the whole sequence."""
+        self.k = k
+        self.codes = seq if isinstance(seq, np.ndarray) else encode_seq(seq)
+        self.bits = _BITS[self.codes]
+        self._short_kmers = {}
+        
+        kmers = kmer_codes(self.codes, k)
+        order = np.argsort(kmers, kind="stable")
+        kmers = kmers[order]
+        n_invalid = np.searchsorted(kmers, 0) # k-mers that contain a N are encoded as -1 and sorted first
+        self.positions = order[n_invalid:]
+        self.offsets = np.searchsorted(kmers[n_invalid:], np.arange(4**k + 1))
+        # positions not reachable through the index by seeds shorter than k
+        self.unindexed = np.concatenate([order[:n_invalid], np.arange(len(kmers), len(self.codes))])
+
+    def __len__(self):
+        return len(self.codes)
+
+# %% ../nbs/API/05_sequence.ipynb 24
+@patch
+def _seed_candidates(self:KmerIndex, masks:np.ndarray, mismatches:int) -> Optional[np.ndarray]:
+    """Returns the start positions that can match the query masks, or None if the query is too short or too degenerate to be seeded.
+    The query is split into mismatches+1 segments, at least one of them has to match exactly (pigeonhole principle).
+    Seeds shorter than k are looked up as a range of k-mers sharing the seed as a prefix."""
+    m = len(masks)
+    seg_len = m // (mismatches + 1)
+    seed_len = min(seg_len, self.k)
+    if seed_len < self._min_seed_length:
+        return None
+    
+    degeneracy = np.array([bin(mask).count("1") for mask in masks])
+    seeds = []
+    for seg_start in range(0, seg_len*(mismatches + 1), seg_len):
+        # use the least degenerate seed of the segment
+        n_kmers = [np.prod(degeneracy[i:i+seed_len]) for i in range(seg_start, seg_start + seg_len - seed_len + 1)]
+        if min(n_kmers) > self._max_seed_expansion:
+            return None
+        offset = seg_start + int(np.argmin(n_kmers))
+        
+        kmers = np.zeros(1, dtype=np.int64)
+        for mask in masks[offset:offset+seed_len]:
+            bases = [b for b in range(4) if mask >> b & 1]
+            kmers = (kmers[:, None]*4 + bases).ravel()
+        
+        suffixes = 4**(self.k - seed_len)
+        seeds.append((offset, self.offsets[kmers*suffixes], self.offsets[(kmers+1)*suffixes]))
+    
+    if sum((ends - starts).sum() for _, starts, ends in seeds) > len(self) // 4:
+        return None
+    
+    candidates = [self.positions[s:e] - offset for offset, starts, ends in seeds for s, e in zip(starts, ends) if e > s]
+    if seed_len < self.k:
+        candidates += [self.unindexed - offset for offset, _, _ in seeds]
+    
+    if len(candidates) == 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.unique(np.concatenate(candidates))
+    return candidates[(candidates >= 0) & (candidates <= len(self) - m)]
+
+# %% ../nbs/API/05_sequence.ipynb 25
+@patch
+def _count_mismatches(self:KmerIndex, masks:np.ndarray, starts:Optional[np.ndarray] = None) -> np.ndarray:
+    """Counts the mismatches between the query masks and the sequence at each start position (all positions if starts is None)"""
+    if starts is None:
+        n = len(self) - len(masks) + 1
+        mismatches = np.zeros(max(n, 0), dtype=np.int32)
+        for j, mask in enumerate(masks):
+            mismatches += (self.bits[j:j+n] & mask) == 0
+        return mismatches
+    return ((self.bits[starts[:, None] + np.arange(len(masks))] & masks) == 0).sum(axis=1)
+
+# %% ../nbs/API/05_sequence.ipynb 26
+def _concat_hits(hits:List[pd.DataFrame], #hits of each search
+                 columns:dict, #columns and dtypes of the hits, used when there are no searches
+                ) -> pd.DataFrame:
+    """Concatenates the hits of several searches"""
+    if len(hits) == 0:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in columns.items()})
+    return pd.concat(hits, ignore_index=True)
+
+@patch
+def find(self:KmerIndex,
+         query: str, #sequence to search for, IUPAC codes are accepted
+         mismatches: int = 0, #maximum number of mismatches
+         strand: str = "both", #"+", "-" or "both"
+         start: int = 0, #only hits with left >= start are returned
+         max_hits: Optional[int] = None, #maximum number of hits returned
+        ) -> pd.DataFrame:
+    """Finds the occurences of query in the indexed sequence. Returns a DataFrame with columns:
+
+            * left, right: 0-based coordinates of the hit, right is exclusive
+            * strand: "+" if the query matches the sequence, "-" if its reverse complement matches
+            * mismatches: number of mismatches
+            * sequence: matching sequence on the forward strand
+    """
+    if len(query) == 0:
+        raise ValueError("query must contain at least one base")
+    if strand not in ("+", "-", "both"):
+        raise ValueError(f"strand must be '+', '-' or 'both', not {strand}")
+    
+    query = query.upper()
+    patterns = []
+    if strand != "-":
+        patterns.append(("+", query))
+    rc_query = reverse_complement(query)
+    if strand == "-" or (strand == "both" and rc_query != query): #avoid reporting palindromes twice
+        patterns.append(("-", rc_query))
+
+    m = len(query)
+    hits = []
+    for pattern_strand, pattern in patterns:
+        masks = iupac_masks(pattern)
+        starts = self._seed_candidates(masks, mismatches)
+        counts = self._count_mismatches(masks, starts)
+        if starts is None:
+            starts = np.arange(len(counts))
+        found = counts <= mismatches
+        hits.append(pd.DataFrame({"left": starts[found],
+                                  "strand": pattern_strand,
+                                  "mismatches": counts[found]}))
+    
+    hits = _concat_hits(hits, {"left": np.int64, "strand": str, "mismatches": np.int64})
+    hits = hits.loc[hits.left >= start].sort_values(["left", "strand"], ignore_index=True)
+    if max_hits is not None:
+        hits = hits.head(max_hits)
+    
+    hits.insert(1, "right", hits.left + m)
+    windows = _DECODING[self.codes[hits.left.values[:, None] + np.arange(m)]]
+    hits["sequence"] = windows.view(f"S{m}").ravel().astype(str)
+    return hits
+
+# %% ../nbs/API/05_sequence.ipynb 32
+@patch
+def _kmers(self:KmerIndex, k:int) -> np.ndarray:
+    """Codes of the k-mers (k <= 4) starting at each position. K-mers containing a N are encoded as 4**k. Computed once and cached."""
+    if k not in self._short_kmers:
+        kmers = kmer_codes(self.codes, k)
+        kmers[kmers < 0] = 4**k
+        self._short_kmers[k] = kmers.astype(np.int16)
+    return self._short_kmers[k]
+
+# %% ../nbs/API/05_sequence.ipynb 33
+def _pwm_scores(index:KmerIndex, pwm:np.ndarray) -> np.ndarray:
+    """Scores every window of the indexed sequence with a (length x 4) position weight matrix.
+    The matrix is split in blocks of 4 positions that are scored with a single lookup of the 4-mer codes.
+    Blocks containing a N get the lowest possible score."""
+    n = len(index) - len(pwm) + 1
+    scores = np.zeros(max(n, 0), dtype=np.float32)
+    for j in range(0, len(pwm), 4):
+        block = pwm[j:j+4]
+        k = len(block)
+        # bases of each k-mer code, most significant first
+        digits = (np.arange(4**k)[:, None] // 4**np.arange(k - 1, -1, -1)) % 4
+        table = np.append(block[np.arange(k), digits].sum(axis=1), block.min(axis=1).sum()).astype(np.float32)
+        scores += table.take(index._kmers(k)[j:j+n])
+    return scores
+
+# %% ../nbs/API/05_sequence.ipynb 34
+def scan_motifs(index: KmerIndex, #index of the sequence to scan
+                motifs: Union[list, dict], #list of motifs or dictionary of motifs with names as keys. Motifs can be IUPAC strings, compiled regular expressions or position weight matrices (DataFrame with A, C, G, T columns or array of shape (length, 4))
+                mismatches: int = 0, #maximum number of mismatches for IUPAC motifs
+                strand: str = "both", #"+", "-" or "both"
+                pwm_threshold: float = 0.8, #minimum relative score (between 0 and 1) of position weight matrix hits
+               ) -> pd.DataFrame:
+    """Scans a sequence for a list of motifs on both strands. Returns a DataFrame with the motif name, left, right, strand, sequence, 
+    number of mismatches (IUPAC motifs) and relative score (position weight matrices) of each hit."""
+    if strand not in ("+", "-", "both"):
+        raise ValueError(f"strand must be '+', '-' or 'both', not {strand}")
+    if not isinstance(motifs, dict):
+        motifs = {_motif_name(motif, i): motif for i, motif in enumerate(motifs)}
+    
+    text = None # decoded sequence, only needed for regular expressions
+    hits = []
+    for name, motif in motifs.items():
+        if isinstance(motif, str):
+            motif_hits = index.find(motif, mismatches=mismatches, strand=strand)
+        elif isinstance(motif, re.Pattern):
+            if text is None:
+                text = decode_seq(index.codes)
+            motif_hits = _scan_regex(text, motif, strand)
+        else:
+            motif_hits = _scan_pwm(index, motif, strand, pwm_threshold)
+        motif_hits.insert(0, "motif", name)
+        hits.append(motif_hits)
+    
+    hits = _concat_hits(hits, {"motif": str, "left": np.int64, "right": np.int64, "strand": str, "sequence": str})
+    hits = hits.reindex(columns=["motif", "left", "right", "strand", "sequence", "mismatches", "score"])
+    return hits.sort_values(["left", "motif"], ignore_index=True)
+
+# %% ../nbs/API/05_sequence.ipynb 35
+def _motif_name(motif, i:int) -> str:
+    if isinstance(motif, str):
+        return motif
+    elif isinstance(motif, re.Pattern):
+        return motif.pattern
+    return f"pwm_{i}"
+
+# %% ../nbs/API/05_sequence.ipynb 36
+def _scan_regex(text:str, pattern:re.Pattern, strand:str) -> pd.DataFrame:
+    """Finds the (non overlapping) matches of a regular expression in the forward sequence and in its reverse complement"""
+    hits = []
+    if strand != "-":
+        hits += [(m.start(), m.end(), "+") for m in pattern.finditer(text)]
+    if strand != "+":
+        rc_text = reverse_complement(text)
+        hits += [(len(text) - m.end(), len(text) - m.start(), "-") for m in pattern.finditer(rc_text)]
+    hits = pd.DataFrame(hits, columns=["left", "right", "strand"])
+    hits["sequence"] = [text[l:r] for l, r in zip(hits.left, hits.right)]
+    return hits
+
+# %% ../nbs/API/05_sequence.ipynb 37
+def _scan_pwm(index:KmerIndex, pwm:Union[pd.DataFrame, np.ndarray], strand:str, threshold:float) -> pd.DataFrame:
+    """Finds the windows of the sequence with a relative score above threshold"""
+    if isinstance(pwm, pd.DataFrame):
+        pwm = pwm[list(BASES)].values
+    pwm = np.asarray(pwm, dtype=float)
+    if pwm.ndim != 2 or pwm.shape[1] != 4:
+        raise ValueError("position weight matrices must have a shape (length, 4) with A, C, G, T columns")
+    
+    min_score, max_score = pwm.min(axis=1).sum(), pwm.max(axis=1).sum()
+    strands = []
+    if strand != "-":
+        strands.append(("+", pwm))
+    if strand != "+":
+        strands.append(("-", pwm[::-1, ::-1])) # reverse complement: reversed positions and complementary bases
+
+    hits = []
+    for pwm_strand, matrix in strands:
+        scores = (_pwm_scores(index, matrix) - min_score) / max(max_score - min_score, 1e-12)
+        left = np.flatnonzero(scores >= threshold)
+        hits.append(pd.DataFrame({"left": left, "right": left + len(pwm), "strand": pwm_strand, "score": scores[left]}))
+    hits = _concat_hits(hits, {"left": np.int64, "right": np.int64, "strand": str, "score": np.float32})
+    windows = _DECODING[index.codes[hits.left.values[:, None] + np.arange(len(pwm))]]
+    hits["sequence"] = windows.view(f"S{len(pwm)}").ravel().astype(str)
+    return hits
+
+# %% ../nbs/API/05_sequence.ipynb 41
+SEQUENCE_STATS = ("gc", "gc_skew", "cumulative_gc_skew", "complexity")
+
+def _window_counts(symbols: np.ndarray, #integers between 0 and n_symbols-1, negative values are not counted
+                   n_symbols: int,
+                   windows: List[tuple], #list of (starts, ends) arrays
+                  ) -> List[np.ndarray]:
+    """Counts each symbol in several sets of windows, returns one (windows, n_symbols) matrix per set. 
+    Symbols are counted once with a `bincount` in blocks that tile all the windows, and blocks are summed with a cumulative sum."""
+    n = len(symbols)
+    windows = [(starts, np.minimum(ends, n)) for starts, ends in windows]
+    block = max(int(np.gcd.reduce(np.concatenate([np.concatenate(w) for w in windows]))), 1)
+    n_blocks = -(-n // block)
+    if n_blocks * n_symbols > 4 * n:
+        #blocks are too small, counting each symbol separately keeps the memory use proportional to the sequence length
+        counts = [np.concatenate([[0], np.cumsum(symbols == s, dtype=np.int64)]) for s in range(n_symbols)]
+        return [np.stack([c[ends] - c[starts] for c in counts], axis=1) for starts, ends in windows]
+    #one row per symbol so that the cumulative sums run over contiguous memory, non counted symbols go to an extra row
+    dtype = np.int32 if (n_symbols + 1) * n_blocks < 2**31 else np.int64
+    keys = np.where(symbols < 0, n_symbols, symbols).astype(dtype) * n_blocks
+    keys += np.repeat(np.arange(n_blocks, dtype=dtype), block)[:n]
+    counts = np.bincount(keys, minlength=(n_symbols + 1) * n_blocks).reshape(n_symbols + 1, n_blocks)[:n_symbols]
+    cumsum = np.concatenate([np.zeros((n_symbols, 1), dtype=np.int64), np.cumsum(counts, axis=1)], axis=1)
+    return [(cumsum[:, -(-ends // block)] - cumsum[:, starts // block]).T for starts, ends in windows]
+
+# %% ../nbs/API/05_sequence.ipynb 42
+def window_stats(codes: np.ndarray, #sequence encoded with encode_seq
+                 window: Union[int, List[int]], #size of the windows, or list of sizes
+                 step: Union[int, List[int]] = None, #distance between the starts of consecutive windows, defaults to half the window size
+                 stats: List[str] = SEQUENCE_STATS, #statistics to compute, among "gc", "gc_skew", "cumulative_gc_skew" and "complexity"
+                 k: int = 2, #length of the k-mers used to compute the complexity
+                ) -> Union[pd.DataFrame, List[pd.DataFrame]]:
+    """Computes statistics of a sequence in sliding windows. Each window is summarized by the `step` bp around its center, 
+    so that the returned intervals (left, right) tile the sequence. If a list of window sizes is given, a list of DataFrames is returned 
+    and the bases are only counted once for all the window sizes.
+    
+    - gc: fraction of G and C among the ACGT bases
+    - gc_skew: (G - C) / (G + C)
+    - cumulative_gc_skew: cumulative sum of G - C from the start of the sequence, averaged between the start and the end of the window
+    - complexity: Shannon entropy of the k-mers starting in the window divided by its maximum (2k bits). Low complexity regions have low values.
+    """
+    unknown = set(stats) - set(SEQUENCE_STATS)
+    if unknown:
+        raise ValueError(f"Unknown statistics: {', '.join(sorted(unknown))}")
+    single = isinstance(window, (int, np.integer))
+    windows = [window] if single else list(window)
+    steps = [step] * len(windows) if step is None or isinstance(step, (int, np.integer)) else list(step)
+    
+    n = len(codes)
+    levels = []
+    for window, step in zip(windows, steps):
+        window = max(1, min(window, n))
+        step = max(1, min(step if step else window // 2, window))
+        starts = np.arange(0, max(n - window, 0) + 1, step)
+        left = starts + (window - step) // 2
+        right = left + step
+        if len(starts):
+            left[0], right[-1] = 0, n
+        levels.append({"starts": starts, "ends": starts + window, "out": {"left": left, "right": right}})
+
+    bases = _window_counts(codes, 5, [(l["starts"], l["ends"]) for l in levels])
+    if "cumulative_gc_skew" in stats:
+        before = _window_counts(codes, 5, [(np.zeros_like(l["starts"]), l["starts"]) for l in levels])
+    if "complexity" in stats:
+        kmers = _window_counts(kmer_codes(codes, k), 4**k, [(l["starts"], l["ends"]) for l in levels])
+    
+    for i, level in enumerate(levels):
+        out = level["out"]
+        g, c = bases[i][:, 2], bases[i][:, 1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if "gc" in stats:
+                out["gc"] = (g + c) / bases[i][:, :4].sum(axis=1)
+            if "gc_skew" in stats:
+                out["gc_skew"] = (g - c) / (g + c)
+            if "cumulative_gc_skew" in stats:
+                out["cumulative_gc_skew"] = before[i][:, 2] - before[i][:, 1] + (g - c) / 2
+            if "complexity" in stats:
+                total = kmers[i].sum(axis=1, keepdims=True)
+                p = kmers[i] / np.where(total > 0, total, 1)
+                entropy = -(p * np.log2(np.where(p > 0, p, 1))).sum(axis=1)
+                out["complexity"] = np.where(total[:, 0] > 0, entropy / (2 * k), np.nan)
+    dfs = [pd.DataFrame(l["out"]) for l in levels]
+    return dfs[0] if single else dfs
+
+# %% ../nbs/API/05_sequence.ipynb 48
+def _gather_regions(codes: np.ndarray, #encoded sequence
+                    left: np.ndarray, right: np.ndarray, #0-based coordinates of the regions
+                    reverse: np.ndarray, #True for the regions read on the reverse strand
+                   ) -> np.ndarray:
+    """Concatenates the regions of an encoded sequence, regions on the reverse strand are reverse complemented"""
+    lengths = right - left
+    ends = np.cumsum(lengths)
+    within = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - lengths, lengths)
+    rev = np.repeat(reverse, lengths)
+    pos = np.where(rev, np.repeat(right - 1, lengths) - within, np.repeat(left, lengths) + within)
+    out = codes[pos]
+    return np.where(rev & (out < 4), 3 - out, out).astype(np.uint8)
+
+# %% ../nbs/API/05_sequence.ipynb 49
+def extract_sequences(codes: np.ndarray, #sequence encoded with encode_seq
+                      left: np.ndarray, #0-based start of the regions
+                      right: np.ndarray, #end of the regions (excluded)
+                      strand: np.ndarray = None, #"+" or "-" for each region, regions on the "-" strand are reverse complemented
+                      phase: np.ndarray = None, #number of bases to skip before the first codon when translating, defaults to 0
+                      translate: bool = False, #if True the protein sequences are returned
+                     ) -> List[str]:
+    """Extracts the sequences of many regions at once. Regions are clipped to the sequence. 
+    When translating, the phase is skipped from the 5' end of each region and incomplete codons are ignored."""
+    left = np.clip(np.asarray(left, dtype=np.int64), 0, len(codes))
+    right = np.clip(np.asarray(right, dtype=np.int64), left, len(codes))
+    reverse = np.zeros(len(left), dtype=bool) if strand is None else (np.asarray(strand) == "-")
+    if translate:
+        phase = np.zeros(len(left), dtype=np.int64) if phase is None else np.asarray(phase, dtype=np.int64)
+        length = np.maximum(right - left - phase, 0) // 3 * 3
+        left, right = np.where(reverse, right - phase - length, left + phase), np.where(reverse, right - phase, left + phase + length)
+    regions = _gather_regions(codes, left, right, reverse)
+    lengths = (right - left) // 3 if translate else right - left
+    text = (_translate_codes(regions) if translate else _DECODING[regions]).tobytes().decode("ascii")
+    ends = np.cumsum(lengths)
+    return [text[s:e] for s, e in zip((ends - lengths).tolist(), ends.tolist())]
+
+# %% ../nbs/API/05_sequence.ipynb 53
+def pack_seq(codes: np.ndarray, #sequence encoded with encode_seq
+            ) -> Tuple[np.ndarray, np.ndarray]:
+    """Packs an encoded sequence in 2 bits per base, 4 bases per byte. Returns the packed bytes and the [start, end[ intervals of the non ACGT bases, which are packed as A"""
+    codes = np.asarray(codes, dtype=np.uint8)
+    other = codes > 3
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = np.where(other, 0, codes)
+    packed = (padded[0::4] << 6) | (padded[1::4] << 4) | (padded[2::4] << 2) | padded[3::4]
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], other, [0])).astype(np.int8)))
+    return packed, edges.reshape(-1, 2)
+
+# %% ../nbs/API/05_sequence.ipynb 54
+def unpack_seq(packed: np.ndarray, #packed bytes returned by pack_seq
+               other: np.ndarray, #intervals of the non ACGT bases returned by pack_seq
+               start: int, #0-based start of the region to decode
+               end: int, #end of the region to decode (excluded)
+              ) -> np.ndarray:
+    """Encoded sequence (see encode_seq) of a region of a packed sequence. Only the bytes of the region are read."""
+    first = start // 4
+    chunk = np.asarray(packed[first:-(-end // 4)])
+    codes = np.empty((len(chunk), 4), dtype=np.uint8)
+    for i, shift in enumerate((6, 4, 2, 0)):
+        codes[:, i] = (chunk >> shift) & 3
+    codes = codes.ravel()[start - 4*first:end - 4*first]
+    if len(other):
+        for s, e in other[np.searchsorted(other[:, 1], start, side="right"):np.searchsorted(other[:, 0], end, side="left")]:
+            codes[max(s, start) - start:min(e, end) - start] = 4
+    return codes
+
+# %% ../nbs/API/05_sequence.ipynb 55
+class TwoBitSeq(SequenceDataAbstractBaseClass):
+    """Data of a Bio.Seq.Seq packed with pack_seq, decoded when the bases are requested. Slices of the sequence are not decoded until they are used."""
+    __slots__ = ("packed", "other", "start", "end")
+
+    def __init__(self,
+                 packed: np.ndarray, #packed bytes returned by pack_seq, can be a numpy memory map
+                 other: np.ndarray, #intervals of the non ACGT bases returned by pack_seq
+                 end: int, #length of the packed sequence, or end of the region of the sequence represented
+                 start: int = 0, #start of the region of the packed sequence represented
+                ):
+        self.packed, self.other, self.start, self.end = packed, other, start, end
+        super().__init__()
+
+    def __len__(self):
+        return self.end - self.start
+
+    def codes(self) -> np.ndarray:
+        """Encoded sequence, see encode_seq"""
+        return unpack_seq(self.packed, self.other, self.start, self.end)
+
+    def __bytes__(self):
+        return _DECODING[self.codes()].tobytes()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return bytes(self)[key]
+            if stop <= start:
+                return b""
+            if stop - start == len(self): #the full sequence must be returned as bytes
+                return bytes(self)
+            return TwoBitSeq(self.packed, self.other, self.start + stop, self.start + start)
+        start = self.start + range(len(self))[key]
+        return int(_DECODING[unpack_seq(self.packed, self.other, start, start + 1)[0]])
+
+# %% ../nbs/API/05_sequence.ipynb 56
+def write_twobit(seq: Union[str, Seq], #DNA sequence
+                 path: str, #path of the packed bases, written in the .npy format. The length and the intervals of the non ACGT bases are written in path + ".other.npy"
+                ):
+    """Writes a sequence packed in 2 bits per base"""
+    packed, other = pack_seq(encode_seq(seq))
+    #files are written through handles, as np.save would add the .npy extension to other paths
+    with open(path, "wb") as f:
+        np.save(f, packed)
+    with open(path + ".other.npy", "wb") as f:
+        np.save(f, np.concatenate(([len(seq)], other.ravel())))
+
+def read_twobit(path: str, #path of a sequence written by write_twobit
+               ) -> Seq:
+    """Memory maps a sequence written by write_twobit"""
+    other = np.load(path + ".other.npy")
+    return Seq(TwoBitSeq(np.load(path, mmap_mode="r"), other[1:].reshape(-1, 2), int(other[0])))
@@ -0,0 +1,286 @@
+"""Renders browsers and their tracks as a single SVG file without a web browser"""
+
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/API/06_svg.ipynb.
+
+# %% auto 0
+__all__ = ['render_svg']
+
+# %% ../nbs/API/06_svg.ipynb 4
+from fastcore.basics import *
+
+import numpy as np
+import pandas as pd
+import math
+import warnings
+from html import escape
+from typing import Union, List, Tuple
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from genomenotebook.browser import GenomeBrowser
+
+from bokeh.palettes import Category10_3, Category10_10
+
+from .track import _envelope_levels, _level_window
+
+# %% ../nbs/API/06_svg.ipynb 7
+_border = 5 # space above each figure in pixels
+_left_border = 20 # space on the left of the figures, for the first tick label
+_axis_size = 25 # space taken by the x axis below each figure
+_y_axis_size = 50 # space taken by the y axis on the right of the data tracks
+_default_color = "#1f77b4"
+_font = 'font-family="helvetica, arial, sans-serif"'
+
+def _num(x: float) -> str:
+    """Formats a pixel coordinate with 2 decimals at most"""
+    return f"{x:.2f}".rstrip("0").rstrip(".")
+
+def _color(color) -> str:
+    """SVG color of a Bokeh color given as a string or a RGB(A) tuple"""
+    if isinstance(color, (tuple, list)):
+        return "rgb({},{},{})".format(*color[:3])
+    return str(color)
+
+class _Frame:
+    """Maps data coordinates to the pixels of the frame of a figure"""
+    def __init__(self, left:float, top:float, width:float, height:float,
+                 x_range:Tuple[float,float], y_range:Tuple[float,float]):
+        self.left, self.top, self.width, self.height = left, top, width, height
+        self.x_range, self.y_range = x_range, y_range
+
+    def x(self, x):
+        return self.left + (np.asarray(x, dtype=float) - self.x_range[0]) * self.width / (self.x_range[1] - self.x_range[0])
+
+    def y(self, y):
+        y_span = (self.y_range[1] - self.y_range[0]) or 1
+        return self.top + self.height - (np.asarray(y, dtype=float) - self.y_range[0]) * self.height / y_span
+
+def _ticks(start:float, end:float, n:int = 6) -> np.ndarray:
+    """About n round numbers between start and end, as chosen by Bokeh's default ticker"""
+    if not end > start:
+        return np.array([start])
+    step = (end - start) / n
+    magnitude = 10 ** math.floor(math.log10(step))
+    step = min((m * magnitude for m in (1, 2, 5, 10)), key=lambda s: abs(s - step))
+    return np.arange(math.ceil(start / step), math.floor(end / step) + 1) * step
+
+def _tick_label(value:float, thousands:bool) -> str:
+    if thousands:
+        return f"{value:,.0f}" #same as the NumeralTickFormatter "0,0" of the figures
+    return f"{value:.6g}"
+
+# %% ../nbs/API/06_svg.ipynb 8
+def _svg_x_axis(frame:_Frame) -> List[str]:
+    y = frame.top + frame.height
+    out = [f'<line x1="{_num(frame.left)}" y1="{_num(y)}" x2="{_num(frame.left + frame.width)}" y2="{_num(y)}" stroke="black"/>']
+    for tick in _ticks(*frame.x_range):
+        x = _num(float(frame.x(tick)))
+        out.append(f'<line x1="{x}" y1="{_num(y)}" x2="{x}" y2="{_num(y + 6)}" stroke="black"/>')
+        out.append(f'<text x="{x}" y="{_num(y + 18)}" font-size="11px" text-anchor="middle" fill="#444444">{_tick_label(tick, True)}</text>')
+    return out
+
+def _svg_y_axis(frame:_Frame) -> List[str]:
+    x = frame.left + frame.width
+    out = [f'<line x1="{_num(x)}" y1="{_num(frame.top)}" x2="{_num(x)}" y2="{_num(frame.top + frame.height)}" stroke="black"/>']
+    for tick in _ticks(*frame.y_range, n=4):
+        y = _num(float(frame.y(tick)))
+        out.append(f'<line x1="{_num(x)}" y1="{y}" x2="{_num(x + 6)}" y2="{y}" stroke="black"/>')
+        out.append(f'<text x="{_num(x + 8)}" y="{y}" font-size="11px" dominant-baseline="middle" fill="#444444">{_tick_label(tick, False)}</text>')
+    return out
+
+# %% ../nbs/API/06_svg.ipynb 11
+def _initial_range(browser:"GenomeBrowser") -> Tuple[float, float]:
+    """Initial field of view of a browser, as set by GenomePlot"""
+    bounds = browser.bounds
+    init_pos = browser.init_pos
+    if init_pos is None or init_pos > bounds[1] or init_pos < bounds[0]:
+        init_pos = sum(bounds)//2
+    semi_win = min(browser.init_win, bounds[1] - bounds[0], browser.max_interval) / 2
+    return max(bounds[0], init_pos - semi_win), min(bounds[1], init_pos + semi_win)
+
+def _svg_patches(frame:_Frame, browser:"GenomeBrowser") -> List[str]:
+    """Feature glyphs and labels within the frame"""
+    patches = browser._patches_in(*frame.x_range)
+    out = []
+    for xs, ys, color, alpha in zip(patches["xs"], patches["ys"], patches.color, patches.alpha):
+        points = " ".join(f"{_num(x)},{_num(y)}" for x, y in zip(frame.x(xs), frame.y(ys)))
+        out.append(f'<polygon points="{points}" fill="{_color(color)}" fill-opacity="{alpha}" stroke="black"/>')
+    if browser.show_labels:
+        #the angle of the LabelSet is in radians, counterclockwise
+        angle = -(math.degrees(browser.label_angle) % 360)
+        for name, x, y in zip(patches.names, frame.x(patches.label_x) + browser.label_horizontal_offset, frame.y(patches.label_y)):
+            if name:
+                out.append(f'<text x="{_num(x)}" y="{_num(y)}" font-size="{browser.label_font_size}" fill="#444444" '
+                           f'transform="rotate({_num(angle)} {_num(x)} {_num(y)})">{escape(str(name))}</text>')
+    return out
+
+# %% ../nbs/API/06_svg.ipynb 13
+def _style(kwargs:dict) -> dict:
+    """SVG style of a glyph from the keyword arguments passed to the Bokeh function"""
+    color = kwargs.get("color", _default_color)
+    alpha = kwargs.get("alpha", 1)
+    return {"fill": _color(kwargs.get("fill_color", color)),
+            "fill_opacity": kwargs.get("fill_alpha", alpha),
+            "stroke": _color(kwargs.get("line_color", color)),
+            "stroke_opacity": kwargs.get("line_alpha", alpha),
+            "stroke_width": kwargs.get("line_width", 1),
+            "size": kwargs.get("size", 4),
+            "marker": kwargs.get("marker", "circle"),
+            "width": kwargs.get("width", 1),
+            "bottom": kwargs.get("bottom", 0),
+           }
+
+def _table_window(table:dict, pos:str, start:float, end:float, max_points:int) -> pd.DataFrame:
+    """Rows of a track table within [start, end] and the closest row on each side, decimated like in the browser when there are more than max_points"""
+    data = table["data"]
+    x = data[pos].values
+    levels = [None] + _envelope_levels(x, data[table["y"]].values, max_points)
+    level = 0
+    while level < len(levels) - 1 and np.diff(_level_window(x, levels[level], start, end))[0] > max_points:
+        level += 1
+    i0, i1 = _level_window(x, levels[level], start, end)
+    i0, i1 = max(i0 - 1, 0), i1 + 1
+    return data.iloc[i0:i1] if levels[level] is None else data.iloc[levels[level][i0:i1]]
+
+def _factor_colors(values, palette) -> dict:
+    """Colors of the factors, assigned in the order of the sorted factors. Factors beyond the size of the palette are gray, like with factor_cmap"""
+    factors = sorted(set(values), key=str)
+    return {f: palette[i] if i < len(palette) else "gray" for i, f in enumerate(factors)}
+
+def _svg_glyph(frame:_Frame, track, spec:dict) -> List[str]:
+    """Draws the data of a Track.line, Track.scatter, Track.bar or Track.highlight"""
+    start, end = frame.x_range
+    if spec["glyph"] == "highlight":
+        return _svg_highlights(frame, spec["data"], spec["left_col"], spec["right_col"], spec["color_col"], spec["alpha_col"])
+
+    style = _style(spec["kwargs"])
+    data = _table_window(track.tables[spec["table_ix"]], spec["pos"], start, end, 4 * frame.width)
+    xs, ys = frame.x(data[spec["pos"]].values), frame.y(data[spec["y"]].values)
+    if spec["glyph"] == "line":
+        out = []
+        #missing values break the line
+        for segment in np.split(np.arange(len(ys)), np.flatnonzero(np.isnan(ys))):
+            segment = segment[~np.isnan(ys[segment])]
+            if len(segment) > 1:
+                points = " ".join(f"{_num(x)},{_num(y)}" for x, y in zip(xs[segment], ys[segment]))
+                out.append(f'<polyline points="{points}" fill="none" stroke="{style["stroke"]}" '
+                           f'stroke-opacity="{style["stroke_opacity"]}" stroke-width="{style["stroke_width"]}"/>')
+        return out
+
+    legend = {}
+    if spec["factors"] is not None:
+        palette = Category10_10 if spec["glyph"] == "scatter" else Category10_3
+        legend = _factor_colors(track.tables[spec["table_ix"]]["data"][spec["factors"]].values, palette)
+        fills = strokes = [legend[v] for v in data[spec["factors"]].values]
+    else:
+        fills = [style["fill"]] * len(data)
+        strokes = [style["stroke"]] * len(data)
+    paint = lambda fill, stroke: (f'fill="{fill}" fill-opacity="{style["fill_opacity"]}" stroke="{stroke}" '
+                                  f'stroke-opacity="{style["stroke_opacity"]}" stroke-width="{style["stroke_width"]}"')
+    out = []
+    if spec["glyph"] == "scatter":
+        r = style["size"] / 2
+        for x, y, fill, stroke in zip(xs, ys, fills, strokes):
+            if np.isnan(y):
+                continue
+            if style["marker"] == "square":
+                out.append(f'<rect x="{_num(x - r)}" y="{_num(y - r)}" width="{_num(2*r)}" height="{_num(2*r)}" {paint(fill, stroke)}/>')
+            else:
+                out.append(f'<circle cx="{_num(x)}" cy="{_num(y)}" r="{_num(r)}" {paint(fill, stroke)}/>')
+    else: #bar
+        bottom = float(frame.y(style["bottom"]))
+        lefts = frame.x(data[spec["pos"]].values - style["width"] / 2)
+        rights = frame.x(data[spec["pos"]].values + style["width"] / 2)
+        for left, right, y, fill, stroke in zip(lefts, rights, ys, fills, strokes):
+            if np.isnan(y):
+                continue
+            out.append(f'<rect x="{_num(left)}" y="{_num(min(y, bottom))}" width="{_num(right - left)}" '
+                       f'height="{_num(abs(bottom - y))}" {paint(fill, stroke)}/>')
+    return out + _svg_legend(frame, legend, spec["factors"])
+
+def _svg_legend(frame:_Frame, colors:dict, title:str) -> List[str]:
+    """Legend of the factors in the top left corner of the frame"""
+    if not colors:
+        return []
+    x, y = frame.left + 10, frame.top + 10
+    out = [f'<rect x="{_num(x)}" y="{_num(y)}" width="100" height="{_num(20 * len(colors) + 22)}" fill="white" fill-opacity="0.95" stroke="#e5e5e5"/>',
+           f'<text x="{_num(x + 8)}" y="{_num(y + 16)}" font-size="13px" font-style="italic" fill="#444444">{escape(str(title))}</text>']
+    for i, (factor, color) in enumerate(colors.items()):
+        row_y = y + 22 + 20 * i
+        out.append(f'<rect x="{_num(x + 8)}" y="{_num(row_y + 3)}" width="14" height="14" fill="{color}"/>')
+        out.append(f'<text x="{_num(x + 28)}" y="{_num(row_y + 14)}" font-size="13px" fill="#444444">{escape(str(factor))}</text>')
+    return out
+
+def _svg_highlights(frame:_Frame, data:pd.DataFrame, left_col:str, right_col:str, color_col:str, alpha_col:str) -> List[str]:
+    start, end = frame.x_range
+    data = data.loc[(data[right_col] > start) & (data[left_col] < end)].sort_values(left_col, kind="stable")
+    top, bottom = frame.top, frame.top + frame.height
+    return [f'<rect x="{_num(left)}" y="{_num(top)}" width="{_num(right - left)}" height="{_num(bottom - top)}" '
+            f'fill="{_color(color)}" fill-opacity="{alpha}"/>'
+            for left, right, color, alpha in zip(frame.x(data[left_col].values), frame.x(data[right_col].values),
+                                                 data[color_col], data[alpha_col])]
+
+# %% ../nbs/API/06_svg.ipynb 15
+def _svg_panel(frame:_Frame, elements:List[str], clip_id:str, y_axis:bool) -> List[str]:
+    """A figure: its elements clipped to the frame and its axes"""
+    out = [f'<clipPath id="{clip_id}"><rect x="{_num(frame.left)}" y="{_num(frame.top)}" width="{_num(frame.width)}" height="{_num(frame.height)}"/></clipPath>',
+           f'<g clip-path="url(#{clip_id})">', *elements, '</g>']
+    out += _svg_x_axis(frame)
+    if y_axis:
+        out += _svg_y_axis(frame)
+    return out
+
+def _unsupported(name:str):
+    warnings.warn(f"{name} is not supported by the SVG writer and is left out of the figure")
+
+def render_svg(browsers:Union["GenomeBrowser", List["GenomeBrowser"]], # a GenomeBrowser or the list of browsers of a GenomeStack
+               fname:str = None, # if given the SVG is written to this file
+               title:str = "Genome Plot", # title of the SVG document
+              ) -> str:
+    """Renders the initial view of the browsers and their tracks as a single SVG document, without a web browser.
+    Browsers of a stack share the field of view of the widest browser, as in GenomeStack.show."""
+    if not isinstance(browsers, list):
+        browsers = [browsers]
+    widest = max(browsers, key=lambda b: b.bounds[1])
+    x_range = _initial_range(widest)
+    width = max(b.width for b in browsers)
+
+    panels = []
+    top = 0
+    for b, browser in enumerate(browsers):
+        gene_highlights = [m for m in browser.modifiers if m.gene_track]
+        track_highlights = [m for m in browser.modifiers if m.data_tracks]
+        frame = _Frame(_left_border, top + _border, browser.width, browser.height - _border - _axis_size, x_range, (0, 1))
+        elements = sum((_svg_modifier(frame, m) for m in gene_highlights), []) + _svg_patches(frame, browser)
+        panels += _svg_panel(frame, elements, f"frame{b}_0", y_axis=False)
+        top += browser.height
+
+        for t, track in enumerate(browser.tracks):
+            ylim = track.ylim if track.ylim is not None else (0, 1)
+            frame = _Frame(_left_border, top + _border, browser.width, track.height - _border - _axis_size, x_range, ylim)
+            elements = sum((_svg_modifier(frame, m) for m in track_highlights), [])
+            for render_method in track.render_methods:
+                if hasattr(render_method, "svg"):
+                    elements += _svg_glyph(frame, track, render_method.svg)
+                else:
+                    _unsupported("Track." + render_method.__qualname__.split(".")[0])
+            panels += _svg_panel(frame, elements, f"frame{b}_{t+1}", y_axis=True)
+            top += track.height
+
+    total_width = _left_border + width + _y_axis_size
+    svg = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{total_width}" height="{top}" viewBox="0 0 {total_width} {top}" {_font}>',
+           f'<title>{escape(title)}</title>',
+           '<rect width="100%" height="100%" fill="white"/>',
+           *panels,
+           '</svg>']
+    svg = "\n".join(svg) + "\n"
+    if fname is not None:
+        with open(fname, "w") as f:
+            f.write(svg)
+    return svg
+
+def _svg_modifier(frame:_Frame, modifier) -> List[str]:
+    if not hasattr(modifier, "left_col"):
+        _unsupported(type(modifier).__name__)
+        return []
+    return _svg_highlights(frame, modifier.data, modifier.left_col, modifier.right_col, modifier.color_col, modifier.alpha_col)
@@ -8,9 +8,6 @@ __all__ = ['Track']
 # %% ../nbs/API/01_track.ipynb 4
 from fastcore.basics import *
 
-from bokeh.io import output_notebook #|hide_line
-output_notebook(hide_banner=True) #|hide_line
-
 
 from bokeh.plotting import figure
 
@@ -21,11 +18,16 @@ from bokeh.models import (
     NumeralTickFormatter,
     Range1d,
     HoverTool,
+    LinearColorMapper,
+    FixedTicker,
+    CustomJSHover,
 )
 
-from .javascript import track_callback_code
+from .javascript import track_callback_code, highlight_update_callback_code, interval_track_callback_code, heatmap_callback_code, variant_callback_code
 
+import numpy as np
 import pandas as pd
+import re
 
 
 try: #pyBigWig cannot be installed on Windows
@@ -37,6 +39,9 @@ import warnings
 
 from typing import List, Callable
 
+from genomenotebook.utils import read_bed, read_bedgraph, read_wig, read_vcf
+from genomenotebook.sequence import SEQUENCE_STATS, encode_seq, window_stats
+
 
 
 # %% ../nbs/API/01_track.ipynb 7
@@ -57,6 +62,10 @@ class Track:
         self.tools = tools
 
         self.data = None
+        self.seq_id = None
+        self.bounds = None
+        self.tables = [] #tables of data plotted with Track.line, Track.scatter or Track.bar, shared by the glyphs plotting the same data
+        self._figure_sources = {} #data sources of the tables in the figure being rendered
 
         self.ylim = ylim
         self.bokeh_figure_args = kwargs
@@ -64,7 +73,9 @@ class Track:
 
         self.bokeh_args = kwargs
 
-    def get_fig(self, x_range, width, bounds, max_glyph_loading_range, output_backend):
+    def get_fig(self, x_range, width, bounds, max_glyph_loading_range, output_backend, seq_id=None):
+        self.seq_id = seq_id
+        self.bounds = bounds
         fig = figure(tools=self.tools,
                           active_scroll="xwheel_zoom",
                           height=self.height,
@@ -88,38 +99,123 @@ class Track:
 
 
         #self.track_loaded_data = None
+        self._figure_sources = {}
         for render_method in self.render_methods:
             render_method(self, fig, loaded_range)
 
         return fig
 
 # %% ../nbs/API/01_track.ipynb 12
+def _find_table(tables:List[dict], data:pd.DataFrame, pos:str, columns:List[str]):
+    """Returns the index of a table with the same positions as data and no conflicting columns, or None"""
+    for i, table in enumerate(tables):
+        if table["pos"] != pos or len(table["data"]) != len(data) or not data.index.equals(table["index"]):
+            continue
+        #positions are compared even for the same DataFrame, as they can have been changed in place
+        order = table["order"]
+        if not np.array_equal(data[pos].values[order], table["data"][pos].values):
+            continue
+        shared_columns = [c for c in columns if c in table["data"].columns]
+        if all(np.array_equal(data[c].values[order], table["data"][c].values) for c in shared_columns):
+            return i
+    return None
+
 @patch
 def set_track_data_source(self:Track, 
                           data:pd.DataFrame, # data to be plotted
                           pos, 
                           columns:List[str], # columns to store as data
-                         ):
+                          y:str = None, #column plotted on the y axis
+                         ) -> int:
+    """Stores the columns of data needed for a plot. Plots of the same data share a single table. Returns the index of the table in Track.tables."""
     columns=[c for c in columns if c] #some arguments can be None => remove them
     self.columns = columns
+    y = y if y else columns[0]
     
-    data=data[[pos]+columns].sort_values(pos)
+    table_ix = _find_table(self.tables, data, pos, columns)
+    if table_ix is None:
+        order = np.argsort(data[pos].values, kind="stable")
+        self.tables.append({"pos": pos,
+                            "index": data.index,
+                            "order": order,
+                            "data": data[[pos]+list(dict.fromkeys(columns))].iloc[order].copy(), #columns of later plots are added to it
+                            "y": [y]})
+        table_ix = len(self.tables) - 1
+    else:
+        table = self.tables[table_ix]
+        for c in columns:
+            if c not in table["data"].columns:
+                table["data"][c] = data[c].values[table["order"]]
+        if y not in table["y"]:
+            table["y"].append(y)
     
-    self.data=data
+    self.data = self.tables[table_ix]["data"]
 
-    y=columns[0] # TODO: columns[0] seems kind of arbitrary, this should probably be set in set_figure data? Or the functions for individual plot types
     if self.ylim == None:
         ymin = data[y].values.min()
         ymax = data[y].values.max()
         self.ylim = (ymin, ymax) 
+    return table_ix
 
 
+def _envelope_levels(x:np.ndarray, #sorted positions
+                     y:np.ndarray, #values, or matrix of values with one column per series
+                     max_points:int, #the pyramid stops when a level has less than max_points rows
+                    ) -> List[np.ndarray]:
+    """Computes a decimation pyramid of one or several series. Each level keeps the rows of the minimum and maximum of each series
+    in bins 4 times larger than in the previous level, so that peaks are preserved at all resolutions."""
+    y = y.reshape(len(x), -1)
+    levels = []
+    indices = np.arange(len(x))
+    bin_size = 4 * (x[-1] - x[0]) / len(x) if len(x) > 1 else 0
+    while len(indices) > max_points and bin_size > 0:
+        #the minimum and maximum of a bin are among the minima and maxima of the previous level
+        bins = ((x[indices] - x[0]) // bin_size).astype(np.int64)
+        kept = np.zeros(len(indices), dtype=bool)
+        for series in y[indices].T:
+            order = np.lexsort((series, bins))
+            sorted_bins = bins[order]
+            first = np.r_[True, sorted_bins[1:] != sorted_bins[:-1]]
+            last = np.r_[first[1:], True]
+            kept[order[first | last]] = True
+        indices = indices[kept]
+        levels.append(indices.astype(np.int32))
+        bin_size *= 4
+    return levels
+
+def _level_window(x:np.ndarray, indices:np.ndarray, start:float, end:float):
+    """Returns the slice of a level (`indices` of the sorted positions `x`, or all the positions if None) between start and end"""
+    level_x = x if indices is None else x[indices]
+    return np.searchsorted(level_x, start, side="right"), np.searchsorted(level_x, end, side="right")
+
 @patch
-def set_figure_data_source(self:Track, fig, pos, loaded_range):
-    all_data = ColumnDataSource(self.data)
-    data_subset = self.data.loc[(loaded_range.data["start"][0] < self.data[pos]
-                 ) & (
-                 self.data[pos] < loaded_range.data["end"][0])]
+def set_figure_data_source(self:Track, fig, pos, loaded_range, table_ix=None):
+    """Returns the data source of a table for the figure being rendered. 
+    The source, its loading callback and its hover tool are created once per table and shared by the glyphs plotting the table."""
+    table_ix = table_ix if table_ix is not None else len(self.tables) - 1
+    if table_ix in self._figure_sources:
+        return self._figure_sources[table_ix]
+    
+    table = self.tables[table_ix]
+    data = table["data"]
+    columns = [c for c in data.columns if c != pos]
+    x = data[pos].values
+    max_view_points = 4 * (fig.frame_width or 1000)
+    levels = _envelope_levels(x, data[table["y"]].values, max_view_points)
+
+    #the finest level with less than max_view_points in the field of view is loaded
+    level = 0
+    level_indices = [None] + levels
+    while level < len(levels) and np.diff(_level_window(x, level_indices[level], fig.x_range.start, fig.x_range.end))[0] > max_view_points:
+        level += 1
+    loaded_range = ColumnDataSource({"start":[loaded_range.data["start"][0]],
+                                     "end":[loaded_range.data["end"][0]],
+                                     "range":[loaded_range.data["range"][0]],
+                                     "level":[level]})
+    ix_start, ix_stop = _level_window(x, level_indices[level], loaded_range.data["start"][0], loaded_range.data["end"][0])
+    data_subset = data.iloc[ix_start:ix_stop] if level == 0 else data.iloc[levels[level-1][ix_start:ix_stop]]
+
+    all_data = ColumnDataSource(data)
     loaded_data = ColumnDataSource(data_subset)
     if len(data_subset)>10**5:
         warnings.warn("You are trying to plot more than 10^5 glyphs, this might overflow your memory. \
@@ -132,6 +228,8 @@ def set_figure_data_source(self:Track, fig, pos, loaded_range):
             "all_data":all_data,
             "loaded_data": loaded_data,
             "track_loaded_range":loaded_range,
+            "levels": levels,
+            "max_view_points": max_view_points,
         },
             code = track_callback_code
     )
@@ -139,8 +237,9 @@ def set_figure_data_source(self:Track, fig, pos, loaded_range):
     ymin, ymax = self.ylim
     fig.y_range=Range1d(ymin,ymax,
             bounds=(ymin,ymax))
-    tooltips=[(attr,f"@{attr}") for attr in set(self.columns)]
+    tooltips=[(attr,f"@{attr}") for attr in columns]
     fig.add_tools(HoverTool(tooltips=tooltips))
+    self._figure_sources[table_ix] = loaded_data
     return loaded_data
 
 
@@ -163,16 +262,17 @@ def line(self:Track,
         raise ValueError("hover_data must be None, str, or List")
 
     def render_method(track, fig, loaded_range):
-        loaded_data = track.set_figure_data_source(fig, pos, loaded_range)
+        loaded_data = track.set_figure_data_source(fig, pos, loaded_range, table_ix)
         fig.line(source=loaded_data, x=pos, y=y, **kwargs)
     
-    self.set_track_data_source(data, pos, columns=[y]+hover_data)
+    table_ix = self.set_track_data_source(data, pos, columns=[y]+hover_data, y=y)
+    render_method.svg = {"glyph": "line", "table_ix": table_ix, "pos": pos, "y": y, "factors": None, "kwargs": kwargs} #used by genomenotebook.svg
 
     self.render_methods.append(render_method)
 
 
 # %% ../nbs/API/01_track.ipynb 17
-from bokeh.transform import factor_cmap
+from bokeh.transform import factor_cmap, linear_cmap, dodge
 
 # %% ../nbs/API/01_track.ipynb 18
 @patch
@@ -194,7 +294,7 @@ def scatter(self:Track,
         raise ValueError("hover_data must be None, str, or List")
 
     def render_method(track, fig, loaded_range):
-        loaded_data = track.set_figure_data_source(fig, pos, loaded_range)
+        loaded_data = track.set_figure_data_source(fig, pos, loaded_range, table_ix)
         if factors!=None:
             color=factor_cmap(factors,"Category10_10",tuple(set(data[factors].values)))
             
@@ -207,7 +307,8 @@ def scatter(self:Track,
 
             
 
-    self.set_track_data_source(data, pos=pos, columns=[y,factors]+hover_data)
+    table_ix = self.set_track_data_source(data, pos=pos, columns=[y,factors]+hover_data, y=y)
+    render_method.svg = {"glyph": "scatter", "table_ix": table_ix, "pos": pos, "y": y, "factors": factors, "kwargs": kwargs} #used by genomenotebook.svg
     self.render_methods.append(render_method)
     
 
@@ -233,7 +334,7 @@ def bar(self:Track,
         raise ValueError("hover_data must be None, str, or List")
 
     def render_method(track, fig, loaded_range):
-        loaded_data = track.set_figure_data_source(fig, pos, loaded_range)
+        loaded_data = track.set_figure_data_source(fig, pos, loaded_range, table_ix)
         if factors!=None:
             color=factor_cmap(factors,"Category10_3",tuple(set(data[factors].values)))
             
@@ -244,7 +345,8 @@ def bar(self:Track,
         else:
             fig.vbar(source=loaded_data, x=pos, top=y, **kwargs)
 
-    self.set_track_data_source(data, pos, columns=[y,factors]+hover_data)
+    table_ix = self.set_track_data_source(data, pos, columns=[y,factors]+hover_data, y=y)
+    render_method.svg = {"glyph": "bar", "table_ix": table_ix, "pos": pos, "y": y, "factors": factors, "kwargs": kwargs} #used by genomenotebook.svg
     self.render_methods.append(render_method)
 
 # %% ../nbs/API/01_track.ipynb 28
@@ -260,6 +362,93 @@ def custom(self:Track,
 
     self.render_methods.append(render_method)
 
+# %% ../nbs/API/01_track.ipynb 29
+def _merge_highlights(data:pd.DataFrame, left_col:str, right_col:str, color_col:str, alpha_col:str, gap:float):
+    """Merges highlighted regions (sorted by `left_col`) that are less than `gap` bp apart, 
+    keeping the color and alpha of the first region of each group and counting the merged regions"""
+    if len(data) == 0:
+        return data[[left_col, right_col, color_col, alpha_col]].assign(count=np.zeros(0, dtype=np.int64), max_right=data[right_col].values)
+    left = data[left_col].values
+    max_right = np.maximum.accumulate(data[right_col].values)
+    group_starts = np.flatnonzero(np.r_[True, left[1:] > max_right[:-1] + gap])
+    group_ends = np.r_[group_starts[1:], len(left)] - 1
+    merged = pd.DataFrame({left_col: left[group_starts],
+                           right_col: max_right[group_ends],
+                           color_col: data[color_col].values[group_starts],
+                           alpha_col: data[alpha_col].values[group_starts],
+                           "count": group_ends - group_starts + 1})
+    merged["max_right"] = merged[right_col].values
+    return merged
+
+def _highlight_window(data:pd.DataFrame, left_col:str, start:float, end:float):
+    """Returns the slice of the regions (sorted by `left_col`) that overlap the interval [start, end]"""
+    ix_start = np.searchsorted(data["max_right"].values, start, side="right")
+    ix_stop = np.searchsorted(data[left_col].values, end, side="right")
+    return ix_start, max(ix_start, ix_stop)
+
+def _add_highlights(fig, 
+                    data:pd.DataFrame, #regions to highlight
+                    left_col:str, right_col:str, color_col:str, alpha_col:str,
+                    hover_data:List[str],
+                    bottom:float, top:float,
+                    max_glyph_loading_range:int = 20000, #regions further away from the field of view are not loaded
+                    max_loaded_highlights:int = 2000, #above this number of regions around the view, merged regions are shown instead
+                    **kwargs, #enables to pass keyword arguments used by the Bokeh function
+                   ):
+    """Adds highlighted regions to `fig`. Only the regions close to the field of view are loaded in the plot, 
+    and dense regions are merged when zoomed out."""
+    data = data[[left_col,right_col,color_col,alpha_col]+hover_data].sort_values(left_col, kind="stable").reset_index(drop=True)
+    data["max_right"] = np.maximum.accumulate(data[right_col].values)
+    
+    #regions closer than a pixel at the widest zoom are merged
+    x_range = fig.x_range
+    widest_view = x_range.max_interval or (data["max_right"].max() - data[left_col].min())
+    merged = _merge_highlights(data, left_col, right_col, color_col, alpha_col, gap=widest_view/(fig.frame_width or 1000))
+
+    start = x_range.start - max_glyph_loading_range
+    end = x_range.end + max_glyph_loading_range
+    ix_start, ix_stop = _highlight_window(data, left_col, start, end)
+    use_merged = ix_stop - ix_start > max_loaded_highlights
+    merged_start, merged_stop = _highlight_window(merged, left_col, start, end) if use_merged else (0, 0)
+
+    loaded_highlights = ColumnDataSource(data.iloc[ix_start:ix_stop] if not use_merged else data.iloc[:0])
+    loaded_merged = ColumnDataSource(merged.iloc[merged_start:merged_stop])
+    loaded_range = ColumnDataSource({"start":[start],
+                                     "end":[end],
+                                     "range":[max_glyph_loading_range],
+                                     "merged":[bool(use_merged)]})
+
+    renderers = []
+    for source in (loaded_highlights, loaded_merged):
+        r = Quad(left=left_col, right=right_col,
+                 bottom=bottom,
+                 top=top,
+                 fill_color=color_col,
+                 fill_alpha=alpha_col,
+                 line_alpha=0,
+                 **kwargs)
+        renderers.append(fig.add_glyph(source, r))
+
+    tooltips=[(f"{left_col} - {right_col}",f"@{left_col} - @{right_col}")]+[(f"{attr}",f"@{attr}") for attr in hover_data]
+    fig.add_tools(HoverTool(renderers=renderers[:1], tooltips=tooltips))
+    fig.add_tools(HoverTool(renderers=renderers[1:], tooltips=tooltips[:1]+[("merged regions","@count")]))
+
+    xcb = CustomJS(
+        args = {
+            "x_range": x_range,
+            "left": left_col,
+            "all_highlights": ColumnDataSource(data),
+            "merged_highlights": ColumnDataSource(merged),
+            "loaded_highlights": loaded_highlights,
+            "loaded_merged": loaded_merged,
+            "loaded_range": loaded_range,
+            "max_loaded": max_loaded_highlights,
+        },
+        code = highlight_update_callback_code
+    )
+    x_range.js_on_change('start', xcb)
+    return renderers
+
 # %% ../nbs/API/01_track.ipynb 30
 @patch
 def highlight(self:Track,
@@ -285,11 +474,6 @@ def highlight(self:Track,
     else:
         raise ValueError("hover_data must be None, str, or List")
 
-    if color_col not in self.data.columns:
-        data[color_col] = 'green'
-    if alpha_col not in self.data.columns:
-        data[alpha_col] = alpha
-
     if data is None:
         if left is None or right is None or color is None:
             raise ValueError("If `data` is not provided, then left, right, and color must be specified")
@@ -297,27 +481,638 @@ def highlight(self:Track,
     else:
         data = data.copy() # copy the dataframe because we modify it below, and users might not expect their input to be modified.
 
+    if color_col not in data.columns:
+        data[color_col] = color
+    if alpha_col not in data.columns:
+        data[alpha_col] = alpha
+
+    def render_method(track, fig, loaded_range):
+        if track.ylim is None:
+            warnings.warn("When adding highlights to a track, ylim needs to be defined. \
+                          You can eigher set ylim manually when creating the track, or plot data using Track.line, Track.scatter or Track.bar before adding the highlight.")
+        _add_highlights(fig, data, left_col, right_col, color_col, alpha_col, hover_data,
+                        bottom=track.ylim[0],
+                        top=track.ylim[1],
+                        max_glyph_loading_range=loaded_range.data["range"][0],
+                        **kwargs)
+    render_method.svg = {"glyph": "highlight", "data": data, "left_col": left_col, "right_col": right_col, #used by genomenotebook.svg
+                         "color_col": color_col, "alpha_col": alpha_col}
+    self.render_methods.append(render_method)
+
+# %% ../nbs/API/01_track.ipynb 32
+def _find_chrom(chroms, #names of the sequences in a bigWig file
+                seq_id:str, #id of the browser sequence
+               ) -> str:
+    """Returns the name of `seq_id` in `chroms`. Ids that only differ by an accession prefix 
+    or version suffix (e.g. NZ_JAGURL010000013.1 and JAGURL010000013) are matched"""
+    if seq_id in chroms:
+        return seq_id
+    accession = lambda s: re.sub(r"\.\d+$", "", re.sub(r"^[A-Z]{2}_", "", s))
+    matches = [c for c in chroms if accession(c) == accession(seq_id)]
+    if len(matches) != 1:
+        raise ValueError(f"Could not find the sequence {seq_id} in the bigWig file, use the seq_id argument to specify it")
+    return matches[0]
+
+def _bin_intervals(left:np.ndarray, right:np.ndarray, value:np.ndarray, #intervals, sorted and non overlapping
+                   start:int, end:int, bin_size:int,
+                   stat:str = "mean", #"mean", "max" or "min"
+                  ) -> pd.DataFrame:
+    """Summarizes the values of the intervals in bins of `bin_size` between `start` and `end`. Empty bins are dropped."""
+    edges = np.r_[np.arange(start, end, bin_size), end]
+    left = np.clip(left, start, end).astype(np.int64)
+    right = np.clip(right, start, end).astype(np.int64)
+    keep = right > left
+    left, right, value = left[keep], right[keep], value[keep]
+
+    #each interval contributes to all the bins it overlaps
+    first_bin = (left - start) // bin_size
+    n_bins = (right - 1 - start) // bin_size - first_bin + 1
+    interval = np.repeat(np.arange(len(left)), n_bins)
+    bins = first_bin[interval] + np.arange(len(interval)) - np.repeat(np.cumsum(n_bins) - n_bins, n_bins)
+    overlap = np.minimum(right[interval], edges[bins+1]) - np.maximum(left[interval], edges[bins])
+
+    covered = np.bincount(bins, overlap, minlength=len(edges)-1)
+    if stat == "mean":
+        values = np.bincount(bins, overlap*value[interval], minlength=len(edges)-1)
+        values = np.divide(values, covered, out=np.zeros_like(values), where=covered>0)
+    elif stat in ("max", "min"):
+        values = np.full(len(edges)-1, -np.inf if stat == "max" else np.inf)
+        (np.maximum if stat == "max" else np.minimum).at(values, bins, value[interval])
+    else:
+        raise ValueError("stat must be 'mean', 'max' or 'min'")
+    
+    covered = covered > 0
+    return pd.DataFrame({"left": edges[:-1][covered], "right": edges[1:][covered], "value": values[covered]})
+
+def _read_bigwig(bw, chrom:str, start:int, end:int,
+                 stat:str = "mean",
+                 max_points:int = 200000, #maximum number of intervals kept in memory
+                ) -> (pd.DataFrame, int):
+    """Reads the intervals of `chrom` between `start` and `end` chunk by chunk. 
+    If there are more than `max_points` intervals, they are summarized in `max_points` bins instead.
+    Returns the intervals and their average size."""
+    bin_size = max(1, int(np.ceil((end - start) / max_points)))
+    chunk_size = bin_size * 2**16
+    chunks = []
+    n = 0
+    binned = False
+    for chunk_start in range(start, end, chunk_size):
+        chunk_end = min(chunk_start + chunk_size, end)
+        chunk = np.array(bw.intervals(chrom, chunk_start, chunk_end) or [], dtype=float).reshape(-1, 3)
+        chunk = pd.DataFrame({"left": np.clip(chunk[:,0], chunk_start, chunk_end).astype(np.int64), 
+                              "right": np.clip(chunk[:,1], chunk_start, chunk_end).astype(np.int64), 
+                              "value": chunk[:,2]})
+        if binned:
+            chunk = _bin_intervals(chunk.left.values, chunk.right.values, chunk.value.values, chunk_start, chunk_end, bin_size, stat)
+        chunks.append((chunk_start, chunk_end, chunk))
+        n += len(chunk)
+        if not binned and n > max_points:
+            #too many intervals: the chunks already read are binned, and the next ones will be binned as they are read
+            chunks = [(s, e, _bin_intervals(c.left.values, c.right.values, c.value.values, s, e, bin_size, stat)) for s, e, c in chunks]
+            binned = True
+    
+    intervals = pd.concat([c for _, _, c in chunks], ignore_index=True)
+    return intervals, (bin_size if binned else max(1, (end - start) / max(len(intervals), 1)))
+
+def _get_interval_levels(intervals:pd.DataFrame, #intervals at the finest resolution
+                       level_size:float, #average size of the intervals
+                       start:int, end:int,
+                       max_bins:int, #maximum number of bins shown in the field of view
+                       max_width:int, #maximum size of the field of view
+                       stat:str = "mean",
+                      ):
+    """Summarizes the intervals in levels of increasing bin sizes, until a level can show `max_width` bp in `max_bins` bins."""
+    levels = [intervals]
+    bin_sizes = [level_size]
+    while bin_sizes[-1] * max_bins < max_width:
+        bin_size = int(np.ceil(bin_sizes[-1] * 4))
+        levels.append(_bin_intervals(intervals.left.values, intervals.right.values, intervals.value.values, start, end, bin_size, stat))
+        bin_sizes.append(bin_size)
+    return levels, bin_sizes
+
+def _interval_window(levels:List[pd.DataFrame], bin_sizes:List[float], x_start:float, x_end:float, max_bins:int):
+    """Selects the finest level showing less than `max_bins` bins in the field of view, 
+    and the intervals of this level within a field of view on each side."""
+    width = x_end - x_start
+    level = len(levels) - 1
+    while level > 0 and width / bin_sizes[level-1] <= max_bins:
+        level -= 1
+    start, end = x_start - width, x_end + width
+    data = levels[level]
+    ix_start = np.searchsorted(data.right.values, start, side="right")
+    ix_stop = np.searchsorted(data.left.values, end, side="right")
+    return level, start, end, data.iloc[ix_start:max(ix_start, ix_stop)]
+
+def _add_interval_levels(track:Track, fig, 
+                         intervals:pd.DataFrame, #sorted and non overlapping intervals with columns left, right and value
+                         level_size:float, #average size of the intervals
+                         start:int, end:int, 
+                         stat:str, #statistic used to summarize the values at lower resolutions
+                         label:str, #name of the values shown when hovering over the data
+                         **kwargs, #enables to pass keyword arguments used by the Bokeh function
+                        ):
+    """Plots intervals as bars with a resolution that follows the zoom level"""
+    max_bins = 2 * (fig.frame_width or 1000)
+    max_width = min(fig.x_range.max_interval or end - start, end - start)
+    levels, bin_sizes = _get_interval_levels(intervals, level_size, start, end, max_bins, max_width, stat)
+    _add_levels(track, fig, levels, bin_sizes, label, **kwargs)
+
+def _add_levels(track:Track, fig, 
+                levels:List[pd.DataFrame], #sorted and non overlapping intervals with columns left, right and value, from the finest to the coarsest resolution
+                bin_sizes:List[float], #resolution of each level
+                label:str, #name of the values shown when hovering over the data
+                **kwargs, #enables to pass keyword arguments used by the Bokeh function
+               ):
+    """Plots the level of intervals matching the zoom level as bars"""
+    max_bins = 2 * (fig.frame_width or 1000)
+    level, loaded_start, loaded_end, loaded = _interval_window(levels, bin_sizes, fig.x_range.start, fig.x_range.end, max_bins)
+
+    to_source = lambda df: ColumnDataSource({col: df[col].values for col in df.columns})
+    loaded_data = to_source(loaded)
+    xcb = CustomJS(
+        args = {
+            "x_range": fig.x_range,
+            "levels": [to_source(l) for l in levels],
+            "bin_sizes": bin_sizes,
+            "max_bins": max_bins,
+            "loaded_data": loaded_data,
+            "loaded_range": ColumnDataSource({"start": [loaded_start], "end": [loaded_end], "level": [level]}),
+        },
+        code = interval_track_callback_code
+    )
+    fig.x_range.js_on_change('start', xcb)
+
+    ymin, ymax = track.ylim
+    fig.y_range=Range1d(ymin,ymax,
+            bounds=(ymin,ymax))
+    
+    renderer = fig.quad(source=loaded_data, left="left", right="right", bottom=0, top="value", **kwargs)
+    fig.add_tools(HoverTool(renderers=[renderer],
+                            tooltips=[("left - right", "@left - @right"), (label, "@value")]))
+
+# %% ../nbs/API/01_track.ipynb 33
+@patch
+def bigwig(self:Track,
+           path:str, #path to the bigWig file
+           seq_id:str = None, #name of the sequence in the bigWig file, defaults to the sequence shown in the browser
+           stat:str = "mean", #statistic summarizing the values in each bin when zooming out: "mean", "max" or "min"
+           max_points:int = 200000, #maximum number of intervals loaded from the file, above this the values are summarized in bins
+           **kwargs, #enables to pass keyword arguments used by the Bokeh function
+          ):
+    """Plots the values of a bigWig file within the browser bounds. The resolution of the plot follows the zoom level."""
+    if pyBigWig is None:
+        raise ImportError("Track.bigwig requires pyBigWig, which cannot be installed on Windows")
+    if stat not in ("mean", "max", "min"):
+        raise ValueError("stat must be 'mean', 'max' or 'min'")
+    
     def render_method(track, fig, loaded_range):
-        if color not in data.columns:
-            data[color_col]='green'
+        bw = pyBigWig.open(path)
+        try:
+            if seq_id:
+                chrom = seq_id
+            elif track.seq_id:
+                chrom = _find_chrom(bw.chroms(), track.seq_id)
+            else:
+                raise ValueError("seq_id must be specified when the track is not part of a GenomeBrowser")
+            if chrom not in bw.chroms():
+                raise ValueError(f"Could not find the sequence {chrom} in the bigWig file {path}")
+            chrom_len = bw.chroms(chrom)
+            start, end = track.bounds if track.bounds else (0, chrom_len)
+            end = min(end, chrom_len)
+
+            intervals, level_size = _read_bigwig(bw, chrom, start, end, stat, max_points)
+            if track.ylim is None:
+                ymin = min(0, bw.stats(chrom, start, end, type="min")[0] or 0)
+                ymax = bw.stats(chrom, start, end, type="max")[0] or 1
+                track.ylim = (ymin, ymax)
+        finally:
+            bw.close()
+
+        _add_interval_levels(track, fig, intervals, level_size, start, end, stat, stat, **kwargs)
+
+    self.render_methods.append(render_method)
+
+# %% ../nbs/API/01_track.ipynb 36
+def _coverage_steps(left:np.ndarray, right:np.ndarray, #start and end positions of the intervals
+                    weight:np.ndarray = None, #weight of each interval, defaults to 1
+                   ) -> pd.DataFrame:
+    """Computes the coverage of intervals as steps of constant depth using a difference array"""
+    weight = np.ones(len(left), dtype=np.int64) if weight is None else np.asarray(weight)
+    if len(left) == 0:
+        return pd.DataFrame({"left": left[:0], "right": right[:0], "value": weight[:0]})
     
-        data[alpha_col]=alpha
+    origin = left.min()
+    span = right.max() - origin
+    if left.dtype.kind in "iu" and right.dtype.kind in "iu" and span <= 10 * len(left):
+        #dense difference array with one entry per base
+        boundaries = np.arange(origin, origin + span + 1)
+        diff = np.bincount(left - origin, weight, minlength=span + 1) - np.bincount(right - origin, weight, minlength=span + 1)
+    else:
+        #sparse difference array over the interval boundaries
+        boundaries, boundary_ix = np.unique(np.r_[left, right], return_inverse=True)
+        diff = np.bincount(boundary_ix, np.r_[weight, -weight], minlength=len(boundaries))
+    depth = np.cumsum(diff)[:-1]
+    if weight.dtype.kind in "iub":
+        depth = depth.round().astype(np.int64) #bincount returns floats
     
-        highlight_source = ColumnDataSource(data[[left_col,right_col,color_col,alpha_col]+hover_data])
+    #consecutive steps with the same depth are merged
+    change = np.r_[True, depth[1:] != depth[:-1]]
+    lefts = boundaries[:-1][change]
+    return pd.DataFrame({"left": lefts, 
+                         "right": np.r_[lefts[1:], boundaries[-1]], 
+                         "value": depth[change]})
+
+def _plot_value_intervals(track:Track, fig, 
+                          data:pd.DataFrame, #sorted and non overlapping intervals with columns left, right and value
+                          stat:str, #statistic used to summarize the values at lower resolutions
+                          max_points:int, #above this number of intervals in the track bounds, the values are summarized in bins
+                          label:str, #name of the values shown when hovering over the data
+                          **kwargs, #enables to pass keyword arguments used by the Bokeh function
+                         ):
+    """Plots the intervals within the track bounds, with a resolution that follows the zoom level"""
+    if len(data) == 0:
+        warnings.warn("There is no data to plot in this track")
+        return
+    start, end = track.bounds if track.bounds else (data.left.min(), data.right.max())
+    data = data.loc[(data.right > start) & (data.left < end), ["left", "right", "value"]].reset_index(drop=True)
+    data["left"] = data.left.clip(start, end)
+    data["right"] = data.right.clip(start, end)
+
+    level_size = max(1, (end - start) / max(len(data), 1))
+    if len(data) > max_points:
+        level_size = max(1, int(np.ceil((end - start) / max_points)))
+        data = _bin_intervals(data.left.values, data.right.values, data.value.values, start, end, level_size, stat)
     
+    if track.ylim is None:
+        track.ylim = (min(0, data.value.min()), data.value.max()) if len(data) else (0, 1)
+    
+    _add_interval_levels(track, fig, data, level_size, start, end, stat, label, **kwargs)
+
+# %% ../nbs/API/01_track.ipynb 37
+@patch
+def coverage(self:Track,
+             intervals: pd.DataFrame, #pandas DataFrame containing the intervals (e.g. reads or features)
+             left_col: str = "left", #name of the column containing the start positions of the intervals
+             right_col: str = "right", #name of the column containing the end positions of the intervals
+             weight_col: str = None, #name of a column containing the weight of each interval, by default each interval counts for 1
+             strand: str = None, #"+" or "-" to only count the intervals on one strand
+             strand_col: str = "strand", #name of the column containing the strand of the intervals
+             stat: str = "mean", #statistic summarizing the depth in each bin when zooming out: "mean" or "max"
+             max_points: int = 200000, #maximum number of coverage steps loaded, above this the depth is summarized in bins
+             **kwargs, #enables to pass keyword arguments used by the Bokeh function
+            ):
+    """Plots the coverage depth of a set of intervals. The resolution of the plot follows the zoom level."""
+    if stat not in ("mean", "max"):
+        raise ValueError("stat must be 'mean' or 'max'")
+    for col in (left_col, right_col, weight_col):
+        if col is not None and col not in intervals.columns:
+            raise ValueError(f"{col} is not a column of intervals")
+    if strand is not None:
+        if strand not in ("+", "-"):
+            raise ValueError("strand must be None, '+' or '-'")
+        intervals = intervals.loc[intervals[strand_col] == strand]
+
+    left = intervals[left_col].values
+    right = intervals[right_col].values
+    weight = intervals[weight_col].values if weight_col else None
+    steps = _coverage_steps(left, right, weight)
+    
+    def render_method(track, fig, loaded_range):
+        _plot_value_intervals(track, fig, steps, stat, max_points, "depth", **kwargs)
+
+    self.render_methods.append(render_method)
+
+# %% ../nbs/API/01_track.ipynb 40
+def _bin_matrix(x:np.ndarray, #sorted positions
+                values:np.ndarray, #matrix of values with one row per position and one column per sample
+                origin:float, bin_size:float, n_bins:int,
+               ) -> np.ndarray:
+    """Averages the rows of `values` in bins of `bin_size` starting at `origin`. Returns a (samples, n_bins) float32 matrix, with NaN in empty bins."""
+    bins = ((x - origin) // bin_size).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    finite = np.isfinite(values)
+    sums = np.add.reduceat(np.where(finite, values, 0), starts, axis=0)
+    counts = np.add.reduceat(finite, starts, axis=0)
+    binned = np.full((values.shape[1], n_bins), np.nan, dtype=np.float32)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        binned[:, bins[starts]] = (sums / counts).T
+    return binned
+
+def _heatmap_window(level:dict, x_start:float, x_end:float):
+    """Returns the columns of a heatmap level within a field of view on each side of [x_start, x_end]"""
+    width = x_end - x_start
+    i0 = int(min(max(np.floor((x_start - width - level["origin"]) / level["bin_size"]), 0), level["n_bins"]))
+    i1 = int(min(max(np.ceil((x_end + width - level["origin"]) / level["bin_size"]), i0), level["n_bins"]))
+    return i0, i1
+
+# %% ../nbs/API/01_track.ipynb 41
+@patch
+def heatmap(self:Track,
+            data: pd.DataFrame, #pandas DataFrame with one row per position and one column per sample
+            pos: str, #name of the column containing the positions along the genome
+            samples: List[str] = None, #names of the columns containing the samples, in the order they are plotted from top to bottom. Defaults to all the columns except pos
+            palette = "Viridis256", #name of a Bokeh palette or list of colors
+            low: float = None, #value mapped to the first color of the palette, defaults to the minimum of the data
+            high: float = None, #value mapped to the last color of the palette, defaults to the maximum of the data
+            max_cells: int = 2*10**6, #maximum number of cells (bins x samples) at the finest resolution
+            **kwargs, #enables to pass keyword arguments used by the Bokeh function
+           ):
+    """Plots a positions x samples matrix as a single image. The matrix is binned to the screen resolution, and binned again when zooming."""
+    samples = samples if samples is not None else [c for c in data.columns if c != pos]
+    if len(samples) == 0:
+        raise ValueError("samples must contain at least one column")
+    
+    data = data[[pos]+samples].sort_values(pos)
+    x = data[pos].values.astype(float)
+    values = data[samples].values.astype(float)[:, ::-1] #the first sample is plotted at the top
+    low = np.nanmin(values) if low is None else low
+    high = np.nanmax(values) if high is None else high
+    
+    n_samples = len(samples)
+    if self.ylim is None:
+        self.ylim = (0, n_samples)
+    
+    def render_method(track, fig, loaded_range):
+        start, end = x[0], x[-1] + 1
+        max_bins = 2 * (fig.frame_width or 1000)
+        max_width = min(fig.x_range.max_interval or end - start, end - start)
+
+        #resolution levels, from the spacing of the data (or the resolution allowed by max_cells) to the size of max_interval
+        bin_size = float(np.ceil(max(np.median(np.diff(x)) if len(x) > 1 else 1, (end - start) * n_samples / max_cells)))
+        levels = []
+        while True:
+            n_bins = int(np.ceil((end - start) / bin_size))
+            levels.append({"origin": start, "bin_size": bin_size, "n_bins": n_bins, 
+                           "values": _bin_matrix(x, values, start, bin_size, n_bins)})
+            if bin_size * max_bins >= max_width:
+                break
+            bin_size *= 4
+
+        width = fig.x_range.end - fig.x_range.start
+        level = len(levels) - 1
+        while level > 0 and width / levels[level-1]["bin_size"] <= max_bins:
+            level -= 1
+        i0, i1 = _heatmap_window(levels[level], fig.x_range.start, fig.x_range.end)
+        lvl = levels[level]
+        image_source = ColumnDataSource({"image": [lvl["values"][:, i0:i1]],
+                                         "x": [lvl["origin"] + i0 * lvl["bin_size"]],
+                                         "y": [0],
+                                         "dw": [(i1 - i0) * lvl["bin_size"]],
+                                         "dh": [n_samples]})
+
+        xcb = CustomJS(
+            args = {
+                "x_range": fig.x_range,
+                "levels": [{k: (v.ravel() if k == "values" else v) for k, v in l.items()} for l in levels],
+                "n_samples": n_samples,
+                "max_bins": max_bins,
+                "image_source": image_source,
+                "loaded_range": ColumnDataSource({"start": [fig.x_range.start - width], "end": [fig.x_range.end + width], "level": [level]}),
+            },
+            code = heatmap_callback_code
+        )
+        fig.x_range.js_on_change('start', xcb)
+
+        color_mapper = LinearColorMapper(palette=palette, low=low, high=high, nan_color=(0, 0, 0, 0))
+        renderer = fig.image(source=image_source, image="image", x="x", y="y", dw="dw", dh="dh", color_mapper=color_mapper, **kwargs)
+        fig.add_tools(HoverTool(renderers=[renderer], tooltips=[("position", "$x{0,0}"), ("value", "@image")]))
+
+        fig.y_range = Range1d(0, n_samples, bounds=(0, n_samples))
+        fig.yaxis.ticker = FixedTicker(ticks=[i + 0.5 for i in range(n_samples)])
+        fig.yaxis.major_label_overrides = {i + 0.5: name for i, name in enumerate(samples[::-1])}
+
+    self.render_methods.append(render_method)
+
+# %% ../nbs/API/01_track.ipynb 45
+@patch
+def bedgraph(self:Track,
+             path: str, #path to the bedGraph file (plain, gzipped or bgzipped and indexed with tabix)
+             seq_id: str = None, #name of the sequence in the file, defaults to the sequence shown in the browser
+             stat: str = "mean", #statistic summarizing the values in each bin when zooming out: "mean", "max" or "min"
+             max_points: int = 200000, #maximum number of intervals loaded, above this the values are summarized in bins
+             chunksize: int = 10**6, #number of lines read at once when the file is not indexed
+             **kwargs, #enables to pass keyword arguments used by the Bokeh function
+            ):
+    """Plots the values of a bedGraph file. Only the lines of the browser sequence and bounds are kept while reading the file."""
+    if stat not in ("mean", "max", "min"):
+        raise ValueError("stat must be 'mean', 'max' or 'min'")
+    
+    def render_method(track, fig, loaded_range):
+        data = read_bedgraph(path, seq_id if seq_id else track.seq_id, track.bounds, chunksize)
+        _plot_value_intervals(track, fig, data.sort_values("left"), stat, max_points, "value", **kwargs)
+
+    self.render_methods.append(render_method)
+
+@patch
+def wig(self:Track,
+        path: str, #path to the WIG file (plain or gzipped)
+        seq_id: str = None, #name of the sequence in the file, defaults to the sequence shown in the browser
+        stat: str = "mean", #statistic summarizing the values in each bin when zooming out: "mean", "max" or "min"
+        max_points: int = 200000, #maximum number of intervals loaded, above this the values are summarized in bins
+        chunksize: int = 10**6, #number of data lines parsed at once
+        **kwargs, #enables to pass keyword arguments used by the Bokeh function
+       ):
+    """Plots the values of a WIG file. Only the sections of the browser sequence and bounds are kept while reading the file."""
+    if stat not in ("mean", "max", "min"):
+        raise ValueError("stat must be 'mean', 'max' or 'min'")
+    
+    def render_method(track, fig, loaded_range):
+        data = read_wig(path, seq_id if seq_id else track.seq_id, track.bounds, chunksize)
+        _plot_value_intervals(track, fig, data.sort_values("left"), stat, max_points, "value", **kwargs)
+
+    self.render_methods.append(render_method)
+
+@patch
+def bed(self:Track,
+        path: str, #path to the BED file (plain, gzipped or bgzipped and indexed with tabix)
+        seq_id: str = None, #name of the sequence in the file, defaults to the sequence shown in the browser
+        color: str = "green", #color of the features, used when the file has no item_rgb column
+        alpha: float = 0.5, #transparency
+        chunksize: int = 10**6, #number of lines read at once when the file is not indexed
+        **kwargs, #enables to pass keyword arguments used by the Bokeh function
+       ):
+    """Plots the features of a BED file as boxes. Only the lines of the browser sequence and bounds are kept while reading the file."""
+    def render_method(track, fig, loaded_range):
+        data = read_bed(path, seq_id if seq_id else track.seq_id, track.bounds, chunksize)
+        if "item_rgb" in data.columns:
+            data["color"] = [f"rgb({rgb})" if rgb.count(",") == 2 else color for rgb in data.item_rgb.astype(str)]
+        else:
+            data["color"] = color
+        data["alpha"] = alpha
+        hover_data = [c for c in ("name", "score", "strand") if c in data.columns]
+        ylim = track.ylim if track.ylim is not None else (0, 1)
         if track.ylim is None:
-            warnings.warn("When adding highlights to a track, ylim needs to be defined. \
-                          You can eigher set ylim manually when creating the track, or plot data using Track.line, Track.scatter or Track.bar before adding the highlight.")
-        r=Quad(left=left_col, right=right_col,
-               bottom=track.ylim[0],
-               top=track.ylim[1],
-               fill_color=color_col,
-               fill_alpha=alpha_col,
-               line_alpha=0,
-               **kwargs)
-
-        renderer = fig.add_glyph(highlight_source, r)
-        tooltips=[(f"{left_col} - {right_col}",f"@{left_col} - @{right_col}")]+[(f"{attr}",f"@{attr}") for attr in hover_data]
-        fig.add_tools(HoverTool(renderers=[renderer],
-                                            tooltips=tooltips))
+            track.ylim = ylim
+            fig.y_range = Range1d(0, 1, bounds=(0, 1))
+        _add_highlights(fig, data, "left", "right", "color", "alpha", hover_data,
+                        bottom=ylim[0],
+                        top=ylim[1],
+                        max_glyph_loading_range=loaded_range.data["range"][0],
+                        **kwargs)
+
+    self.render_methods.append(render_method)
+
+# %% ../nbs/API/01_track.ipynb 47
+def _density_levels(x:np.ndarray, #sorted positions
+                    start:int, end:int,
+                    max_bins:int, #maximum number of bins shown in the field of view
+                    max_width:int, #maximum size of the field of view
+                    height:float, #height of the highest bar of each level
+                   ):
+    """Counts positions in bins of increasing sizes, until a level can show `max_width` bp in `max_bins` bins"""
+    levels = []
+    bin_sizes = []
+    bin_size = max(1, int(np.ceil((end - start) / max_bins / 256)))
+    while True:
+        bins, counts = np.unique((x - start) // bin_size, return_counts=True)
+        left = start + bins * bin_size
+        levels.append(pd.DataFrame({"left": left, "right": left + bin_size, "count": counts, 
+                                    "value": height * counts / max(counts.max(initial=0), 1)}))
+        bin_sizes.append(bin_size)
+        if bin_size * max_bins >= max_width:
+            break
+        bin_size *= 4
+    return levels, bin_sizes
+
+def _variants_window(x:np.ndarray, #sorted positions of the calls
+                     levels:List[pd.DataFrame], bin_sizes:List[int], 
+                     x_start:float, x_end:float, 
+                     max_calls:int, max_bins:int):
+    """Selects the calls within a field of view on each side of [x_start, x_end] if there are less than `max_calls` in the field of view, 
+    otherwise selects the density level showing less than `max_bins` bins. Returns the level (-1 for calls), the loaded range and the slices of calls and density."""
+    width = x_end - x_start
+    start, end = x_start - width, x_end + width
+    if np.searchsorted(x, x_end, side="right") - np.searchsorted(x, x_start, side="right") <= max_calls:
+        return -1, start, end, slice(np.searchsorted(x, start, side="right"), np.searchsorted(x, end, side="right")), slice(0, 0)
+    level = len(levels) - 1
+    while level > 0 and width / bin_sizes[level-1] <= max_bins:
+        level -= 1
+    ix_start = np.searchsorted(levels[level].right.values, start, side="right")
+    ix_stop = np.searchsorted(levels[level].left.values, end, side="right")
+    return level, start, end, slice(0, 0), slice(ix_start, max(ix_start, ix_stop))
+
+# %% ../nbs/API/01_track.ipynb 48
+@patch
+def variants(self:Track,
+             path: str, #path to the VCF file (plain, gzipped or bgzipped and indexed with tabix)
+             seq_id: str = None, #name of the sequence in the file, defaults to the sequence shown in the browser
+             samples: List[str] = None, #samples to plot, one per row, defaults to all the samples of the file. Variants of files without samples are plotted as lollipops
+             max_calls: int = 5000, #above this number of calls in the field of view, the density of variants is plotted instead
+             het_color: str = "#ff7f0e", #color of heterozygous calls
+             hom_color: str = "#d62728", #color of homozygous (or haploid) alternative calls
+             chunksize: int = 10**5, #number of lines read at once when the file is not indexed
+             **kwargs, #enables to pass keyword arguments used by the Bokeh function
+            ):
+    """Plots the variants of a VCF file. When zoomed in, each alternative call is plotted as a tick on the row of its sample. 
+    When zoomed out, the density of variants is plotted instead."""
+    def render_method(track, fig, loaded_range):
+        variants, genotypes = read_vcf(path, seq_id if seq_id else track.seq_id, track.bounds, samples, chunksize)
+        order = np.argsort(variants.left.values, kind="stable")
+        variants, genotypes = variants.iloc[order].reset_index(drop=True), genotypes.iloc[order]
+        sample_names = list(genotypes.columns)
+        n_rows = max(len(sample_names), 1)
+
+        #one call per alternative genotype, the first sample is plotted at the top
+        if sample_names:
+            site, sample = np.nonzero(genotypes.values > 0)
+            gt = genotypes.values[site, sample]
+            row = n_rows - 1 - sample
+        else:
+            site = np.arange(len(variants))
+            gt = np.full(len(site), 2, dtype=np.int8)
+            row = np.zeros(len(site), dtype=np.int16)
+        x = variants.left.values[site] + 0.5
+        all_calls = ColumnDataSource({"x": x, "row": row.astype(np.int16), "gt": gt, "site": site.astype(np.int32)})
+
+        start, end = track.bounds if track.bounds else (0, int(variants.right.max()) if len(variants) else 1)
+        max_bins = 2 * (fig.frame_width or 1000)
+        max_width = min(fig.x_range.max_interval or end - start, end - start)
+        levels, bin_sizes = _density_levels(variants.left.values, start, end, max_bins, max_width, 0.9 * n_rows)
+        level, loaded_start, loaded_end, calls_slice, density_slice = _variants_window(x, levels, bin_sizes, fig.x_range.start, fig.x_range.end, max_calls, max_bins)
+
+        to_source = lambda df: ColumnDataSource({col: df[col].values for col in df.columns})
+        loaded_calls = ColumnDataSource({k: v[calls_slice] for k, v in all_calls.data.items()})
+        loaded_density = to_source(levels[max(level, 0)].iloc[density_slice])
+        xcb = CustomJS(
+            args = {
+                "x_range": fig.x_range,
+                "all_calls": all_calls,
+                "loaded_calls": loaded_calls,
+                "levels": [to_source(l) for l in levels],
+                "bin_sizes": bin_sizes,
+                "loaded_density": loaded_density,
+                "loaded_range": ColumnDataSource({"start": [loaded_start], "end": [loaded_end], "level": [level]}),
+                "max_calls": max_calls,
+                "max_bins": max_bins,
+            },
+            code = variant_callback_code
+        )
+        fig.x_range.js_on_change('start', xcb)
+
+        color = linear_cmap("gt", [het_color, hom_color], low=1, high=2)
+        call_renderers = [fig.segment(source=loaded_calls, x0="x", x1="x", y0=dodge("row", 0.1), y1=dodge("row", 0.9), 
+                                      line_color=color, line_width=2, **kwargs)]
+        if not sample_names:
+            call_renderers.append(fig.scatter(source=loaded_calls, x="x", y=dodge("row", 0.9), color=color, size=6, **kwargs))
+        density_renderer = fig.quad(source=loaded_density, left="left", right="right", bottom=0, top="value", 
+                                    fill_color="gray", fill_alpha=0.6, line_alpha=0)
+
+        #variant and sample names are looked up when hovering, so that they are not repeated for each call
+        site_hover = CustomJSHover(args={"pos": variants.left.values + 1, "id": variants.id.tolist(), 
+                                         "ref": variants.ref.tolist(), "alt": variants.alt.tolist()},
+                                   code="return `${pos[value]} ${id[value]} ${ref[value]}>${alt[value]}`")
+        sample_hover = CustomJSHover(args={"samples": sample_names[::-1]}, code="return samples[value] ?? ''")
+        gt_hover = CustomJSHover(code="return value == 2 ? 'homozygous' : 'heterozygous'")
+        fig.add_tools(HoverTool(renderers=call_renderers,
+                                tooltips=[("variant", "@site{custom}"), ("sample", "@row{custom}"), ("genotype", "@gt{custom}")],
+                                formatters={"@site": site_hover, "@row": sample_hover, "@gt": gt_hover}))
+        fig.add_tools(HoverTool(renderers=[density_renderer],
+                                tooltips=[("left - right", "@left - @right"), ("variants", "@count")]))
+
+        if track.ylim is None:
+            track.ylim = (0, n_rows)
+        fig.y_range = Range1d(0, n_rows, bounds=(0, n_rows))
+        if sample_names:
+            fig.yaxis.ticker = FixedTicker(ticks=[i + 0.5 for i in range(n_rows)])
+            fig.yaxis.major_label_overrides = {i + 0.5: name for i, name in enumerate(sample_names[::-1])}
+
+    self.render_methods.append(render_method)
+
+# %% ../nbs/API/01_track.ipynb 50
+_sequence_stat_labels = {"gc": "GC content", "gc_skew": "GC skew", "cumulative_gc_skew": "cumulative GC skew", "complexity": "complexity"}
+
+@patch
+def sequence_stats(self:Track,
+                   seq, #sequence (string, Biopython Seq or sequence encoded with encode_seq)
+                   stat: str = "gc", #"gc", "gc_skew", "cumulative_gc_skew" or "complexity"
+                   offset: int = 0, #position of the first base of seq in the genome
+                   window: int = 100, #size of the windows at the highest zoom level, the windows are 4 times larger at each lower zoom level
+                   k: int = 2, #length of the k-mers used to compute the complexity
+                   max_points: int = 200000, #maximum number of windows at the highest zoom level, larger windows are used for longer sequences
+                   **kwargs, #enables to pass keyword arguments used by the Bokeh function
+                  ):
+    """Plots a statistic of a sequence computed in sliding windows (see `window_stats`). The size of the windows follows the zoom level."""
+    if stat not in SEQUENCE_STATS:
+        raise ValueError(f"stat must be one of {', '.join(SEQUENCE_STATS)}")
+    codes = seq if isinstance(seq, np.ndarray) else encode_seq(seq)
+    
+    def render_method(track, fig, loaded_range):
+        start, end = track.bounds if track.bounds else (offset, offset + len(codes))
+        start, end = max(start, offset), min(end, offset + len(codes))
+        region = codes[start - offset:end - offset]
+        max_bins = 2 * (fig.frame_width or 1000)
+        max_width = min(fig.x_range.max_interval or end - start, end - start)
+
+        #windows of even sizes overlap by half, so the windows of all the levels are tiled by blocks of half the finest window
+        windows = [2 * int(np.ceil(max(window, len(region) / max_points * 2) / 2))]
+        while windows[-1] // 2 * max_bins < max_width:
+            windows.append(windows[-1] * 4)
+        levels = [pd.DataFrame({"left": l.left.values + start, "right": l.right.values + start, "value": l[stat].values}).dropna()
+                  for l in window_stats(region, windows, stats=[stat], k=k)]
+        
+        if track.ylim is None:
+            values = levels[0].value
+            track.ylim = (min(0, values.min()), max(0, values.max())) if len(values) else (0, 1)
+        _add_levels(track, fig, levels, [w // 2 for w in windows], _sequence_stat_labels[stat], **kwargs)
+
     self.render_methods.append(render_method)
@@ -5,9 +5,10 @@
 # %% auto 0
 __all__ = ['strand_dict', 'download_file', 'is_gzipped_file', 'default_open_gz', 'extract_attribute', 'extract_all_attributes',
            'extract_attributes', 'get_attributes', 'attributes_to_columns', 'set_positions', 'EmptyDataFrame',
-           'parse_gff', 'available_feature_types', 'available_attributes', 'parse_fasta', 'regions_overlap',
-           'add_z_order', 'get_cds_unique_name', 'get_cds_name', 'seqRecord_to_df', 'parse_recs', 'parse_genbank',
-           'inspect_feature_types', 'in_wsl', 'add_extension']
+           'parse_gff', 'available_feature_types', 'available_attributes', 'parse_fasta', 'read_bed', 'read_bedgraph',
+           'read_wig', 'read_vcf', 'regions_overlap', 'add_z_order', 'get_cds_unique_name', 'get_cds_name',
+           'seqRecord_to_df', 'parse_recs', 'parse_genbank', 'inspect_feature_types', 'in_wsl', 'add_extension',
+           'ExportSession']
 
 # %% ../nbs/API/04_utils.ipynb 5
 import numpy as np
@@ -26,7 +27,6 @@ from Bio import SeqIO
 from Bio.Seq import Seq
 
 from typing import List, Optional, Dict, Tuple
-from IPython.display import display, HTML
 
 
 
@@ -253,7 +253,269 @@ def parse_fasta(genome_path, seq_id):
     
     return rec.seq
 
-# %% ../nbs/API/04_utils.ipynb 35
+# %% ../nbs/API/04_utils.ipynb 36
+try: #pysam is only needed to read tabix indexed files
+    import pysam
+except ImportError:
+    pysam = None
+
+_bed_columns = {"seq_id": str, "left": np.int64, "right": np.int64, "name": str, "score": np.float64, "strand": str,
+                "thick_left": np.int64, "thick_right": np.int64, "item_rgb": str, 
+                "block_count": np.int64, "block_sizes": str, "block_starts": str}
+_bedgraph_columns = {"seq_id": str, "left": np.int64, "right": np.int64, "value": np.float64}
+
+# %% ../nbs/API/04_utils.ipynb 37
+def _tabix_index(path:str) -> Optional[str]:
+    """Returns the path of the tabix index of a file, or None"""
+    for ext in (".tbi", ".csi"):
+        if os.path.exists(path + ext):
+            return path + ext
+    return None
+
+def _is_header(line:str) -> bool:
+    return not line.strip() or line.startswith(("#", "track", "browser"))
+
+def _read_bed_like(path:str, #path to a BED-like file: tab separated, with the sequence id, start and end positions in the first three columns
+                   columns:Dict[str,type], #names and types of the columns
+                   seq_id:Optional[str] = None, #sequence to read, defaults to the first sequence of the file
+                   bounds:Optional[Tuple[int,int]] = None, #only the lines overlapping bounds are read
+                   chunksize:int = 10**6, #number of lines read at once
+                   sorted_file:bool = True, #whether the file is sorted by sequence and start position, in which case reading stops after the region
+                  ) -> pd.DataFrame:
+    """Reads the lines of a BED-like file for a sequence"""
+    line = ""
+    with default_open_gz(path) as f:
+        n_header = 0
+        for line in f:
+            if not _is_header(line):
+                break
+            n_header += 1
+    n_cols = min(len(line.rstrip("\n").split("\t")), len(columns)) if not _is_header(line) else 3
+    names = list(columns)[:n_cols]
+    dtype = {c: columns[c] for c in names}
+    empty = pd.DataFrame({c: pd.Series(dtype=t) for c, t in dtype.items()})
+    if _is_header(line): #the file has no data line
+        return empty
+
+    if _tabix_index(path) and pysam is not None:
+        with pysam.TabixFile(path, index=_tabix_index(path)) as tbx:
+            seq_id = seq_id if seq_id else (tbx.contigs[0] if tbx.contigs else None)
+            if seq_id not in tbx.contigs:
+                return empty
+            start, end = bounds if bounds else (None, None)
+            lines = "\n".join(tbx.fetch(seq_id, start, end))
+        if not lines:
+            return empty
+        return pd.read_csv(io.StringIO(lines), sep="\t", header=None, names=names, usecols=range(n_cols), dtype=dtype)
+    elif _tabix_index(path):
+        warnings.warn(f"{path} is indexed but pysam is not installed, the whole file will be read")
+
+    chunks = []
+    found = False
+    #comment lines after the first data line are dropped once read, as "#" can also be part of a field
+    reader = pd.read_csv(path, sep="\t", header=None, names=names, usecols=range(n_cols), dtype={"seq_id": str},
+                         skiprows=n_header, chunksize=chunksize,
+                         compression="gzip" if is_gzipped_file(path) else None)
+    for chunk in reader:
+        chunk = chunk.loc[~chunk["seq_id"].str.startswith(("#", "track", "browser"))].astype(dtype)
+        if seq_id is None and len(chunk):
+            seq_id = chunk["seq_id"].iloc[0]
+        in_seq = chunk.loc[chunk["seq_id"] == seq_id]
+        if bounds:
+            chunks.append(in_seq.loc[(in_seq["right"] > bounds[0]) & (in_seq["left"] < bounds[1])])
+        else:
+            chunks.append(in_seq)
+        
+        #in sorted files, the region is over when the sequence changes or when the lines start after bounds
+        past_seq = (found or len(in_seq)) and chunk["seq_id"].iloc[-1] != seq_id
+        past_bounds = len(in_seq) and bounds and in_seq["left"].iloc[-1] >= bounds[1]
+        found = found or len(in_seq) > 0
+        if sorted_file and (past_seq or past_bounds):
+            break
+    return pd.concat(chunks, ignore_index=True) if chunks else empty
+
+# %% ../nbs/API/04_utils.ipynb 38
+def read_bed(path:str, #path to a BED file (plain, gzipped or bgzipped and indexed with tabix)
+             seq_id:Optional[str] = None, #sequence to read, defaults to the first sequence of the file
+             bounds:Optional[Tuple[int,int]] = None, #only the features overlapping bounds are read
+             chunksize:int = 10**6, #number of lines read at once when the file is not indexed
+             sorted_file:bool = True, #whether the file is sorted by sequence and start position, in which case reading stops after the region
+            ) -> pd.DataFrame:
+    """Reads the features of a BED file for a sequence. Columns are named seq_id, left, right, name, score, strand, thick_left, thick_right, item_rgb, block_count, block_sizes and block_starts, for the columns present in the file."""
+    return _read_bed_like(path, _bed_columns, seq_id, bounds, chunksize, sorted_file)
+
+def read_bedgraph(path:str, #path to a bedGraph file (plain, gzipped or bgzipped and indexed with tabix)
+                  seq_id:Optional[str] = None, #sequence to read, defaults to the first sequence of the file
+                  bounds:Optional[Tuple[int,int]] = None, #only the intervals overlapping bounds are read
+                  chunksize:int = 10**6, #number of lines read at once when the file is not indexed
+                  sorted_file:bool = True, #whether the file is sorted by sequence and start position, in which case reading stops after the region
+                 ) -> pd.DataFrame:
+    """Reads the intervals of a bedGraph file for a sequence, with columns seq_id, left, right and value"""
+    return _read_bed_like(path, _bedgraph_columns, seq_id, bounds, chunksize, sorted_file)
+
+# %% ../nbs/API/04_utils.ipynb 39
+def _wig_declaration(line:str) -> dict:
+    """Parses a variableStep or fixedStep declaration line"""
+    fields = line.split()
+    declaration = dict(f.split("=", 1) for f in fields[1:])
+    declaration["type"] = fields[0]
+    return declaration
+
+def _wig_section(declaration:dict, values:List[str]) -> pd.DataFrame:
+    """Converts the data lines of a WIG section to intervals"""
+    span = int(declaration.get("span", 1))
+    if declaration["type"] == "variableStep":
+        values = np.array(" ".join(values).split(), dtype=np.float64).reshape(-1, 2)
+        left = values[:,0].astype(np.int64) - 1 #wig positions are 1-based
+        values = values[:,1]
+    else:
+        values = np.array(values, dtype=np.float64)
+        left = int(declaration["start"]) - 1 + int(declaration.get("step", 1)) * np.arange(len(values))
+    return pd.DataFrame({"seq_id": declaration["chrom"], "left": left, "right": left + span, "value": values})
+
+def read_wig(path:str, #path to a WIG file (plain or gzipped)
+             seq_id:Optional[str] = None, #sequence to read, defaults to the first sequence of the file
+             bounds:Optional[Tuple[int,int]] = None, #only the intervals overlapping bounds are read
+             chunksize:int = 10**6, #number of data lines parsed at once
+             sorted_file:bool = True, #whether the sections of each sequence are contiguous, in which case reading stops after the sequence
+            ) -> pd.DataFrame:
+    """Reads the variableStep and fixedStep sections of a WIG file for a sequence, as intervals with columns seq_id, left, right and value"""
+    sections = []
+    declaration = None
+    values = []
+    found = False
+
+    def add_section():
+        if declaration is not None and values:
+            section = _wig_section(declaration, values)
+            if bounds:
+                section = section.loc[(section["right"] > bounds[0]) & (section["left"] < bounds[1])]
+            sections.append(section)
+        values.clear()
+    
+    with default_open_gz(path) as f:
+        for line in f:
+            if line.startswith(("variableStep", "fixedStep")):
+                add_section()
+                new_declaration = _wig_declaration(line)
+                seq_id = seq_id if seq_id else new_declaration["chrom"]
+                if new_declaration["chrom"] == seq_id:
+                    found = True
+                    declaration = new_declaration
+                elif found and sorted_file:
+                    break
+                else:
+                    declaration = None
+            elif declaration is not None and not _is_header(line):
+                values.append(line)
+                if len(values) >= chunksize:
+                    n = len(values)
+                    add_section()
+                    if declaration["type"] == "fixedStep": #the next chunk of the section starts after this one
+                        declaration = {**declaration, "start": int(declaration["start"]) + n * int(declaration.get("step", 1))}
+        add_section()
+    
+    if not sections:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in _bedgraph_columns.items()})
+    return pd.concat(sections, ignore_index=True)
+
+# %% ../nbs/API/04_utils.ipynb 46
+_gt_codes = {"0": 0, "1": 2, ".": -1,
+             "0/0": 0, "0|0": 0, "0/1": 1, "0|1": 1, "1/0": 1, "1|0": 1, "1/1": 2, "1|1": 2, "./.": -1, ".|.": -1}
+
+def _genotype_codes(calls:pd.Series, #sample column of a VCF file, with GT as first field
+                   ) -> np.ndarray:
+    """Encodes genotypes as int8: 0 for reference, 1 for heterozygous, 2 for homozygous (or haploid) alternative and -1 for missing"""
+    gt = calls.str.split(":", n=1).str[0]
+    codes = gt.map(_gt_codes)
+    other = codes.isna()
+    if other.any(): #multi-allelic or polyploid genotypes
+        alleles = gt[other].str.split(r"[/|]", expand=True, regex=True)
+        called = alleles.notna() & (alleles != ".")
+        n_called = called.sum(axis=1)
+        n_alt = (called & (alleles != "0")).sum(axis=1)
+        homozygous = alleles.where(called).nunique(axis=1) == 1
+        codes[other] = np.where(n_called == 0, -1, np.where(n_alt == 0, 0, np.where(homozygous, 2, 1)))
+    return codes.values.astype(np.int8)
+
+def _vcf_header(path:str) -> Tuple[int, List[str]]:
+    """Returns the number of meta-information lines and the column names of a VCF file"""
+    with default_open_gz(path) as f:
+        for n, line in enumerate(f):
+            if line.startswith("#CHROM"):
+                return n, line[1:].rstrip("\n").split("\t")
+    raise ValueError(f"{path} has no #CHROM header line")
+
+def read_vcf(path:str, #path to a VCF file (plain, gzipped or bgzipped and indexed with tabix)
+             seq_id:Optional[str] = None, #sequence to read, defaults to the first sequence of the file
+             bounds:Optional[Tuple[int,int]] = None, #only the variants overlapping bounds are read
+             samples:Optional[List[str]] = None, #samples for which genotypes are read, defaults to all the samples of the file
+             chunksize:int = 10**5, #number of lines read at once when the file is not indexed
+             sorted_file:bool = True, #whether the file is sorted by sequence and position, in which case reading stops after the region
+            ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Reads the variants of a VCF file for a sequence. Returns a DataFrame of variants (seq_id, left, right, id, ref, alt, qual, filter) 
+    and a DataFrame of genotypes with one int8 column per sample (see `_genotype_codes`)."""
+    n_header, columns = _vcf_header(path)
+    file_samples = columns[9:]
+    samples = file_samples if samples is None else samples
+    missing = [s for s in samples if s not in file_samples]
+    if missing:
+        raise ValueError(f"Samples {missing} are not in {path}")
+    usecols = columns[:7] + samples
+    dtype = {c: str for c in usecols}
+    dtype["POS"] = np.int64
+
+    def parse(chunk):
+        variants = pd.DataFrame({"seq_id": chunk["CHROM"].values,
+                                 "left": chunk["POS"].values - 1, #VCF positions are 1-based
+                                 "right": chunk["POS"].values - 1 + chunk["REF"].str.len().values,
+                                 "id": chunk["ID"].values,
+                                 "ref": chunk["REF"].values,
+                                 "alt": chunk["ALT"].values,
+                                 "qual": pd.to_numeric(chunk["QUAL"], errors="coerce").values,
+                                 "filter": chunk["FILTER"].values})
+        genotypes = pd.DataFrame({s: _genotype_codes(chunk[s]) for s in samples}, index=variants.index, columns=samples)
+        if bounds:
+            keep = ((variants["right"] > bounds[0]) & (variants["left"] < bounds[1])).values
+            variants, genotypes = variants.loc[keep], genotypes.loc[keep]
+        return variants, genotypes
+
+    if _tabix_index(path) and pysam is not None:
+        with pysam.TabixFile(path, index=_tabix_index(path)) as tbx:
+            seq_id = seq_id if seq_id else (tbx.contigs[0] if tbx.contigs else None)
+            start, end = bounds if bounds else (None, None)
+            lines = "\n".join(tbx.fetch(seq_id, start, end)) if seq_id in tbx.contigs else ""
+        chunks = [parse(pd.read_csv(io.StringIO(lines), sep="\t", header=None, names=columns, usecols=usecols, dtype=dtype))] if lines else []
+    else:
+        if _tabix_index(path):
+            warnings.warn(f"{path} is indexed but pysam is not installed, the whole file will be read")
+        chunks = []
+        found = False
+        reader = pd.read_csv(path, sep="\t", header=None, names=columns, usecols=usecols, dtype=dtype,
+                             skiprows=n_header + 1, chunksize=chunksize,
+                             compression="gzip" if is_gzipped_file(path) else None)
+        for chunk in reader:
+            if seq_id is None and len(chunk):
+                seq_id = chunk["CHROM"].iloc[0]
+            in_seq = chunk.loc[chunk["CHROM"] == seq_id]
+            chunks.append(parse(in_seq))
+            
+            #in sorted files, the region is over when the sequence changes or when the variants are after bounds
+            past_seq = (found or len(in_seq)) and chunk["CHROM"].iloc[-1] != seq_id
+            past_bounds = len(in_seq) and bounds and in_seq["POS"].iloc[-1] - 1 >= bounds[1]
+            found = found or len(in_seq) > 0
+            if sorted_file and (past_seq or past_bounds):
+                break
+    
+    if not chunks:
+        variants = pd.DataFrame({c: pd.Series(dtype=t) for c, t in 
+                                 {"seq_id": str, "left": np.int64, "right": np.int64, "id": str, "ref": str, "alt": str, "qual": np.float64, "filter": str}.items()})
+        return variants, pd.DataFrame({s: pd.Series(dtype=np.int8) for s in samples})
+    variants = pd.concat([v for v, _ in chunks], ignore_index=True)
+    genotypes = pd.concat([g for _, g in chunks], ignore_index=True)
+    return variants, genotypes
+
+# %% ../nbs/API/04_utils.ipynb 48
 def regions_overlap(region1, region2, min_overlap_fraction=0.0):
     """
         regions are tuples of start and stop coordinates
@@ -306,10 +568,10 @@ def regions_overlap(region1, region2, min_overlap_fraction=0.0):
     return False
     
 
-# %% ../nbs/API/04_utils.ipynb 37
+# %% ../nbs/API/04_utils.ipynb 50
 from collections import defaultdict
 
-# %% ../nbs/API/04_utils.ipynb 38
+# %% ../nbs/API/04_utils.ipynb 51
 def add_z_order(features, 
                 prescedence = ["source", "CDS", "repeat_region", "ncRNA", "rRNA", "tRNA","exon"]):
     """
@@ -322,32 +584,30 @@ def add_z_order(features,
     type_order.update({t: i for i, t in enumerate(prescedence)})
     features.sort_values(by="start", inplace=True)
     features.sort_values(by="type", inplace=True, key=lambda x: x.map(type_order))
-    z_order = []
-    added = []
-    all_z = {0}
-    for index, row in features.iterrows():
-        left, right = row["left"], row["right"]
-        z = 0
-        z_found = set()
-        for (l_a, r_a, z_a, z_o) in added:
-            if regions_overlap((left, right), (l_a, r_a)):
-                if type_order[row["type"]] > z_o:
-                    for i in range(z_a+1):
-                        z_found.add(i)
-                else:
-                    z_found.add(z_a)
-        if len(z_found) == len(all_z):
-            z = max(all_z) + 1
-            all_z.add(z)
+    lefts, rights = features["left"].to_numpy(), features["right"].to_numpy()
+    orders = np.array([type_order[t] for t in features["type"]], dtype=int)
+    z_order = np.zeros(len(features), dtype=int)
+    max_z = 0
+    for i in range(len(features)):
+        # the features already added that overlap the feature i, as in regions_overlap
+        overlap = (lefts[:i] <= rights[i]) & (rights[:i] >= lefts[i])
+        z_overlap = z_order[:i][overlap]
+        found = np.zeros(max_z + 1, dtype=bool)
+        found[z_overlap] = True
+        # a feature of lower prescedence goes above all the overlapping features of higher prescedence
+        below = z_overlap[orders[:i][overlap] < orders[i]]
+        if len(below):
+            found[:below.max() + 1] = True
+        if found.all():
+            max_z += 1
+            z_order[i] = max_z
         else:
-            z = min(all_z - z_found)
-        z_order.append(z)
-        added.append((left, right, z, type_order[row["type"]]))
+            z_order[i] = np.argmin(found)
     features["z_order"] = z_order
 
     features.sort_values(by="start", inplace=True)
 
-# %% ../nbs/API/04_utils.ipynb 40
+# %% ../nbs/API/04_utils.ipynb 53
 #### Code from Domainator
 def get_cds_unique_name(feature):
     """
@@ -369,10 +629,10 @@ def get_cds_name(feature): #(contig_id, feature):
         return get_cds_unique_name(feature)
 #### End code from Domainator
 
-# %% ../nbs/API/04_utils.ipynb 41
+# %% ../nbs/API/04_utils.ipynb 54
 from Bio import SeqRecord
 
-# %% ../nbs/API/04_utils.ipynb 42
+# %% ../nbs/API/04_utils.ipynb 55
 strand_dict = {1: "+", -1: "-"}
 
 def seqRecord_to_df(rec: SeqRecord,
@@ -407,7 +667,7 @@ def seqRecord_to_df(rec: SeqRecord,
     df=pd.DataFrame(feature_lists, columns=["seq_id", "source", "type", "start", "end", "score", "strand", "phase", "attributes"])
     return df
 
-# %% ../nbs/API/04_utils.ipynb 45
+# %% ../nbs/API/04_utils.ipynb 58
 def parse_recs(recs, # iterator over Bio.SeqRecord.SeqRecord
                    seq_id: Optional[str] = None, # sequence id (first column of the gff), if not None, then return only the annotations for the seq_id with this name
                    first = True, # if True then return only the annotations for the first sequence (or the first with seq_id)
@@ -435,7 +695,7 @@ def parse_recs(recs, # iterator over Bio.SeqRecord.SeqRecord
         raise EmptyDataFrame("The annotation DataFrame is empty. Check that the feature_types and seq_id are correct, and that bounds (if specified) fall within the size of your genome.")
     return seqs, feature_dfs
 
-# %% ../nbs/API/04_utils.ipynb 46
+# %% ../nbs/API/04_utils.ipynb 59
 def parse_genbank(gb_path, # path to the genbank file
                   seq_id: Optional[str] = None, # sequence id (first column of the gff), if not None, then return only the annotations for the seq_id with this name
                   first = True, # if True then return only the annotations for the first sequence (or the first with seq_id)
@@ -449,7 +709,7 @@ def parse_genbank(gb_path, # path to the genbank file
     return recs
 
 
-# %% ../nbs/API/04_utils.ipynb 49
+# %% ../nbs/API/04_utils.ipynb 62
 def inspect_feature_types(file_path: str, 
                           frmt: str #gff or genbank
                           ):
@@ -471,76 +731,154 @@ def inspect_feature_types(file_path: str,
                 row=[""]
 
 
+    from IPython.display import display, HTML
     df_output = pd.DataFrame(table_data, columns=["feature_type", "attributes"])
     display(HTML(df_output.to_html(index=False)))
 
-# %% ../nbs/API/04_utils.ipynb 54
+# %% ../nbs/API/04_utils.ipynb 67
 def in_wsl() -> bool:
     return 'microsoft-standard' in uname().release
 
-# %% ../nbs/API/04_utils.ipynb 56
+# %% ../nbs/API/04_utils.ipynb 69
 def add_extension(filename,extension="svg"):
     base_name, ext = os.path.splitext(filename)
     if ext.lower() != '.'+extension:
         filename += '.'+extension
     return filename
 
-# %% ../nbs/API/04_utils.ipynb 60
-from bokeh.plotting import show as bk_show
+# %% ../nbs/API/04_utils.ipynb 73
 from bokeh.layouts import column, row
-from bokeh.io import output_notebook, reset_output
-from bokeh.plotting import save as bk_save #Need to rename the bokeh show function so that there is no confusion with GenomeBrowser.show
-from bokeh.plotting import output_file as bk_output_file #Need to rename the bokeh show function so that there is no confusion with GenomeBrowser.show
-from bokeh.io import output_notebook, reset_output, export_png, export_svgs, export_svg
-from svgutils import compose
+from bokeh.models import LayoutDOM
+from bokeh import __version__ as bokeh_version
+from bokeh.embed import file_html
+from bokeh.embed.bundle import Bundle, bundle_for_objs_and_resources
+from bokeh.embed.elements import script_for_render_items
+from bokeh.embed.util import OutputDocumentFor, standalone_docs_json_and_render_items
+from bokeh.embed.wrappers import wrap_in_onload, wrap_in_script_tag
+from bokeh.core.json_encoder import serialize_json
+from bokeh.core.templates import FILE, MACROS
+from bokeh.resources import INLINE
+from bokeh.util.serialization import make_id
+from html import escape
+import base64
+import gzip
+from bokeh.io import export_png, export_svgs
+from bokeh.io.state import State
 import os
+import time
+import threading
+import contextlib
 import warnings
-from selenium.webdriver.chrome.options import Options
-from selenium import webdriver
+# selenium, svgutils and chromedriver_binary are only needed to export png and svg files, they are imported by _save
+
+# %% ../nbs/API/04_utils.ipynb 74
+def _layout(elements):
+    """Wraps the elements in a column. A layout that was already shown or saved is reused: it is removed from its previous document, as Bokeh models can only belong to one document"""
+    if not isinstance(elements, LayoutDOM):
+        return column(elements)
+    if elements.document is not None:
+        elements.document.remove_root(elements)
+    return elements
+
+# %% ../nbs/API/04_utils.ipynb 75
+def _create_webdriver():
+    """Starts a headless browser used to export png and svg files"""
+    from selenium.webdriver.chrome.options import Options
+    from selenium import webdriver
+    try: #for wsl and/or conda
+        import chromedriver_binary
+    except:
+        pass
+
+    if not in_wsl():
+        from bokeh.io.webdriver import webdriver_control
+        return webdriver_control.create()
+
+    ## Setup chrome options
+    chrome_options = Options()
+    chrome_options.add_argument("--headless") # Ensure GUI is off
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-3d-apis")
+    chrome_options.add_argument("--disable-blink-features")
+
+    try:
+        return webdriver.Chrome(options=chrome_options)
+    except:
+        warnings.warn("""If using WSL you can install chromedriver following these instructions:https://scottspence.com/posts/use-chrome-in-ubuntu-wsl
+                      Also make sure the chromedriver-binary python package has the same major version number as your chrome install.
+                      Check the chrome version using: google-chrome --version
+                       Then use pip to force install of a web driver with a compatible version, for example:
+                       pip install --force-reinstall -v "chromedriver-binary==121.0.6167.184.0"
+                       """)
+        return None
+
+# %% ../nbs/API/04_utils.ipynb 77
+class ExportSession:
+    """Keeps one headless browser open while saving many png or svg files with `GenomeBrowser.save` or `GenomeStack.save`. 
+    Without a session a browser is started for each file on WSL. Sessions are specific to a thread, so that threads can export files in parallel, each with its own session."""
+    _sessions = threading.local() # session used by the save functions of each thread
+
+    def __init__(self, 
+                 webdriver = None, # selenium webdriver used for the exports. If None a headless browser is started when entering the session and closed when leaving it
+                ):
+        self.webdriver = webdriver
+        self._own_webdriver = webdriver is None
+        self.n_saved = 0 # number of files saved during the session
+        self.export_time = 0. # time spent saving files in seconds
+
+    @staticmethod
+    def current():
+        """Session of the current thread, or None"""
+        return getattr(ExportSession._sessions, "current", None)
+
+    @property
+    def figures_per_second(self) -> float:
+        return self.n_saved / self.export_time if self.export_time > 0 else float("nan")
+
+    def __enter__(self):
+        if self.webdriver is None:
+            self.webdriver = _create_webdriver()
+        self._previous = ExportSession.current()
+        ExportSession._sessions.current = self
+        return self
+
+    def __exit__(self, *exc):
+        ExportSession._sessions.current = self._previous
+        if self._own_webdriver and self.webdriver is not None:
+            from bokeh.io.webdriver import webdriver_control
+            if self.webdriver in webdriver_control._drivers:
+                webdriver_control.terminate(self.webdriver)
+            else:
+                self.webdriver.quit()
+            self.webdriver = None
+
+# %% ../nbs/API/04_utils.ipynb 78
+_shared_webdriver_lock = threading.Lock()
 
-# %% ../nbs/API/04_utils.ipynb 61
 def _save(elements, heights, width, fname:str, title:str="Genome Plot"):
+    """Saves the elements in a png or svg file. The global output state of Bokeh is not used, so that threads can save files in parallel."""
     base_name, ext = os.path.splitext(fname)
     ext = ext.lower()
     if ext not in {".svg", ".png"}:
         raise ValueError(f"filename must end in svg or png, not {ext}")
     
-    reset_output()
-    bk_output_file(filename=fname, title=title)
-    
-    layout = column(elements)
-
-    if in_wsl():
-            ## Setup chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--headless") # Ensure GUI is off
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-3d-apis")
-            chrome_options.add_argument("--disable-blink-features")
-            
-
-            homedir = os.path.expanduser("~")
-            try:
-                    # webdriver_service = Service(f"{homedir}/chromedriver/stable/chromedriver")
-                    # browser = webdriver.Chrome(service=webdriver_service, options=chrome_options)
-                    browser = webdriver.Chrome(options=chrome_options)
-            except:
-                    warnings.warn("""If using WSL you can install chromedriver following these instructions:https://scottspence.com/posts/use-chrome-in-ubuntu-wsl
-                                  Also make sure the chromedriver-binary python package has the same major version number as your chrome install.
-                                  Check the chrome version using: google-chrome --version
-                                   Then use pip to force install of a web driver with a compatible version, for example:
-                                   pip install --force-reinstall -v "chromedriver-binary==121.0.6167.184.0"
-                                   """)
-                    browser=None
+    layout = _layout(elements)
 
-            
+    session = ExportSession.current()
+    if session is not None:
+        browser = session.webdriver
+    elif in_wsl():
+        browser = _create_webdriver()
     else:
-            browser=None
+        browser = None # Bokeh's shared browser, used by one thread at a time
 
+    t = time.perf_counter()
     if ext == ".svg":
         #export_svg(layout, filename=fname)
-        export_svgs(layout, filename=fname, webdriver=browser)
+        with _shared_webdriver_lock if browser is None else contextlib.nullcontext():
+            export_svgs(layout, filename=fname, webdriver=browser, state=State())
         if len(heights)>1: # TODO: what is this?
+            from svgutils import compose
             total_height=sum(heights)
             svgelements=[compose.SVG(fname)]
             offset=heights[0]
@@ -555,20 +893,96 @@ def _save(elements, heights, width, fname:str, title:str="Genome Plot"):
                            *svgelements).save(f"{base_name}_composite.svg")
 
     else:
-        export_png(layout, filename=fname, webdriver=browser)
+        with _shared_webdriver_lock if browser is None else contextlib.nullcontext():
+            export_png(layout, filename=fname, webdriver=browser, state=State())
     
-    reset_output()
-
-# %% ../nbs/API/04_utils.ipynb 65
-def _save_html(elements, fname:str, title:str):
-    reset_output()
-    bk_output_file(filename=fname, title=title, mode='inline')
-    bk_save(column(elements))
-    reset_output()
+    if session is not None:
+        session.n_saved += 1
+        session.export_time += time.perf_counter() - t
+    elif browser is not None:
+        browser.quit()
+
+# %% ../nbs/API/04_utils.ipynb 83
+_compressed_html_js = """
+async function embed_document(root) {
+  const data = document.getElementById("%(data_id)s").textContent.trim();
+  const bytes = Uint8Array.from(atob(data), (c) => c.charCodeAt(0));
+  const text = await new Response(new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"))).text();
+  const split = text.indexOf("\\n");
+  const strings = JSON.parse(text.slice(0, split));
+  const docs_json = JSON.parse(text.slice(split + 1),
+    (key, value) => (value !== null && typeof value === "object" && "$shared" in value) ? strings[value["$shared"]] : value);
+  root.Bokeh.embed.embed_items(docs_json, %(render_items)s);
+}
+embed_document(window);
+"""
+
+def _share_strings(obj, strings:dict, min_length:int=1000):
+    """Replaces the strings longer than min_length by references to `strings`, which stores each of them once"""
+    if isinstance(obj, dict):
+        return {key: _share_strings(value, strings, min_length) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_share_strings(value, strings, min_length) for value in obj]
+    if isinstance(obj, str) and len(obj) >= min_length:
+        return {"$shared": strings.setdefault(obj, len(strings))}
+    return obj
+
+def _shared_bokehjs(js_dir:str) -> str:
+    """Writes BokehJS in js_dir, once per Bokeh version, and returns its path"""
+    path = os.path.join(js_dir, f"bokeh-{bokeh_version}.min.js")
+    if not os.path.exists(path):
+        os.makedirs(js_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(INLINE.js_raw))
+        os.replace(tmp, path) #files exported in parallel never see a partially written file
+    return path
+
+def _save_html(elements, fname:str, title:str, compress:bool=False, shared_js:str=None):
+    """Saves the elements in a standalone html file, without using the global output state of Bokeh"""
+    layout = _layout(elements)
+    if not compress and shared_js is None:
+        html = file_html(layout, resources=INLINE, title=title)
+    else:
+        with OutputDocumentFor([layout]) as doc:
+            docs_json, render_items = standalone_docs_json_and_render_items([layout])
+            bundle = bundle_for_objs_and_resources([doc], INLINE)
+        if shared_js is not None:
+            #the page links to one BokehJS file, shared by all the pages saved with the same shared_js
+            rel_path = os.path.relpath(_shared_bokehjs(shared_js), os.path.dirname(os.path.abspath(fname)))
+            bokeh_js = set(INLINE.js_raw)
+            bundle = Bundle(js_files=[rel_path.replace(os.sep, "/")], js_raw=[js for js in bundle.js_raw if js not in bokeh_js])
+        render_items_json = serialize_json([item.to_json() for item in render_items], pretty=False)
+        if compress:
+            #each long string (sequence, base64 arrays) is written once, then the payload is gzipped and inflated by the page
+            strings = {}
+            docs_json = _share_strings(docs_json, strings)
+            payload = serialize_json(list(strings), pretty=False) + "\n" + serialize_json(docs_json, pretty=False)
+            data_id = make_id()
+            plot_script = wrap_in_script_tag(base64.b64encode(gzip.compress(payload.encode(), compresslevel=6, mtime=0)).decode(), "text/plain", data_id)
+            plot_script += wrap_in_script_tag(wrap_in_onload(_compressed_html_js % dict(data_id=data_id, render_items=render_items_json)))
+        else:
+            json_id = make_id()
+            plot_script = wrap_in_script_tag(escape(serialize_json(docs_json, pretty=False), quote=False), "application/json", json_id)
+            plot_script += wrap_in_script_tag(script_for_render_items(json_id, render_items))
+        bokeh_js, bokeh_css = bundle
+        html = FILE.render(title=title, bokeh_js=bokeh_js, bokeh_css=bokeh_css, plot_script=plot_script,
+                           docs=render_items, base=FILE, macros=MACROS)
+    with open(fname, "w", encoding="utf-8") as f:
+        f.write(html)
+
+# %% ../nbs/API/04_utils.ipynb 87
+_notebook_loaded = False # BokehJS is loaded in the notebook by the first call to _gb_show
 
-# %% ../nbs/API/04_utils.ipynb 66
 def _gb_show(elements):
-    reset_output()
-    output_notebook(hide_banner=True)
-    bk_show(column(elements))
-    reset_output()
+    """Displays the elements in the notebook. Like bokeh.io.show, but without setting the global output state of Bokeh"""
+    global _notebook_loaded
+    from bokeh.io.notebook import load_notebook, publish_display_data, HTML_MIME_TYPE, JS_MIME_TYPE, EXEC_MIME_TYPE
+    from bokeh.embed.notebook import notebook_content
+    if not _notebook_loaded:
+        load_notebook(hide_banner=True)
+        _notebook_loaded = True
+    layout = _layout(elements)
+    script, div, _ = notebook_content(layout)
+    publish_display_data({HTML_MIME_TYPE: div})
+    publish_display_data({JS_MIME_TYPE: script, EXEC_MIME_TYPE: ""}, metadata={EXEC_MIME_TYPE: {"id": layout.id}})